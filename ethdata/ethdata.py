@@ -7,8 +7,20 @@ import string
 from Crypto.Hash import keccak
 from google.cloud import bigquery
 import pandas as pd
+import numpy as np
 from math import ceil
 from collections import OrderedDict
+from functools import partial
+import multiprocessing
+import threading
+import asyncio
+import concurrent.futures
+import sqlite3
+import zlib
+import time
+import re
+import hashlib
+import numbers
 
 # BigQuery Public Ethereum Datasets
 public_dataset = {
@@ -59,7 +71,9 @@ class Account():
     def __init__(self, address):
         self.address = address
         self.transaction_receipts = None
+        self.transaction_receipt_arrays = {}
         self.query_range = {}
+        self.decode_options = {}
     
     @property
     def address(self):
@@ -72,10 +86,20 @@ class Account():
             self.__transaction_receipts = my_bigquery.get_transaction_receipts(self)
         return self.__transaction_receipts
     
+    @property
+    def transaction_receipt_arrays(self):
+        """Array columns of `transaction_receipts` as `ListColumn`s, if decoded with {"arrays": "offsets"}."""
+        return self.__transaction_receipt_arrays
+    
     @property
     def query_range(self):
         return self.__query_range
     
+    @property
+    def decode_options(self):
+        """Keyword arguments passed to `CleanDf` when results are decoded (e.g. {"vectorized": True})."""
+        return self.__decode_options
+    
     @address.setter
     def address(self, val):
         if val[:2] == "0x" and len(val) == 42 and all(c in string.hexdigits for c in val[2:]):
@@ -87,6 +111,10 @@ class Account():
     def transaction_receipts(self, val):
         self.__transaction_receipts = val
         
+    @transaction_receipt_arrays.setter
+    def transaction_receipt_arrays(self, val):
+        self.__transaction_receipt_arrays = val
+        
     @query_range.setter
     def query_range(self, dict):
         if 'start' in dict and 'end' in dict:
@@ -98,6 +126,15 @@ class Account():
         else:
             self.__query_range = {}
 
+    @decode_options.setter
+    def decode_options(self, dict):
+        self.__decode_options = {key: dict[key] for key in dict}
+    
+    def iter_transaction_receipts(self, chunk_rows=100000):
+        """Yields `transaction_receipts` as dataframes of up to `chunk_rows` rows, without loading them all at once."""
+        my_bigquery = BigQuery()
+        return my_bigquery.iter_transaction_receipts(self, chunk_rows)
+
 ##################       
 # CONTRACT CLASS #
 ##################
@@ -110,6 +147,9 @@ class Contract(Account):
         self.abi = None
         self.creation_date = None
         self.event_logs = None
+        self.event_log_arrays = {}
+        self.event_logs_by_event = None
+        self.transaction_receipts_by_function = None
         self.functions = None
         self.events = None
         
@@ -122,8 +162,7 @@ class Contract(Account):
             2. A blank list - []
         """
         if self.__abi is None:
-            my_etherscan = Etherscan()
-            self.__abi = my_etherscan.get_abi(self.address)
+            self.__abi = self.load_abi()
         return self.__abi
     
     @property
@@ -148,6 +187,27 @@ class Contract(Account):
             self.__event_logs = my_bigquery.get_event_logs(self)
         return self.__event_logs
     
+    @property
+    def event_log_arrays(self):
+        """Array columns of `event_logs` as `ListColumn`s, if decoded with {"arrays": "offsets"}."""
+        return self.__event_log_arrays
+    
+    @property
+    def event_logs_by_event(self):
+        """Event logs as a dict with a compact dataframe for each event name (e.g. `event_logs_by_event["Transfer"]`)."""
+        if self.__event_logs_by_event is None:
+            my_bigquery = BigQuery()
+            self.__event_logs_by_event = my_bigquery.get_event_logs_by_event(self)
+        return self.__event_logs_by_event
+    
+    @property
+    def transaction_receipts_by_function(self):
+        """Transaction receipts as a dict with a compact dataframe for each function name."""
+        if self.__transaction_receipts_by_function is None:
+            my_bigquery = BigQuery()
+            self.__transaction_receipts_by_function = my_bigquery.get_transaction_receipts_by_function(self)
+        return self.__transaction_receipts_by_function
+    
     @abi.setter
     def abi(self, val):
         self.__abi = val
@@ -159,28 +219,91 @@ class Contract(Account):
     @event_logs.setter
     def event_logs(self, val):
         self.__event_logs = val
+        
+    @event_log_arrays.setter
+    def event_log_arrays(self, val):
+        self.__event_log_arrays = val
+        
+    @event_logs_by_event.setter
+    def event_logs_by_event(self, val):
+        self.__event_logs_by_event = val
+        
+    @transaction_receipts_by_function.setter
+    def transaction_receipts_by_function(self, val):
+        self.__transaction_receipts_by_function = val
+    
+    def iter_event_logs(self, chunk_rows=100000):
+        """Yields `event_logs` as dataframes of up to `chunk_rows` rows, without loading them all at once."""
+        my_bigquery = BigQuery()
+        return my_bigquery.iter_event_logs(self, chunk_rows)
+    
+    @property
+    def abi_loaded(self):
+        """True once `abi` has been loaded or set."""
+        return self.__abi is not None
+    
+    @property
+    def needs_verified_abi(self):
+        """True if `load_abi` uses the verified ABI from Etherscan."""
+        return True
+    
+    def call_series(self, function, blocks=None, dates=None, decimals=0, batch_size=100):
+        """Calls `function` at many blocks and returns the results as a time series.
+        
+        Functions should be input as plain text (e.g. "totalSupply()") and return a number.
+        
+        Args:
+            function: function to call.
+            blocks: list of block numbers to call at. The index is the timestamp of each block.
+            dates: list of dates to call at, at the last block at or before each date. The index is the date.
+            decimals: decimals used to convert the results.
+            batch_size: maximum number of calls per JSON-RPC batch request.
+        
+        Returns:
+            Pandas dataframe with columns block_number and the function name (e.g. totalSupply).
+        """
+        if (blocks is None) == (dates is None):
+            raise ValueError("Either blocks or dates must be given.")
+        my_bigquery = BigQuery()
+        if dates is not None:
+            df = my_bigquery.get_blocks_at_dates(dates)
+            df = df.set_index('date')
+        else:
+            df = my_bigquery.get_block_timestamps(blocks)
+            df = df.set_index('timestamp')
+        df['block_number'] = df['block_number'].astype(int)
+        my_infura = Infura()
+        calls = [(self.address, function, block) for block in df['block_number'].tolist()]
+        results = my_infura.eth_call_many(calls, batch_size)
+        values = []
+        for result in results:
+            try:
+                values.append(hex_to_float(result, decimals=decimals))
+            except:
+                values.append(np.nan)
+        df[function.split("(")[0]] = values
+        return df
+    
+    def load_abi(self, verified_abi=None):
+        """Returns the ABI for `address` from Etherscan, or `verified_abi` if it has already been fetched.
+        Called the first time `abi` is needed."""
+        if verified_abi is not None:
+            return verified_abi
+        my_etherscan = Etherscan()
+        return my_etherscan.get_abi(self.address)
+    
+    def load_functions(self):
+        """Returns the function table of `abi`. Called the first time `functions` is needed."""
+        return get_abi_functions(self.abi)
+    
+    def load_events(self):
+        """Returns the event table of `abi`. Called the first time `events` is needed."""
+        return get_abi_events(self.abi)
 
     @property
     def functions(self):
         if self.__functions is None:
-            self.__functions = {}
-            for item in self.abi:
-                if item['type'] == 'function':
-                    function_name = item['name']
-                    input_types = []
-                    data = OrderedDict()
-
-                    for input_ in item['inputs']:
-                        input_types.append(input_['type'])
-                        data.update({input_['name']: input_['type']})
-
-                    function_prehash = "{0}({1})".format(function_name, ",".join(input_types))
-                    function_signature = get_function_signature(function_prehash)
-
-                    self.__functions[function_signature] = {
-                        "function_name": function_name,
-                        "data": data
-                    }
+            self.__functions = self.load_functions()
         return self.__functions
 
     @functions.setter
@@ -190,34 +313,7 @@ class Contract(Account):
     @property
     def events(self):
         if self.__events is None:
-            self.__events = {}
-            for item in self.abi:
-                if item['type'] == 'event':
-                    event_name = item['name']
-                    input_types = []
-                    topics = OrderedDict()
-                    data = OrderedDict()
-                    anonymous = item['anonymous']
-
-                    for input_ in item['inputs']:
-                        input_types.append(input_['type'])
-
-                        if input_['indexed']:
-                            topics.update({input_['name']: input_['type']})
-                        else:
-                            data.update({input_['name']: input_['type']})
-
-                    if not anonymous:
-                        event_prehash = "{0}({1})".format(event_name, ",".join(input_types))
-                        event_hash = get_event_hash(event_prehash)
-                    else:
-                        event_hash = "Anonymous"
-
-                    self.__events[event_hash] = {
-                        "event_name": event_name,
-                        "topics": topics,
-                        "data": data
-                    }
+            self.__events = self.load_events()
         return self.__events
 
     @events.setter
@@ -230,7 +326,7 @@ class Contract(Account):
 
 class Token(Contract):
 
-    def __init__(self, address):
+    def __init__(self, address, abi_mode="etherscan", standard="erc20"):
         """Initializes a new `Token` object. Subclass of `Contract`.
         
         Properties are set from an external source the first time they are needed. After that, they are stored on the object:
@@ -238,14 +334,73 @@ class Token(Contract):
           * symbol
           * decimals
           * total_supply
+        
+        `abi_mode` sets where the ABI comes from:
+          * "etherscan": the verified ABI from Etherscan
+          * "standard": the bundled ABI of `standard` ("erc20" or "erc721"), without calling Etherscan
+          * "merge": the verified ABI, plus the entries of the `standard` ABI that it lacks
         """
         
         Contract.__init__(self, address)
         
+        self.abi_mode = abi_mode
+        self.standard = standard
         self.name = None
         self.symbol = None
         self.decimals = None
         self.total_supply = None
+    
+    @property
+    def abi_mode(self):
+        return self.__abi_mode
+    
+    @property
+    def standard(self):
+        return self.__standard
+    
+    @abi_mode.setter
+    def abi_mode(self, val):
+        if val not in abi_modes:
+            raise ValueError("abi_mode must be one of {0}".format(abi_modes))
+        self.__abi_mode = val
+    
+    @standard.setter
+    def standard(self, val):
+        if val not in standard_abis:
+            raise ValueError("standard must be one of {0}".format(tuple(standard_abis)))
+        self.__standard = val
+    
+    @property
+    def needs_verified_abi(self):
+        return self.abi_mode != "standard"
+    
+    def call_series(self, function, blocks=None, dates=None, decimals=None, batch_size=100):
+        """Calls `function` at many blocks, see `Contract.call_series`. Results are converted with the
+        token's `decimals` unless `decimals` is given."""
+        if decimals is None:
+            decimals = self.decimals
+        return Contract.call_series(self, function, blocks, dates, decimals, batch_size)
+    
+    def load_abi(self, verified_abi=None):
+        """Returns the ABI for `abi_mode`."""
+        if self.abi_mode == "standard":
+            return list(standard_abis[self.standard])
+        abi = Contract.load_abi(self, verified_abi)
+        if self.abi_mode == "merge":
+            abi = merge_abis(abi, standard_abis[self.standard])
+        return abi
+    
+    def load_functions(self):
+        """Returns the precomputed function table of `standard` in "standard" mode."""
+        if self.abi_mode == "standard":
+            return copy_abi_table(get_standard_tables(self.standard)['functions'])
+        return Contract.load_functions(self)
+    
+    def load_events(self):
+        """Returns the precomputed event table of `standard` in "standard" mode."""
+        if self.abi_mode == "standard":
+            return copy_abi_table(get_standard_tables(self.standard)['events'])
+        return Contract.load_events(self)
 
     @property
     def name(self):
@@ -361,141 +516,1425 @@ class Token(Contract):
     def total_supply(self, val):
         self.__total_supply = val
 
+# Token metadata functions, in lookup order (`decimals` is needed to scale `total_supply`)
+token_functions = OrderedDict([
+    ("name", "name()"),
+    ("symbol", "symbol()"),
+    ("decimals", "decimals()"),
+    ("total_supply", "totalSupply()")
+])
+token_fallbacks = {"name": "", "symbol": "", "decimals": 18, "total_supply": 0}
+
+token_sources = ("rpc", "bigquery")
+
+def resolve_tokens(addresses, as_frame=False, batch_size=100, infura=None, source="rpc", bigquery=None):
+    """Finds name, symbol, decimals and total supply for many tokens at once.
+    
+    Addresses are deduplicated. Values in `exception_list` are used first and all other values are
+    fetched with batched `eth_call`s. Values that cannot be found get the same fallbacks as `Token`.
+    
+    With `source="bigquery"`, values are first read from the public tokens table in one query and
+    only the values it misses are fetched with `eth_call`s.
+    
+    Args:
+        addresses: list of token addresses.
+        as_frame: return a DataFrame with one row per token instead of `Token` objects.
+        batch_size: maximum number of calls per JSON-RPC batch request.
+        infura: `Infura` client used for the calls. Defaults to a new `Infura`.
+        source: "rpc" or "bigquery".
+        bigquery: `BigQuery` client used with `source="bigquery"`. Defaults to a new `BigQuery`.
+    
+    Returns:
+        List of `Token` objects in order of first appearance, or a DataFrame with columns
+        address, name, symbol, decimals and total_supply.
+    """
+    if source not in token_sources:
+        raise ValueError("source must be one of {0}".format(token_sources))
+    tokens = OrderedDict()
+    for address in addresses:
+        token = Token(address)
+        if token.address not in tokens:
+            tokens[token.address] = token
+    table = {}
+    # Tokens with every value in `exception_list` are not looked up
+    lookup = [address for address in tokens if any(field not in exception_list.get(address, {}) for field in token_functions)]
+    if source == "bigquery" and lookup:
+        if bigquery is None:
+            bigquery = BigQuery()
+        df = bigquery.get_token_metadata(lookup)
+        for row in df.to_dict('records'):
+            table[row['address']] = dict((field, val) for field, val in row.items() if field in token_functions and not pd.isnull(val))
+    calls = []
+    targets = []
+    for token in tokens.values():
+        known = table.get(token.address, {})
+        known.update(exception_list.get(token.address, {}))
+        for field, function in token_functions.items():
+            if field in known:
+                setattr(token, field, known[field])
+            else:
+                calls.append((token.address, function))
+                targets.append((token, field))
+    if calls:
+        if infura is None:
+            infura = Infura()
+        results = infura.eth_call_many(calls, batch_size)
+    else:
+        results = []
+    missing = OrderedDict((field, 0) for field in token_functions)
+    for (token, field), result in zip(targets, results):
+        try:
+            if field in ("name", "symbol"):
+                value = hex_to_token_string(result)
+            elif field == "decimals":
+                value = hex_to_float(result)
+            else:
+                value = hex_to_float(result, decimals=token.decimals)
+        except:
+            value = None
+        if value is None:
+            missing[field] += 1
+            value = token_fallbacks[field]
+        setattr(token, field, value)
+    for field, count in missing.items():
+        if count:
+            warnings.warn("Could not find {0} for {1} tokens. A fallback value of {2} has been applied.".format(
+                field, count, json.dumps(token_fallbacks[field])))
+    if as_frame:
+        rows = [[token.address] + [getattr(token, field) for field in token_functions] for token in tokens.values()]
+        return pd.DataFrame(rows, columns=["address"] + list(token_functions))
+    return list(tokens.values())
+
+### STANDARD ABIS ###
+
+def standard_function(name, inputs, outputs, state_mutability="view"):
+    """Returns the ABI entry of a function. `inputs` and `outputs` are lists of (name, type)."""
+    return {
+        "type": "function",
+        "name": name,
+        "inputs": [{"name": input_name, "type": input_type} for input_name, input_type in inputs],
+        "outputs": [{"name": output_name, "type": output_type} for output_name, output_type in outputs],
+        "constant": state_mutability == "view",
+        "payable": state_mutability == "payable",
+        "stateMutability": state_mutability
+    }
+
+def standard_event(name, inputs):
+    """Returns the ABI entry of an event. `inputs` is a list of (name, type, indexed)."""
+    return {
+        "type": "event",
+        "name": name,
+        "inputs": [{"name": input_name, "type": input_type, "indexed": indexed} for input_name, input_type, indexed in inputs],
+        "anonymous": False
+    }
+
+# Bundled ABIs of token standards, with parameter names from the EIPs
+standard_abis = {
+    "erc20": [
+        standard_function("name", [], [("", "string")]),
+        standard_function("symbol", [], [("", "string")]),
+        standard_function("decimals", [], [("", "uint8")]),
+        standard_function("totalSupply", [], [("", "uint256")]),
+        standard_function("balanceOf", [("_owner", "address")], [("balance", "uint256")]),
+        standard_function("allowance", [("_owner", "address"), ("_spender", "address")], [("remaining", "uint256")]),
+        standard_function("transfer", [("_to", "address"), ("_value", "uint256")], [("success", "bool")], "nonpayable"),
+        standard_function("transferFrom", [("_from", "address"), ("_to", "address"), ("_value", "uint256")], [("success", "bool")], "nonpayable"),
+        standard_function("approve", [("_spender", "address"), ("_value", "uint256")], [("success", "bool")], "nonpayable"),
+        standard_event("Transfer", [("_from", "address", True), ("_to", "address", True), ("_value", "uint256", False)]),
+        standard_event("Approval", [("_owner", "address", True), ("_spender", "address", True), ("_value", "uint256", False)])
+    ],
+    "erc721": [
+        standard_function("name", [], [("_name", "string")]),
+        standard_function("symbol", [], [("_symbol", "string")]),
+        standard_function("tokenURI", [("_tokenId", "uint256")], [("", "string")]),
+        standard_function("totalSupply", [], [("", "uint256")]),
+        standard_function("balanceOf", [("_owner", "address")], [("", "uint256")]),
+        standard_function("ownerOf", [("_tokenId", "uint256")], [("", "address")]),
+        standard_function("getApproved", [("_tokenId", "uint256")], [("", "address")]),
+        standard_function("isApprovedForAll", [("_owner", "address"), ("_operator", "address")], [("", "bool")]),
+        standard_function("safeTransferFrom", [("_from", "address"), ("_to", "address"), ("_tokenId", "uint256"), ("data", "bytes")], [], "payable"),
+        standard_function("safeTransferFrom", [("_from", "address"), ("_to", "address"), ("_tokenId", "uint256")], [], "payable"),
+        standard_function("transferFrom", [("_from", "address"), ("_to", "address"), ("_tokenId", "uint256")], [], "payable"),
+        standard_function("approve", [("_approved", "address"), ("_tokenId", "uint256")], [], "payable"),
+        standard_function("setApprovalForAll", [("_operator", "address"), ("_approved", "bool")], [], "nonpayable"),
+        standard_event("Transfer", [("_from", "address", True), ("_to", "address", True), ("_tokenId", "uint256", True)]),
+        standard_event("Approval", [("_owner", "address", True), ("_approved", "address", True), ("_tokenId", "uint256", True)]),
+        standard_event("ApprovalForAll", [("_owner", "address", True), ("_operator", "address", True), ("_approved", "bool", False)])
+    ]
+}
+abi_modes = ("etherscan", "standard", "merge")
+
+# Function and event tables of `standard_abis`, built on first use
+standard_tables = {}
+
+def get_standard_tables(standard):
+    """Returns the "functions" and "events" tables of a bundled standard ABI, keyed by selector and topic."""
+    if standard not in standard_tables:
+        standard_tables[standard] = {
+            "functions": get_abi_functions(standard_abis[standard]),
+            "events": get_abi_events(standard_abis[standard])
+        }
+    return standard_tables[standard]
+
+def copy_abi_table(table):
+    """Returns a copy of a function or event table, sharing the (read-only) decoder plans."""
+    return dict((key, dict(entry)) for key, entry in table.items())
+
+def get_abi_entry_key(item):
+    """Returns the key that identifies an ABI entry: its type, name and input types."""
+    return (item.get('type'), item.get('name'), tuple(input_['type'] for input_ in item.get('inputs', [])))
+
+def merge_abis(abi, standard_abi):
+    """Returns `abi` with the entries of `standard_abi` that it lacks appended."""
+    keys = set(get_abi_entry_key(item) for item in abi)
+    return list(abi) + [item for item in standard_abi if get_abi_entry_key(item) not in keys]
+
+### HTTP SESSIONS ###
+
+# Connection pool settings of the shared sessions, see `configure_http_sessions`
+http_session_settings = {"pool_size": 10, "keep_alive": True}
+http_sessions = {}
+http_sessions_lock = threading.Lock()
+
+def get_http_session(endpoint):
+    """Returns the shared `requests.Session` of `endpoint` (e.g. "infura" or "etherscan").
+    
+    The session is created on first use and keeps a pool of connections open, so calls from every
+    `Infura`, `Etherscan`, `Contract` and `Token` object (and every thread) reuse connections instead
+    of opening a new one per request.
+    """
+    with http_sessions_lock:
+        if endpoint not in http_sessions:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1, pool_maxsize=http_session_settings['pool_size'])
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if not http_session_settings['keep_alive']:
+                session.headers['Connection'] = 'close'
+            http_sessions[endpoint] = session
+        return http_sessions[endpoint]
+
+def configure_http_sessions(pool_size=10, keep_alive=True):
+    """Sets the number of pooled connections per endpoint and whether connections are kept alive.
+    
+    Existing sessions are closed and new ones are created on their next use.
+    """
+    with http_sessions_lock:
+        http_session_settings['pool_size'] = pool_size
+        http_session_settings['keep_alive'] = keep_alive
+        for endpoint in list(http_sessions):
+            http_sessions.pop(endpoint).close()
+
+class RateLimiter():
+    """Token bucket allowing `rate` calls per second on average, in bursts of up to `burst` calls.
+    
+    `acquire` blocks until a call is allowed and can be called from many threads.
+    """
+    
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.time()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.time()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
 ### INFURA ###
 
+def get_block_tag(block):
+    """Returns the JSON-RPC block parameter of `block`, a block number (e.g. an int or `np.int64`) or a tag
+    such as "latest"."""
+    if isinstance(block, numbers.Integral) and not isinstance(block, bool):
+        return hex(int(block))
+    return block.lower()
+
+class CallCache():
+    """Thread-safe in-memory cache of `eth_call` results keyed by (endpoint, to, calldata, block).
+    
+    Results at a block number (or "earliest") never change and are kept until they are the least
+    recently used of more than `max_entries` results. Results at other tags such as "latest" expire
+    after `latest_ttl` seconds. "pending" results are not cached.
+    
+    Only pin calls to block numbers that are final, as results at a reorganised block are kept.
+    """
+    
+    def __init__(self, latest_ttl=12, max_entries=100000):
+        self.latest_ttl = latest_ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def get(self, key):
+        """Returns `(True, result)` for a cached result or `(False, None)`."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False, None
+            result, expires = entry
+            if expires is not None and time.time() > expires:
+                del self.entries[key]
+                return False, None
+            self.entries.move_to_end(key)
+            return True, result
+    
+    def put(self, key, result):
+        block = key[-1]
+        if block == "pending":
+            return
+        if block == "earliest" or block.startswith("0x"):
+            expires = None
+        elif self.latest_ttl:
+            expires = time.time() + self.latest_ttl
+        else:
+            return
+        with self.lock:
+            self.entries[key] = (result, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+    
+    def __len__(self):
+        return len(self.entries)
+
+# Shared by `Infura` objects unless they are given their own `CallCache`
+eth_call_cache = CallCache()
+
 class Infura():
     
-    def __init__(self):
+    def __init__(self, session=None, url=None, call_cache=None):
         self.project_id = os.environ.get("INFURA_PROJECT_ID")
+        self.session = session
+        self.url = url
+        self.call_cache = call_cache
     
     @property
     def url(self):
-        return "https://mainnet.infura.io/v3/{0}".format(self.project_id)
+        """JSON-RPC endpoint. Defaults to Infura mainnet for `project_id`."""
+        if self.__url is None:
+            return "https://mainnet.infura.io/v3/{0}".format(self.project_id)
+        return self.__url
     
     @property
     def project_id(self):
         return self.__project_id
     
+    @property
+    def session(self):
+        """`requests.Session` used for calls. Defaults to the shared "infura" session."""
+        if self.__session is None:
+            return get_http_session("infura")
+        return self.__session
+    
+    @property
+    def call_cache(self):
+        """`CallCache` of `eth_call` results. Defaults to the shared `eth_call_cache`."""
+        if self.__call_cache is None:
+            return eth_call_cache
+        return self.__call_cache
+    
+    @url.setter
+    def url(self, val):
+        self.__url = val
+    
     @project_id.setter
     def project_id(self, val):
         self.__project_id = val
     
-    def eth_call(self, to, function):
+    @session.setter
+    def session(self, val):
+        self.__session = val
+    
+    @call_cache.setter
+    def call_cache(self, val):
+        self.__call_cache = val
+    
+    def eth_call(self, to, function, block="latest"):
         """Calls `function` on address `to`. Functions should be input as plain text (e.g. "name()").
     
         Any data that is returned will be in hex format and will need to be converted by the user as needed.
+        
+        `block` is a block number or tag. Results are cached in `call_cache`.
+        """
+        key = self.call_key(to, function, block)
+        cached, result = self.call_cache.get(key)
+        if cached:
+            return result
+        url = self.url
+        data = self.eth_call_request(to, function, block=block)
+        r = self.session.post(url, json=data)
+        return self.eth_call_result(r, key)
+    
+    def eth_call_many(self, calls, batch_size=100, block="latest"):
+        """Calls many functions with JSON-RPC batch requests of up to `batch_size` calls each.
+        
+        Args:
+            calls: list of `(to, function)` or `(to, function, block)` tuples. Functions should be input
+                as plain text (e.g. "name()").
+            batch_size: maximum number of calls sent in one HTTP request.
+            block: block number or tag of calls without one. Cached results are not requested again.
+        
+        Returns:
+            List of hex results in the same order as `calls`. Calls that return no data, return an
+            error or get no response are None.
         """
-        data = get_function_signature(function)
         url = self.url
-        data = {
+        keys = [self.call_key(*self.get_call(call, block)) for call in calls]
+        results, positions = self.cached_results(keys)
+        errors = 0
+        for batch, data in self.eth_call_batches(calls, batch_size, block, positions):
+            r = self.session.post(url, json=data)
+            errors += self.read_batch_response(r, batch, results, keys)
+        if errors:
+            warnings.warn("{0} of {1} calls to Infura failed.".format(errors, len(calls)))
+        return results
+    
+    def get_call(self, call, block="latest"):
+        """Returns `(to, function, block)` of a `(to, function)` or `(to, function, block)` call."""
+        if len(call) == 3:
+            return tuple(call)
+        return call[0], call[1], block
+    
+    def call_key(self, to, function, block="latest"):
+        """Returns the `call_cache` key of calling `function` on address `to` at `block`."""
+        return (self.url, to.lower(), get_function_signature(function), get_block_tag(block))
+    
+    def cached_results(self, keys):
+        """Returns the cached results of `keys` (None if not cached) and the positions of those not cached."""
+        results = [None] * len(keys)
+        positions = []
+        for i, key in enumerate(keys):
+            cached, result = self.call_cache.get(key)
+            if cached:
+                results[i] = result
+            else:
+                positions.append(i)
+        return results, positions
+    
+    def eth_call_request(self, to, function, request_id=1, block="latest"):
+        """Returns the JSON-RPC `eth_call` request for `function` on address `to`."""
+        return {
             "jsonrpc": "2.0",
             "method": "eth_call",
             "params": [{"to": to,
-                        "data": data},
-                        "latest"],
-            "id": 1
+                        "data": get_function_signature(function)},
+                        get_block_tag(block)],
+            "id": request_id
         }
-        r = requests.post(url, json=data)
+    
+    def eth_call_result(self, r, key=None):
+        """Returns the result of an `eth_call` response, or None if there is no data.
+        
+        Results are stored in `call_cache` under `key`, if given.
+        """
         try:
-            if r.json()['result'] == '0x':
-                return None
-            return r.json()['result']
+            result = r.json()['result']
         except:
             warnings.warn("Request to Infura failed. Check your API key.")
             return None
+        if result == '0x':
+            result = None
+        if key is not None:
+            self.call_cache.put(key, result)
+        return result
+    
+    def eth_call_batches(self, calls, batch_size=100, block="latest", positions=None):
+        """Splits `calls`, or the calls at `positions`, into `(positions, requests)` batches.
+        
+        Requests are numbered by their position in `calls`.
+        """
+        if positions is None:
+            positions = list(range(len(calls)))
+        batches = []
+        for start in range(0, len(positions), batch_size):
+            batch = positions[start:start + batch_size]
+            data = []
+            for i in batch:
+                to, function, call_block = self.get_call(calls[i], block)
+                data.append(self.eth_call_request(to, function, i, call_block))
+            batches.append((batch, data))
+        return batches
+    
+    def read_batch_response(self, r, positions, results, keys=None):
+        """Stores the results of a batch response for the calls at `positions` into `results` (and
+        `call_cache` under `keys`, if given) and returns the number of failed calls."""
+        try:
+            responses = r.json()
+        except:
+            responses = None
+        # A rejected batch is answered with a single error object
+        if not isinstance(responses, list):
+            warnings.warn("Request to Infura failed. Check your API key.")
+            return len(positions)
+        expected = set(positions)
+        answered = set()
+        errors = 0
+        for response in responses:
+            i = response.get('id')
+            if not isinstance(i, int) or i in answered or i not in expected:
+                continue
+            answered.add(i)
+            result = response.get('result')
+            if result is None:
+                errors += 1
+                continue
+            if result == '0x':
+                result = None
+            results[i] = result
+            if keys is not None:
+                self.call_cache.put(keys[i], result)
+        return errors + len(positions) - len(answered)
     
     def eth_blockNumber(self):
         """Calls `eth_blockNumber`"""
         
         url = self.url
-        data = {
+        data = self.eth_blockNumber_request()
+        r = self.session.post(url, json=data)
+        return r
+    
+    def eth_blockNumber_request(self):
+        """Returns the JSON-RPC `eth_blockNumber` request."""
+        return {
             "jsonrpc": "2.0",
             "method": "eth_blockNumber",
             "params": [],
             "id": 1
         }
-        r = requests.post(url, json=data)
-        return r
+
+class AsyncInfura():
+    """Asyncio counterpart of `Infura`.
+    
+    Requests are sent with the `Infura` session from a pool of `concurrency` threads, so at most
+    `concurrency` requests are in flight at once. If `requests_per_second` is set, request starts are
+    spaced to stay within that budget.
+    
+    The thread pool is shut down by `close`, or on leaving `async with AsyncInfura() as infura:`.
+    """
+    
+    def __init__(self, concurrency=10, requests_per_second=None, session=None, url=None, call_cache=None):
+        self.infura = Infura(session=session, url=url, call_cache=call_cache)
+        self.__executor = None
+        self.__semaphores = {}
+        self.__next_start = {}
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @property
+    def infura(self):
+        return self.__infura
+    
+    @property
+    def concurrency(self):
+        return self.__concurrency
+    
+    @property
+    def requests_per_second(self):
+        return self.__requests_per_second
+    
+    @infura.setter
+    def infura(self, val):
+        self.__infura = val
+    
+    @concurrency.setter
+    def concurrency(self, val):
+        if val < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self.__concurrency = val
+        # Requests in flight finish in the old pool, new requests use a pool of the new size
+        self.close()
+    
+    @requests_per_second.setter
+    def requests_per_second(self, val):
+        if val is not None and val <= 0:
+            raise ValueError("requests_per_second must be positive.")
+        self.__requests_per_second = val
+    
+    async def eth_call(self, to, function, block="latest"):
+        """Calls `function` on address `to`, see `Infura.eth_call`."""
+        key = self.infura.call_key(to, function, block)
+        cached, result = self.infura.call_cache.get(key)
+        if cached:
+            return result
+        r = await self.post(self.infura.eth_call_request(to, function, block=block))
+        return self.infura.eth_call_result(r, key)
+    
+    async def eth_call_many(self, calls, batch_size=100, block="latest"):
+        """Calls many functions with concurrent JSON-RPC batch requests, see `Infura.eth_call_many`."""
+        keys = [self.infura.call_key(*self.infura.get_call(call, block)) for call in calls]
+        results, positions = self.infura.cached_results(keys)
+        batches = self.infura.eth_call_batches(calls, batch_size, block, positions)
+        responses = await asyncio.gather(*[self.post(data) for batch, data in batches])
+        errors = 0
+        for (batch, data), r in zip(batches, responses):
+            errors += self.infura.read_batch_response(r, batch, results, keys)
+        if errors:
+            warnings.warn("{0} of {1} calls to Infura failed.".format(errors, len(calls)))
+        return results
+    
+    async def eth_blockNumber(self):
+        """Calls `eth_blockNumber`"""
+        return await self.post(self.infura.eth_blockNumber_request())
+    
+    async def post(self, data):
+        """Posts the JSON-RPC request `data` once a concurrency slot and the request budget allow it."""
+        loop = asyncio.get_event_loop()
+        self.drop_closed_loops()
+        async with self.get_semaphore(loop):
+            await self.wait_for_budget(loop)
+            post = partial(self.infura.session.post, self.infura.url, json=data)
+            return await loop.run_in_executor(self.get_executor(), post)
+    
+    def close(self):
+        """Shuts down the thread pool without waiting for requests in flight. A new pool is started by the next request."""
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
+        self.__semaphores = {}
+    
+    def get_executor(self):
+        if self.__executor is None:
+            self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency)
+        return self.__executor
+    
+    def get_semaphore(self, loop):
+        # Semaphores belong to one event loop
+        if loop not in self.__semaphores:
+            self.__semaphores[loop] = asyncio.Semaphore(self.concurrency)
+        return self.__semaphores[loop]
+    
+    def drop_closed_loops(self):
+        # Releases the state of event loops that have been closed, e.g. by `asyncio.run`
+        for loop in [loop for loop in self.__semaphores if loop.is_closed()]:
+            del self.__semaphores[loop]
+        for loop in [loop for loop in self.__next_start if loop.is_closed()]:
+            del self.__next_start[loop]
+    
+    async def wait_for_budget(self, loop):
+        if self.requests_per_second is None:
+            return
+        now = loop.time()
+        start = max(now, self.__next_start.get(loop, now))
+        self.__next_start[loop] = start + 1.0 / self.requests_per_second
+        if start > now:
+            await asyncio.sleep(start - now)
         
 
 ### ETHERSCAN ###
 
 class Etherscan():
     
-    def __init__(self):
+    def __init__(self, session=None):
         self.api_key = os.environ.get("ETHERSCAN_API_KEY")
+        self.session = session
     
     @property
     def api_key(self):
         return self.__api_key
     
+    @property
+    def session(self):
+        """`requests.Session` used for calls. Defaults to the shared "etherscan" session."""
+        if self.__session is None:
+            return get_http_session("etherscan")
+        return self.__session
+    
     @api_key.setter
     def api_key(self, val):
         self.__api_key = val
+    
+    @session.setter
+    def session(self, val):
+        self.__session = val
         
     def get_abi(self, address):
-        """Requests ABI from Etherscan for `address`"""
+        """Requests ABI from Etherscan for `address`
+        
+        If an ABI cache is configured (see `configure_abi_cache`), cached ABIs are used and new
+        results are stored, including "No ABI found" results. Failed requests are not cached.
+        """
+        cache = get_abi_cache()
+        if cache is not None:
+            abi = cache.get(address)
+            if abi == []:
+                warnings.warn("No ABI found on Etherscan for {0}.".format(address))
+            if abi is not None:
+                return abi
+        abi, status = self.request_abi(address)
+        if cache is not None and status in ("ok", "not_verified"):
+            cache.put(address, abi)
+        if status == "failed":
+            warnings.warn("Request to Etherscan failed. Check your API key.")
+        elif status == "throttled":
+            warnings.warn("Etherscan rate limit reached. No ABI loaded for {0}.".format(address))
+        elif status != "ok":
+            warnings.warn("No ABI found on Etherscan for {0}.".format(address))
+        return abi
+    
+    def get_abis(self, addresses, requests_per_second=5, workers=5, max_retries=5, retry_delay=1.0):
+        """Requests the ABIs of many addresses concurrently, within a rate limit.
+        
+        Requests are spread over `workers` threads and start at most `requests_per_second` times per
+        second. Throttled or failed requests are retried up to `max_retries` times, waiting
+        `retry_delay` seconds (doubling on each retry) first. Cached ABIs are used and new results are
+        cached, see `get_abi`.
+        
+        Returns:
+            OrderedDict of lower case address to ABI ([] if no ABI was found, None if the requests
+            were still throttled or failing after `max_retries` retries).
+        """
+        addresses = list(OrderedDict((address.lower(), None) for address in addresses))
+        cache = get_abi_cache()
+        abis = OrderedDict((address, None) for address in addresses)
+        if cache is not None:
+            for address in addresses:
+                abis[address] = cache.get(address)
+        missing = [address for address in addresses if abis[address] is None]
+        limiter = RateLimiter(requests_per_second)
+        
+        def fetch(address):
+            for attempt in range(max_retries + 1):
+                if attempt > 0:
+                    time.sleep(retry_delay * 2 ** (attempt - 1))
+                limiter.acquire()
+                try:
+                    abi, status = self.request_abi(address)
+                except requests.RequestException:
+                    abi, status = [], "failed"
+                if status not in ("throttled", "failed"):
+                    break
+            return abi, status
+        
+        not_found = 0
+        failed = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for address, (abi, status) in zip(missing, executor.map(fetch, missing)):
+                if cache is not None and status in ("ok", "not_verified"):
+                    cache.put(address, abi)
+                if status in ("throttled", "failed"):
+                    failed += 1
+                    continue
+                abis[address] = abi
+                if status != "ok":
+                    not_found += 1
+        if not_found:
+            warnings.warn("No ABI found on Etherscan for {0} addresses.".format(not_found))
+        if failed:
+            warnings.warn("Requests to Etherscan failed for {0} addresses after {1} retries.".format(failed, max_retries))
+        return abis
+    
+    def request_abi(self, address):
+        """Requests ABI from Etherscan for `address`, without the cache.
+        
+        Returns:
+            Tuple of the ABI ([] unless found) and a status: "ok", "not_verified", "not_found",
+            "throttled" (rate limit reached) or "failed".
+        """
         r = self.get_abi_response(address)
         try:
             if r.json()['status'] == '1':
-                return json.loads(r.json()['result'])
-            else:
-                warnings.warn("No ABI found on Etherscan for {0}.".format(address))
-                return []
+                return json.loads(r.json()['result']), "ok"
+            result = str(r.json()['result'])
         except:
-            warnings.warn("Request to Etherscan failed. Check your API key.")
-            return []
+            return [], "failed"
+        if "rate limit" in result.lower():
+            return [], "throttled"
+        if etherscan_not_verified in result:
+            return [], "not_verified"
+        return [], "not_found"
 
     def get_abi_response(self, address):
         """Requests ABI from Etherscan for `address`"""
         url = "https://api.etherscan.io/api?module=contract&action=getabi&address={0}&apikey={1}".format(address, self.api_key)
-        r = requests.post(url)
+        r = self.session.post(url)
         return r
 
-### BIGQUERY ###
+def prefetch_abis(contracts, etherscan=None, **options):
+    """Loads the ABIs of many `Contract` objects with one concurrent, rate-limited `Etherscan.get_abis`.
+    
+    Contracts whose ABI is already loaded or that do not need a verified ABI (e.g. tokens in "standard"
+    mode) are skipped. Contracts whose requests still fail after the retries are left unloaded, so
+    their ABI is requested again when it is used. `options` are passed to `Etherscan.get_abis`.
+    """
+    contracts = [contract for contract in contracts if not contract.abi_loaded and contract.needs_verified_abi]
+    if not contracts:
+        return
+    if etherscan is None:
+        etherscan = Etherscan()
+    abis = etherscan.get_abis([contract.address for contract in contracts], **options)
+    for contract in contracts:
+        if abis[contract.address] is not None:
+            contract.abi = contract.load_abi(abis[contract.address])
+
+### ABI CACHE ###
+
+# Etherscan result for addresses without a verified ABI
+etherscan_not_verified = "Contract source code not verified"
+
+class AbiCache():
+    """Persistent ABI store in a SQLite database, keyed by address.
+    
+    ABIs are stored as compressed JSON. Found ABIs expire after `ttl` seconds and "No ABI found"
+    results (stored as []) after `negative_ttl` seconds; None never expires. When the stored ABIs
+    exceed `max_bytes`, the least recently used are evicted.
+    
+    Every call opens its own connection and writes in an immediate transaction, so one database
+    can be shared by threads and worker processes.
+    """
+    
+    def __init__(self, path, ttl=30 * 24 * 3600, negative_ttl=24 * 3600, max_bytes=100 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        connection = self.connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("""
+CREATE TABLE IF NOT EXISTS abis (
+  address TEXT PRIMARY KEY,
+  abi BLOB NOT NULL,
+  found INTEGER NOT NULL,
+  fetched_at REAL NOT NULL,
+  used_at REAL NOT NULL
+)""")
+            connection.execute("CREATE INDEX IF NOT EXISTS abis_used_at ON abis (used_at)")
+        finally:
+            connection.close()
+    
+    def connect(self):
+        # Autocommit mode, transactions are started explicitly
+        return sqlite3.connect(self.path, timeout=60, isolation_level=None)
+    
+    def get(self, address):
+        """Returns the cached ABI of `address`, [] for a cached "No ABI found", or None if there is no
+        fresh entry."""
+        address = address.lower()
+        now = time.time()
+        connection = self.connect()
+        try:
+            row = connection.execute(
+                "SELECT abi, found, fetched_at FROM abis WHERE address = ?", (address,)).fetchone()
+            if row is None:
+                return None
+            abi, found, fetched_at = row
+            ttl = self.ttl if found else self.negative_ttl
+            if ttl is not None and now - fetched_at > ttl:
+                return None
+            connection.execute("UPDATE abis SET used_at = ? WHERE address = ?", (now, address))
+        finally:
+            connection.close()
+        return json.loads(zlib.decompress(abi).decode('utf-8'))
+    
+    def put(self, address, abi):
+        """Stores the ABI of `address` ([] for "No ABI found") and evicts entries over `max_bytes`."""
+        address = address.lower()
+        now = time.time()
+        data = zlib.compress(json.dumps(abi).encode('utf-8'))
+        connection = self.connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO abis (address, abi, found, fetched_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                    (address, sqlite3.Binary(data), 1 if abi else 0, now, now))
+                self.evict(connection)
+                connection.execute("COMMIT")
+            except:
+                connection.execute("ROLLBACK")
+                raise
+        finally:
+            connection.close()
+    
+    def evict(self, connection):
+        """Deletes the least recently used entries until the stored ABIs fit in `max_bytes`."""
+        if self.max_bytes is None:
+            return
+        total = connection.execute("SELECT COALESCE(SUM(LENGTH(abi)), 0) FROM abis").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for address, size in connection.execute("SELECT address, LENGTH(abi) FROM abis ORDER BY used_at ASC"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((address,))
+            total -= size
+        connection.executemany("DELETE FROM abis WHERE address = ?", evicted)
+    
+    def clear(self):
+        """Deletes all cached ABIs."""
+        connection = self.connect()
+        try:
+            connection.execute("DELETE FROM abis")
+        finally:
+            connection.close()
+    
+    def __len__(self):
+        connection = self.connect()
+        try:
+            return connection.execute("SELECT COUNT(*) FROM abis").fetchone()[0]
+        finally:
+            connection.close()
 
-class BigQuery():
+abi_cache_settings = {"configured": False, "cache": None}
 
-    def __init__(self):
-        pass
+def configure_abi_cache(path=None, ttl=30 * 24 * 3600, negative_ttl=24 * 3600, max_bytes=100 * 1024 * 1024):
+    """Caches Etherscan ABIs in the SQLite database at `path`, see `AbiCache`. A `path` of None disables
+    the cache.
     
-    def run_query(self, sql, location='US'):
-        """Queries BigQuery with provided the SQL.
+    Without configuration, the cache is used if the ETHDATA_ABI_CACHE environment variable names a path.
+    """
+    abi_cache_settings['configured'] = True
+    abi_cache_settings['cache'] = None if path is None else AbiCache(path, ttl, negative_ttl, max_bytes)
+    return abi_cache_settings['cache']
+
+def get_abi_cache():
+    """Returns the configured `AbiCache`, or None if ABIs are not cached."""
+    if not abi_cache_settings['configured']:
+        path = os.environ.get("ETHDATA_ABI_CACHE")
+        configure_abi_cache(path)
+    return abi_cache_settings['cache']
+
+### QUERY CACHE ###
+
+class QueryCache():
+    """Local cache of raw query results, stored as Parquet files in `directory`.
     
-        Location must match the dataset(s) being queried.
-        """
+    Results are keyed by the normalized SQL and a dataset version:
+    * With a fixed `version` (e.g. the date of the last dataset update you need), results are reused until
+      the version changes.
+    * With `version="tables"`, the version is the last modified time of the tables the query reads. It is
+      looked up once per table and process, see `BigQuery.get_dataset_version`.
+    * Without one, results are reused within the `refresh` period they were cached in. The default of one
+      day matches the daily partitions of the public tables, which are modified every few minutes.
     
-        #logging.debug("Location:\n{0}\n".format(location))
-        #logging.debug("SQL Query:\n{0}\n".format(sql))
-
-        client = bigquery.Client()
-        job_config = bigquery.QueryJobConfig()
-        job_config.use_query_cache = True # Cache available for 24 hours on identical queries
-        query_job = client.query(
-            sql,
-            location=location,      # Location must match that of the dataset(s)
-            job_config=job_config)  # API request
+    When the files exceed `max_bytes`, the least recently used are deleted. Files are written to a
+    temporary file and then renamed, so a directory can be shared by processes.
+    """
+    
+    def __init__(self, directory, max_bytes=1024 ** 3, version=None, refresh=dt.timedelta(days=1)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version
+        self.refresh = refresh
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+    
+    def period(self):
+        """Returns the start (UTC) of the current `refresh` period, the version of results without a `version`."""
+        return pd.Timestamp.now(tz="UTC").floor(pd.Timedelta(self.refresh)).isoformat()
+    
+    def key(self, sql, version=None):
+        """Returns the cache key of `sql` at dataset `version`."""
+        normalized_sql = " ".join(sql.split())
+        return hashlib.sha256("{0}\n{1}".format(normalized_sql, version or "").encode('utf-8')).hexdigest()
     
-        df = query_job.to_dataframe()
+    def path(self, key):
+        return os.path.join(self.directory, "{0}.parquet".format(key))
+    
+    def get(self, key):
+        """Returns the cached dataframe of `key`, or None."""
+        path = self.path(key)
+        try:
+            df = pd.read_parquet(path)
+            # The modification time orders the files for eviction
+            os.utime(path, None)
+        except (OSError, ValueError):
+            return None
         return df
     
-    def get_contract_creation_date(self, contract):
-        """Looks for a contract's creation date using two queries:
-        1. Checks normal transactions.
-        2. Checks internal transactions.
+    def put(self, key, df):
+        """Stores `df` under `key` and evicts files over `max_bytes`."""
+        path = self.path(key)
+        temp_path = "{0}.{1}.{2}.tmp".format(path, os.getpid(), threading.get_ident())
+        df.to_parquet(temp_path, index=False)
+        os.replace(temp_path, path)
+        self.evict()
     
-        If a creation date cannot be found, a default value of January 1, 1970 will be used.
+    def evict(self):
+        """Deletes the least recently used files until the cache fits in `max_bytes`."""
+        if self.max_bytes is None:
+            return
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".parquet"):
+                path = os.path.join(self.directory, name)
+                try:
+                    files.append((os.path.getmtime(path), os.path.getsize(path), path))
+                except OSError:
+                    continue
+        total = sum(size for mtime, size, path in files)
+        for mtime, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+    
+    def clear(self):
+        """Deletes all cached results."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".parquet"):
+                os.remove(os.path.join(self.directory, name))
+
+def get_utc_timestamp(val):
+    """Returns `val` (a date string or datetime, UTC if timezone naive) as a UTC `pd.Timestamp`."""
+    val = pd.Timestamp(val)
+    if val.tzinfo is None:
+        return val.tz_localize("UTC")
+    return val.tz_convert("UTC")
+
+def merge_intervals(intervals):
+    """Returns sorted `(start, end)` intervals with overlapping and adjacent intervals merged."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        elif start < end:
+            merged.append((start, end))
+    return merged
+
+def subtract_intervals(start, end, intervals):
+    """Returns the parts of the interval `[start, end)` that are not in the merged `intervals`."""
+    missing = []
+    for interval_start, interval_end in intervals:
+        if interval_end <= start or interval_start >= end:
+            continue
+        if interval_start > start:
+            missing.append((start, interval_start))
+        start = max(start, interval_end)
+    if start < end:
+        missing.append((start, end))
+    return missing
+
+class RangeCache():
+    """Local cache of the rows of an address in a dataset (e.g. event logs), with the `block_timestamp`
+    intervals they cover.
+    
+    A request only queries the parts of its range that are not cached yet, so widening a range from Q1 to
+    H1 scans Q2 and extending a range to yesterday scans one day. Rows are kept as Parquet files in
+    `directory`, with the covered intervals in a JSON file beside them.
+    
+    Rows less than `delay` old may not all be in the public datasets yet. Their interval is not recorded,
+    so they are queried again by the next request.
+    """
+    
+    # Start of ranges without one
+    genesis = "2015-07-30"
+    
+    def __init__(self, directory, delay=dt.timedelta(hours=1)):
+        self.directory = directory
+        self.delay = delay
+        self.lock = threading.Lock()
+    
+    def path(self, dataset, address):
+        return os.path.join(self.directory, dataset, address.lower())
+    
+    def get_rows(self, dataset, address, query_range, query):
+        """Returns the rows of `address` in `dataset` within `query_range`, in `block_timestamp` order.
+        
+        Args:
+            dataset: name of the dataset, e.g. "logs".
+            address: address the rows belong to.
+            query_range: dict with optional 'start' (inclusive) and 'end' (exclusive) timestamps.
+            query: function that returns the rows within a `{"start": ..., "end": ...}` range from BigQuery.
+        
+        An empty `query_range` (start at or after its end) gives an empty dataframe, like the uncached query.
         """
-        sql = """
-SELECT block_timestamp
-FROM `{0}`
-WHERE address = "{1}"
-LIMIT 1""".format(public_dataset['contracts'], contract.address)
+        start = get_utc_timestamp(query_range.get('start', self.genesis))
+        now = pd.Timestamp.now(tz="UTC")
+        end = get_utc_timestamp(query_range['end']) if 'end' in query_range else now
+        if start >= end:
+            with self.lock:
+                rows = self.load(dataset, address)[0]
+            if rows is not None:
+                return rows.iloc[:0].reset_index(drop=True)
+            # The columns are only known from a query, which selects no rows or partitions
+            return query(query_range)
+        settled = min(end, now - pd.Timedelta(self.delay))
+        
+        with self.lock:
+            rows, intervals = self.load(dataset, address)
+            missing = subtract_intervals(start, end, intervals)
+            if missing:
+                parts = [] if rows is None else [self.drop_intervals(rows, missing)]
+                for missing_start, missing_end in missing:
+                    part = query({"start": missing_start.strftime("%Y-%m-%d %H:%M:%S.%f"),
+                                  "end": missing_end.strftime("%Y-%m-%d %H:%M:%S.%f")})
+                    part['block_timestamp'] = pd.to_datetime(part['block_timestamp'], utc=True)
+                    parts.append(part)
+                rows = pd.concat(parts, ignore_index=True)
+                covered = [(missing_start, min(missing_end, settled)) for missing_start, missing_end in missing]
+                intervals = merge_intervals(intervals + covered)
+                self.save(dataset, address, rows, intervals)
+        
+        in_range = (rows['block_timestamp'] >= start) & (rows['block_timestamp'] < end)
+        return rows[in_range].sort_values(by=['block_timestamp'], kind='mergesort').reset_index(drop=True)
     
-        result = self.run_query(sql)
+    def drop_intervals(self, df, intervals):
+        """Returns the rows of `df` outside `intervals`. Rows left from an unsettled interval are
+        replaced by the new query of that interval, so no row is kept twice."""
+        for start, end in intervals:
+            df = df[(df['block_timestamp'] < start) | (df['block_timestamp'] >= end)]
+        return df
     
+    def load(self, dataset, address):
+        """Returns the cached rows (or None) and covered intervals of `address` in `dataset`."""
+        path = self.path(dataset, address)
         try:
-            return make_tz_naive(result.iloc[0]).strftime("%Y-%m-%d")
+            with open(path + ".json") as f:
+                intervals = [(get_utc_timestamp(start), get_utc_timestamp(end)) for start, end in json.load(f)]
+            rows = pd.read_parquet(path + ".parquet")
+        except (OSError, ValueError):
+            return None, []
+        return rows, intervals
+    
+    def save(self, dataset, address, rows, intervals):
+        path = self.path(dataset, address)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        temp_path = "{0}.{1}.{2}.tmp".format(path, os.getpid(), threading.get_ident())
+        rows.to_parquet(temp_path, index=False)
+        os.replace(temp_path, path + ".parquet")
+        with open(temp_path, "w") as f:
+            json.dump([[start.isoformat(), end.isoformat()] for start, end in intervals], f)
+        os.replace(temp_path, path + ".json")
+
+### BIGQUERY ###
+
+# Settings of the shared BigQuery client, see `configure_bigquery`
+bigquery_defaults = {"project": None, "location": "US", "job_config": None, "client": None, "storage_api": False,
+                     "query_cache": None, "range_cache": None}
+bigquery_settings = dict(bigquery_defaults)
+bigquery_clients = {}
+bigquery_storage_clients = {}
+bigquery_clients_lock = threading.Lock()
+# Last modified time of each table, see `BigQuery.get_dataset_version`
+bigquery_table_versions = {}
+
+# Default of arguments that keep their current setting
+not_set = object()
+
+def configure_bigquery(project=not_set, location=not_set, job_config=not_set, client=not_set, storage_api=not_set,
+                       query_cache=not_set, range_cache=not_set):
+    """Sets up the BigQuery client shared by all `BigQuery` objects.
+    
+    Only the settings that are passed are changed, so `configure_bigquery(storage_api=True)` keeps the project,
+    client and caches set before. `reset_bigquery` restores the defaults.
+    
+    Args:
+        project: project that runs (and is billed for) the queries. Defaults to the project of the credentials.
+        location: default location of queries. Must match the dataset(s) being queried. Defaults to "US".
+        job_config: `bigquery.QueryJobConfig` with the default settings of every query (e.g. `maximum_bytes_billed`).
+        client: `bigquery.Client` to share instead of creating one.
+        storage_api: download results as Arrow record batches, see `BigQuery.download_arrow`.
+        query_cache: `QueryCache` that keeps the results of `run_query` locally.
+        range_cache: `RangeCache` that keeps event logs and transaction receipts locally by `query_range`.
+    """
+    settings = {"project": project, "location": location, "job_config": job_config, "client": client,
+                "storage_api": storage_api, "query_cache": query_cache, "range_cache": range_cache}
+    with bigquery_clients_lock:
+        for name, val in settings.items():
+            if val is not not_set:
+                bigquery_settings[name] = val
+        # Clients are created again for a new project or credentials
+        if project is not not_set or client is not not_set:
+            bigquery_clients.clear()
+            bigquery_storage_clients.clear()
+            bigquery_table_versions.clear()
+
+def reset_bigquery():
+    """Restores the default settings of the shared BigQuery client, see `configure_bigquery`."""
+    with bigquery_clients_lock:
+        bigquery_settings.update(bigquery_defaults)
+        bigquery_clients.clear()
+        bigquery_storage_clients.clear()
+        bigquery_table_versions.clear()
+
+def get_bigquery_client():
+    """Returns the shared `bigquery.Client`, created on first use.
+    
+    Credentials are loaded once per process and the client (and its connection pool) is reused by every
+    query and thread. Worker processes create their own client.
+    """
+    with bigquery_clients_lock:
+        if bigquery_settings['client'] is not None:
+            return bigquery_settings['client']
+        pid = os.getpid()
+        if pid not in bigquery_clients:
+            bigquery_clients.clear()
+            bigquery_clients[pid] = bigquery.Client(project=bigquery_settings['project'])
+        return bigquery_clients[pid]
+
+def get_bigquery_storage_client():
+    """Returns the shared BigQuery Storage Read API client, or None if google-cloud-bigquery-storage
+    is not installed."""
+    with bigquery_clients_lock:
+        pid = os.getpid()
+        if pid not in bigquery_storage_clients:
+            bigquery_storage_clients.clear()
+            try:
+                from google.cloud import bigquery_storage
+                bigquery_storage_clients[pid] = bigquery_storage.BigQueryReadClient()
+            except ImportError:
+                warnings.warn("google-cloud-bigquery-storage is not installed (pip install eth-data-tools[storage]). "
+                              "Arrow results are downloaded with the REST API.")
+                bigquery_storage_clients[pid] = None
+        return bigquery_storage_clients[pid]
+
+class BigQuery():
+
+    def __init__(self, client=None, location=None, job_config=None, storage_api=None, query_cache=None,
+                 range_cache=None):
+        self.client = client
+        self.location = location
+        self.job_config = job_config
+        self.storage_api = storage_api
+        self.query_cache = query_cache
+        self.range_cache = range_cache
+    
+    @property
+    def client(self):
+        """`bigquery.Client` used for queries. Defaults to the shared client, see `configure_bigquery`."""
+        if self.__client is None:
+            return get_bigquery_client()
+        return self.__client
+    
+    @property
+    def location(self):
+        """Default location of queries. Defaults to the shared setting, see `configure_bigquery`."""
+        if self.__location is None:
+            return bigquery_settings['location']
+        return self.__location
+    
+    @property
+    def job_config(self):
+        """`bigquery.QueryJobConfig` with the default settings of queries, or None."""
+        if self.__job_config is None:
+            return bigquery_settings['job_config']
+        return self.__job_config
+    
+    @property
+    def storage_api(self):
+        """True if results are downloaded as Arrow record batches. Defaults to the shared setting."""
+        if self.__storage_api is None:
+            return bigquery_settings['storage_api']
+        return self.__storage_api
+    
+    @property
+    def query_cache(self):
+        """`QueryCache` of `run_query` results, or None. Defaults to the shared setting."""
+        if self.__query_cache is None:
+            return bigquery_settings['query_cache']
+        return self.__query_cache
+    
+    @property
+    def range_cache(self):
+        """`RangeCache` of event logs and transaction receipts, or None. Defaults to the shared setting."""
+        if self.__range_cache is None:
+            return bigquery_settings['range_cache']
+        return self.__range_cache
+    
+    @client.setter
+    def client(self, val):
+        self.__client = val
+    
+    @location.setter
+    def location(self, val):
+        self.__location = val
+    
+    @job_config.setter
+    def job_config(self, val):
+        self.__job_config = val
+    
+    @storage_api.setter
+    def storage_api(self, val):
+        self.__storage_api = val
+    
+    @query_cache.setter
+    def query_cache(self, val):
+        self.__query_cache = val
+    
+    @range_cache.setter
+    def range_cache(self, val):
+        self.__range_cache = val
+    
+    def run_query(self, sql, location=None, query_parameters=None):
+        """Queries BigQuery with provided the SQL.
+        
+        Location must match the dataset(s) being queried. Defaults to `location`.
+        `query_parameters` is a list of `bigquery.ScalarQueryParameter`/`ArrayQueryParameter` used by the SQL.
+        """
+    
+        #logging.debug("Location:\n{0}\n".format(location))
+        #logging.debug("SQL Query:\n{0}\n".format(sql))
+
+        cache = self.query_cache
+        if cache is not None:
+            cache_sql = sql
+            if query_parameters:
+                cache_sql += json.dumps([parameter.to_api_repr() for parameter in query_parameters], sort_keys=True)
+            if cache.version == "tables":
+                version = self.get_dataset_version(sql)
+            else:
+                version = cache.version or cache.period()
+            key = cache.key(cache_sql, version)
+            df = cache.get(key)
+            if df is not None:
+                return df
+        
+        query_job = self.start_query(sql, location, query_parameters)
+        if self.storage_api:
+            df = self.download_arrow(query_job).to_pandas()
+        else:
+            df = query_job.to_dataframe()
+        if cache is not None:
+            cache.put(key, df)
+        return df
+    
+    def get_dataset_version(self, sql):
+        """Returns the last modified times of the tables that `sql` reads (quoted as `project.dataset.table`).
+        
+        Each table is looked up once per process (until `reset_bigquery`), so the version does not change
+        while the public tables are updated.
+        """
+        
+        tables = sorted(set(re.findall(r"`([\w-]+\.\w+\.\w+)`", sql)))
+        for table in tables:
+            if table not in bigquery_table_versions:
+                bigquery_table_versions[table] = str(self.client.get_table(table).modified)
+        return ",".join("{0}@{1}".format(table, bigquery_table_versions[table]) for table in tables)
+    
+    def run_query_arrow(self, sql, location=None):
+        """Queries BigQuery with the provided SQL and returns the results as a `pyarrow.Table`, see `download_arrow`."""
+        
+        return self.download_arrow(self.start_query(sql, location))
+    
+    def download_arrow(self, query_job):
+        """Downloads the results of `query_job` as a `pyarrow.Table`.
+        
+        With google-cloud-bigquery-storage installed, the results are read through the BigQuery Storage
+        Read API as Arrow record batches, from several streams in parallel. Otherwise they are read
+        page by page with the REST API.
+        """
+        
+        rows = query_job.result()
+        # The shared client is used, or the REST API if there is none
+        return rows.to_arrow(bqstorage_client=get_bigquery_storage_client(), create_bqstorage_client=False)
+    
+    def start_query(self, sql, location=None, query_parameters=None):
+        """Starts a BigQuery job for the provided SQL and returns the job."""
+        
+        client = self.client
+        job_config = self.new_job_config()
+        if query_parameters:
+            job_config.query_parameters = query_parameters
+        return client.query(
+            sql,
+            location=location or self.location,     # Location must match that of the dataset(s)
+            job_config=job_config)                  # API request
+    
+    def new_job_config(self):
+        """Returns a new `bigquery.QueryJobConfig` for a query, with the settings of `job_config`."""
+        
+        if self.job_config is None:
+            job_config = bigquery.QueryJobConfig()
+            job_config.use_query_cache = True # Cache available for 24 hours on identical queries
+        else:
+            # Copied, so queries from many threads do not share a config
+            job_config = bigquery.QueryJobConfig.from_api_repr(self.job_config.to_api_repr())
+        return job_config
+    
+    def iter_query(self, sql, chunk_rows=100000, location=None):
+        """Queries BigQuery with the provided SQL and yields the results as dataframes of `chunk_rows` rows
+        (the last one may be shorter).
+        
+        Results are fetched a page at a time, so only about one chunk is held in memory.
+        """
+        
+        query_job = self.start_query(sql, location)
+        if self.storage_api:
+            for df in self.iter_arrow(query_job, chunk_rows):
+                yield df
+            return
+        rows = query_job.result(page_size=chunk_rows)
+        columns = [field.name for field in rows.schema]
+        
+        records = []
+        for page in rows.pages:
+            for row in page:
+                records.append(row.values())
+                if len(records) == chunk_rows:
+                    yield pd.DataFrame.from_records(records, columns=columns)
+                    records = []
+        if len(records) > 0:
+            yield pd.DataFrame.from_records(records, columns=columns)
+    
+    def iter_arrow(self, query_job, chunk_rows=100000):
+        """Yields the results of `query_job` as dataframes of `chunk_rows` rows (the last one may be
+        shorter), converted from Arrow record batches as they are downloaded, see `download_arrow`."""
+        
+        import pyarrow
+        
+        rows = query_job.result()
+        batches = []
+        num_rows = 0
+        for batch in rows.to_arrow_iterable(bqstorage_client=get_bigquery_storage_client()):
+            batches.append(batch)
+            num_rows += batch.num_rows
+            while num_rows >= chunk_rows:
+                table = pyarrow.Table.from_batches(batches)
+                yield table.slice(0, chunk_rows).to_pandas()
+                batches = table.slice(chunk_rows).to_batches()
+                num_rows -= chunk_rows
+        if num_rows > 0:
+            yield pyarrow.Table.from_batches(batches).to_pandas()
+    
+    def get_contract_creation_date(self, contract):
+        """Looks for a contract's creation date using two queries:
+        1. Checks normal transactions.
+        2. Checks internal transactions.
+    
+        If a creation date cannot be found, a default value of January 1, 1970 will be used.
+        """
+        sql = """
+SELECT block_timestamp
+FROM `{0}`
+WHERE address = "{1}"
+LIMIT 1""".format(public_dataset['contracts'], contract.address)
+    
+        result = self.run_query(sql)
+    
+        try:
+            return make_tz_naive(result.iloc[0]).strftime("%Y-%m-%d")
         except:
             # Not found in normal transactions
             # Look for internal transactions (more costly search)
@@ -525,12 +1964,135 @@ LIMIT 1""".format(public_dataset['traces'], contract.address)
         If a `query_range` is found on the `contract`, the results will be limited to that timeframe.
         """
         
+        result = self.get_raw_event_logs(contract)
+        if result.shape[0] > 0:
+            cleaner = CleanDf(**contract.decode_options)
+            result = cleaner.clean_event_logs_df(result, contract)
+            contract.event_log_arrays = cleaner.list_columns
+        return result
+    
+    def get_event_logs_many(self, contracts):
+        """Returns the event logs of many contracts from one query, as a dict of Pandas dataframes
+        keyed by address, each like `get_event_logs`. The dataframes are also set as each contract's
+        `event_logs`.
+        
+        The query reads the `logs` partitions of the union of the contracts' `query_range`s once,
+        instead of once per contract, and skips the gaps between them. Each contract's rows are then
+        limited to its own `query_range` and decoded with its own ABI.
+        """
+        
+        contracts = list(contracts)
+        addresses = sorted(set(contract.address for contract in contracts))
+        sql = self.get_event_logs_many_sql(contracts)
+        query_parameters = [bigquery.ArrayQueryParameter("addresses", "STRING", addresses)]
+        result = self.run_query(sql, query_parameters=query_parameters)
+        if result.shape[0] > 0:
+            result['block_timestamp'] = pd.to_datetime(result['block_timestamp'], utc=True)
+        
+        event_logs = OrderedDict()
+        for contract in contracts:
+            selected = result['address'] == contract.address
+            if 'start' in contract.query_range:
+                selected &= result['block_timestamp'] >= get_utc_timestamp(contract.query_range['start'])
+            if 'end' in contract.query_range:
+                selected &= result['block_timestamp'] < get_utc_timestamp(contract.query_range['end'])
+            df = result[selected].reset_index(drop=True)
+            if df.shape[0] > 0:
+                cleaner = CleanDf(**contract.decode_options)
+                df = cleaner.clean_event_logs_df(df, contract)
+                contract.event_log_arrays = cleaner.list_columns
+            contract.event_logs = df
+            event_logs[contract.address] = df
+        return event_logs
+    
+    def get_event_logs_many_sql(self, contracts):
+        """Returns the SQL that selects the event logs of the `@addresses` parameter, limited to the
+        union of the contracts' `query_range`s.
+        
+        The union is a list of merged intervals, so ranges that are far apart (e.g. January and December)
+        do not scan the months between them.
+        """
+        
+        # Ranges without a start or end are open on that side
+        no_start = pd.Timestamp.min.tz_localize("UTC")
+        no_end = pd.Timestamp.max.tz_localize("UTC")
+        intervals = merge_intervals(
+            (get_utc_timestamp(contract.query_range['start']) if 'start' in contract.query_range else no_start,
+             get_utc_timestamp(contract.query_range['end']) if 'end' in contract.query_range else no_end)
+            for contract in contracts)
+        
+        interval_sql = []
+        for start, end in intervals:
+            bounds = []
+            if start != no_start:
+                bounds.append("block_timestamp >= \"{0}\"".format(start.strftime("%Y-%m-%d %H:%M:%S.%f")))
+            if end != no_end:
+                bounds.append("block_timestamp < \"{0}\"".format(end.strftime("%Y-%m-%d %H:%M:%S.%f")))
+            if bounds:
+                interval_sql.append("({0})".format(" AND ".join(bounds)))
+        
+        date_sql = ""
+        if interval_sql:
+            date_sql = "AND ({0})".format("\n  OR ".join(interval_sql))
+        
+        return self.get_logs_sql("address IN UNNEST(@addresses)", date_sql)
+    
+    def get_event_logs_by_event(self, contract):
+        """Returns the contract's event logs as a dict of Pandas dataframes, one for each event name,
+        with only the topics and data of that event. See `CleanDf.clean_event_logs_by_event`.
+        """
+        
+        result = self.get_raw_event_logs(contract)
+        if result.shape[0] == 0:
+            return OrderedDict()
+        return CleanDf(**contract.decode_options).clean_event_logs_by_event(result, contract)
+    
+    def iter_event_logs(self, contract, chunk_rows=100000):
+        """Yields the contract's event logs as Pandas dataframes of up to `chunk_rows` rows,
+        each cleaned like `get_event_logs`, as the results arrive from BigQuery.
+        
+        Each chunk is in `block_timestamp` order. Empty columns are dropped per chunk.
+        """
+        
+        for result in self.iter_query(self.get_event_logs_sql(contract), chunk_rows):
+            cleaner = CleanDf(**contract.decode_options)
+            result = cleaner.clean_event_logs_df(result, contract)
+            contract.event_log_arrays = cleaner.list_columns
+            yield result
+    
+    def get_raw_event_logs(self, contract):
+        """Returns a Pandas dataframe of the contract's event logs, with raw topics and data.
+        
+        With a `range_cache`, only the parts of `query_range` that are not cached are queried.
+        """
+        
+        if self.range_cache is not None:
+            return self.range_cache.get_rows("logs", contract.address, contract.query_range,
+                                             lambda query_range: self.run_query(self.get_event_logs_sql(contract, query_range)))
+        return self.run_query(self.get_event_logs_sql(contract))
+    
+    def get_event_logs_sql(self, contract, query_range=None):
+        """Returns the SQL that selects the contract's event logs, limited to `query_range`
+        (defaults to the contract's `query_range`)."""
+        
+        if query_range is None:
+            query_range = contract.query_range
         date_sql = ""
-        if 'start' in contract.query_range:
-            date_sql += "AND block_timestamp >= \"{0}\"".format(contract.query_range['start'])
-        if 'end' in contract.query_range:
-            date_sql += "\nAND block_timestamp < \"{0}\"".format(contract.query_range['end'])
+        if 'start' in query_range:
+            date_sql += "AND block_timestamp >= \"{0}\"".format(query_range['start'])
+        if 'end' in query_range:
+            date_sql += "\nAND block_timestamp < \"{0}\"".format(query_range['end'])
             
+        return self.get_logs_sql("address = \"{0}\"".format(contract.address), date_sql)
+    
+    def get_logs_sql(self, address_sql, date_sql=""):
+        """Returns the SQL that selects raw event logs.
+        
+        Args:
+            address_sql: predicate on `address`, e.g. 'address = "0x..."'.
+            date_sql: further conditions on `block_timestamp`, each starting with "AND".
+        """
+        
         sql = """
 SELECT
   transaction_hash
@@ -542,14 +2104,11 @@ SELECT
   ,(SELECT topic FROM UNNEST(topics) topic WITH OFFSET pos WHERE pos = 3) as topics_3
   ,data as transaction_data
 FROM `{0}`
-WHERE address = "{1}"
+WHERE {1}
 {2}
-        """.format(public_dataset['logs'], contract.address, date_sql)
+        """.format(public_dataset['logs'], address_sql, date_sql)
         
-        result = self.run_query(sql)
-        if result.shape[0] > 0:
-            result = CleanDf().clean_event_logs_df(result, contract)
-        return result
+        return sql
     
     def get_transaction_receipts(self, account):
         """Returns a Pandas dataframe of the account's succesful 
@@ -572,11 +2131,59 @@ WHERE address = "{1}"
         will be limited to that timeframe.
         """
         
+        result = self.get_raw_transaction_receipts(account)
+        if result.shape[0] > 0:
+            cleaner = CleanDf(**account.decode_options)
+            result = cleaner.clean_transaction_receipts_df(result, account)
+            account.transaction_receipt_arrays = cleaner.list_columns
+        return result
+    
+    def get_transaction_receipts_by_function(self, contract):
+        """Returns the contract's transaction receipts as a dict of Pandas dataframes, one for each
+        function name, with only the parameters of that function.
+        See `CleanDf.clean_transaction_receipts_by_function`.
+        """
+        
+        result = self.get_raw_transaction_receipts(contract)
+        if result.shape[0] == 0:
+            return OrderedDict()
+        return CleanDf(**contract.decode_options).clean_transaction_receipts_by_function(result, contract)
+    
+    def iter_transaction_receipts(self, account, chunk_rows=100000):
+        """Yields the account's transaction receipts as Pandas dataframes of up to `chunk_rows` rows,
+        each cleaned like `get_transaction_receipts`, as the results arrive from BigQuery.
+        
+        Each chunk is in `block_timestamp` order. Empty columns are dropped per chunk.
+        """
+        
+        for result in self.iter_query(self.get_transaction_receipts_sql(account), chunk_rows):
+            cleaner = CleanDf(**account.decode_options)
+            result = cleaner.clean_transaction_receipts_df(result, account)
+            account.transaction_receipt_arrays = cleaner.list_columns
+            yield result
+    
+    def get_raw_transaction_receipts(self, account):
+        """Returns a Pandas dataframe of the account's succesful transactions, with raw function signatures and data.
+        
+        With a `range_cache`, only the parts of `query_range` that are not cached are queried.
+        """
+        
+        if self.range_cache is not None:
+            return self.range_cache.get_rows("transactions", account.address, account.query_range,
+                                             lambda query_range: self.run_query(self.get_transaction_receipts_sql(account, query_range)))
+        return self.run_query(self.get_transaction_receipts_sql(account))
+    
+    def get_transaction_receipts_sql(self, account, query_range=None):
+        """Returns the SQL that selects the account's succesful transactions, limited to `query_range`
+        (defaults to the account's `query_range`)."""
+        
+        if query_range is None:
+            query_range = account.query_range
         date_sql = ""
-        if 'start' in account.query_range:
-            date_sql += "AND block_timestamp >= \"{0}\"\n".format(account.query_range['start'])
-        if 'end' in account.query_range:
-            date_sql += "AND block_timestamp < \"{0}\"".format(account.query_range['end'])
+        if 'start' in query_range:
+            date_sql += "AND block_timestamp >= \"{0}\"\n".format(query_range['start'])
+        if 'end' in query_range:
+            date_sql += "AND block_timestamp < \"{0}\"".format(query_range['end'])
             
         sql = """
 SELECT
@@ -594,10 +2201,126 @@ WHERE (to_address = "{1}"
 {2}
         """.format(public_dataset['transactions'], account.address, date_sql)
         
+        return sql
+    
+    def get_blocks_at_dates(self, dates):
+        """Returns a Pandas dataframe with the last block at or before each of `dates`, with columns:
+        * date
+        * block_number
+        
+        Dates without a block in the day before them have no row.
+        """
+        
+        sql = self.get_blocks_at_dates_sql(dates)
         result = self.run_query(sql)
-        if result.shape[0] > 0:
-            result = CleanDf().clean_transaction_receipts_df(result, account)
+        result['date'] = pd.to_datetime(result['date']).dt.tz_localize(None)
+        return result
+    
+    def get_blocks_at_dates_sql(self, dates):
+        """Returns the SQL that selects the last block at or before each of `dates`.
+        
+        The blocks in the day before a date are on the date's day or the day before it, so each date is
+        joined to the blocks of those two days by an equality key instead of to every block in the range.
+        """
+        
+        dates = [pd.Timestamp(date) for date in dates]
+        timestamps = ", ".join('TIMESTAMP "{0}"'.format(date.strftime("%Y-%m-%d %H:%M:%S")) for date in dates)
+        sql = """
+WITH days AS (
+  SELECT date, DATE(date) AS day FROM UNNEST([{1}]) AS date
+  UNION ALL
+  SELECT date, DATE_SUB(DATE(date), INTERVAL 1 DAY) AS day FROM UNNEST([{1}]) AS date
+)
+SELECT date, MAX(number) AS block_number
+FROM `{0}` AS blocks
+JOIN days ON DATE(blocks.timestamp) = days.day
+WHERE blocks.timestamp <= date
+  AND blocks.timestamp > TIMESTAMP_SUB(date, INTERVAL 1 DAY)
+  AND blocks.timestamp > TIMESTAMP_SUB(TIMESTAMP "{2}", INTERVAL 1 DAY)
+  AND blocks.timestamp <= TIMESTAMP "{3}"
+GROUP BY date
+ORDER BY date
+        """.format(public_dataset['blocks'], timestamps,
+                   min(dates).strftime("%Y-%m-%d %H:%M:%S"), max(dates).strftime("%Y-%m-%d %H:%M:%S"))
+        
+        return sql
+    
+    def get_block_timestamps(self, blocks):
+        """Returns a Pandas dataframe of the timestamps (UTC) of `blocks`, with columns:
+        * block_number
+        * timestamp
+        """
+        
+        sql = """
+SELECT number AS block_number, timestamp
+FROM `{0}`
+WHERE number IN ({1})
+ORDER BY number
+        """.format(public_dataset['blocks'], ", ".join(str(int(block)) for block in blocks))
+        result = self.run_query(sql)
+        result['timestamp'] = pd.to_datetime(result['timestamp']).dt.tz_localize(None)
         return result
+    
+    def get_token_metadata(self, addresses=None):
+        """Returns a Pandas dataframe of token metadata from the public tokens table, with columns:
+        * address
+        * name
+        * symbol
+        * decimals
+        * total_supply (in tokens, based on `decimals`)
+        
+        Metadata is looked up for `addresses`, or for all tokens if `addresses` is None, in a single
+        query. Addresses missing from the table have no row. Values that are missing or cannot be
+        read are None. An empty list of `addresses` gives an empty dataframe without a query.
+        """
+        
+        query_parameters = None
+        if addresses is not None:
+            addresses = sorted(set(Account(address).address for address in addresses))
+            if not addresses:
+                return self.clean_token_metadata(pd.DataFrame(columns=["address"] + list(token_functions)))
+            query_parameters = [bigquery.ArrayQueryParameter("addresses", "STRING", addresses)]
+        result = self.run_query(self.get_token_metadata_sql(addresses), query_parameters=query_parameters)
+        return self.clean_token_metadata(result)
+    
+    def get_token_metadata_sql(self, addresses=None):
+        """Returns the SQL that selects the latest tokens table row of each address in the `@addresses`
+        parameter, or of all tokens if `addresses` is None."""
+        
+        address_sql = ""
+        if addresses is not None:
+            address_sql = "WHERE address IN UNNEST(@addresses)"
+        
+        sql = """
+SELECT address, name, symbol, decimals, total_supply
+FROM (
+  SELECT address, name, symbol, decimals, total_supply,
+    ROW_NUMBER() OVER (PARTITION BY address ORDER BY block_number DESC) AS row_number
+  FROM `{0}`
+  {1}
+)
+WHERE row_number = 1
+        """.format(public_dataset['tokens'], address_sql)
+        
+        return sql
+    
+    def clean_token_metadata(self, df):
+        """Converts the string `decimals` and `total_supply` of tokens table rows to floats."""
+        
+        rows = []
+        for address, name, symbol, decimals, total_supply in zip(
+                df['address'], df['name'], df['symbol'], df['decimals'], df['total_supply']):
+            try:
+                decimals = float(int(decimals))
+            except:
+                decimals = None
+            try:
+                total_supply = hex_to_float(int(total_supply), decimals=decimals)
+            except:
+                total_supply = None
+            rows.append([address, None if pd.isnull(name) else name, None if pd.isnull(symbol) else symbol,
+                         decimals, total_supply])
+        return pd.DataFrame(rows, columns=["address"] + list(token_functions))
         
 ### HELPERS ###
 
@@ -613,6 +2336,63 @@ def get_event_hash(val):
     keccak_hash.update(val.encode('utf-8'))
     return "0x" + keccak_hash.hexdigest()
 
+def get_abi_functions(abi):
+    """Returns the functions of `abi` keyed by 4-byte function signature."""
+    functions = {}
+    for item in abi:
+        if item['type'] == 'function':
+            function_name = item['name']
+            input_types = []
+            data = OrderedDict()
+
+            for input_ in item['inputs']:
+                input_types.append(input_['type'])
+                data.update({input_['name']: input_['type']})
+
+            function_prehash = "{0}({1})".format(function_name, ",".join(input_types))
+            function_signature = get_function_signature(function_prehash)
+
+            functions[function_signature] = {
+                "function_name": function_name,
+                "data": data,
+                "decoder": DecoderPlan(data)
+            }
+    return functions
+
+def get_abi_events(abi):
+    """Returns the events of `abi` keyed by event hash ("Anonymous" for anonymous events)."""
+    events = {}
+    for item in abi:
+        if item['type'] == 'event':
+            event_name = item['name']
+            input_types = []
+            topics = OrderedDict()
+            data = OrderedDict()
+            anonymous = item['anonymous']
+
+            for input_ in item['inputs']:
+                input_types.append(input_['type'])
+
+                if input_['indexed']:
+                    topics.update({input_['name']: input_['type']})
+                else:
+                    data.update({input_['name']: input_['type']})
+
+            if not anonymous:
+                event_prehash = "{0}({1})".format(event_name, ",".join(input_types))
+                event_hash = get_event_hash(event_prehash)
+            else:
+                event_hash = "Anonymous"
+
+            events[event_hash] = {
+                "event_name": event_name,
+                "topics": topics,
+                "data": data,
+                "topic_decoder": DecoderPlan(topics),
+                "decoder": DecoderPlan(data)
+            }
+    return events
+
 def hex_to_string(val):
     """Converts hex string to utf-8 string.
     
@@ -625,19 +2405,60 @@ def hex_to_string(val):
         s += "0"
     return bytes.fromhex(s).decode('utf-8')
 
-def hex_to_float(val, decimals = 0):
+def hex_to_token_string(val):
+    """Converts the result of a `name()` or `symbol()` call to a string.
+    
+    Accepts ABI-encoded strings and bytes32 values (used by older tokens). Returns None if `val` is
+    neither.
+    """
+    if val is None or len(val) < 66:
+        return None
+    try:
+        data = bytes.fromhex(val[2:])
+    except ValueError:
+        return None
+    if len(data) >= 64 and int.from_bytes(data[:32], 'big') == 32:
+        length = int.from_bytes(data[32:64], 'big')
+        if 64 + length > len(data):
+            return None
+        raw = data[64:64 + length]
+    else:
+        raw = data[:32].rstrip(b'\0')
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+
+def hex_to_float(val, decimals = 0, signed = False):
     """Converts hex string, int or float to float. Accepts `decimals`.
     
+    With `signed`, hex strings are read as 256-bit two's complement (int types).
+    
     Returns a float or error (which should be handled in situ).
     """
 
     try:
         val = int(val, 16)
+        if signed and val >= 2 ** 255:
+            val -= 2 ** 256
     except:
         val = val
         
     return float(val / 10 ** decimals)
 
+def hex_to_word_bytes(val):
+    """Converts a hex string to the 32 bytes of its (left-padded) word.
+    
+    The bytes are the exact big-endian encoding of the value, two's complement for int types.
+    """
+    if val.startswith("0x"):
+        val = val[2:]
+    return bytes.fromhex(val.rjust(64, "0"))
+
+def word_bytes_to_int(val, signed = False):
+    """Converts the 32 bytes of a word (see `hex_to_word_bytes`) back to an exact int."""
+    return int.from_bytes(val, 'big', signed=signed)
+
 def hex_to_address(val):
     """Converts hex string to a clean Ethereum address.
     
@@ -667,20 +2488,824 @@ def make_tz_naive(val):
     
     return dt.datetime(val.year, val.month, val.day)
 
-def clean_hex_data(val, val_type):
+def keep_hex(val):
+    """Returns `val` unchanged."""
+    return val
+
+def keep_hex_with_warning(val, val_type):
+    """Warns that `val_type` cannot be converted and returns `val` unchanged."""
+    warnings.warn("Could not convert data type {0}".format(val_type))
+    return val
+
+integer_modes = ("float", "bytes")
+
+def get_hex_converter(val_type, integers = "float"):
+    """Returns the function that converts a hex value of `val_type`.
+    
+    uint and int values are converted according to `integers`: "float" gives a float (rounded above 2**53),
+    "bytes" gives the exact 32-byte word.
+    
+    Types that cannot be converted get a function that warns and keeps the value as hex.
+    """
     if val_type == "address":          # convert to address
-        return hex_to_address(val)
-    elif val_type.startswith("uint") or val_type.startswith("int"):  # convert to float
-        return hex_to_float(val)
+        return hex_to_address
+    elif val_type.startswith("uint") or val_type.startswith("int"):
+        if integers == "bytes":        # keep the exact word
+            return hex_to_word_bytes
+        elif val_type.startswith("int"): # convert to float, two's complement
+            return partial(hex_to_float, signed=True)
+        return hex_to_float            # convert to float
     elif val_type == "string":
-        return hex_to_string(val)
+        return hex_to_string
     elif val_type.startswith("bytes"): # keep as hex
-        return val
+        return keep_hex
     elif val_type == "bool":
-        return hex_to_bool(val)
+        return hex_to_bool
     else:                              # warn and keep as hex
-        warnings.warn("Could not convert data type {0}".format(val_type))
-        return val
+        return partial(keep_hex_with_warning, val_type=val_type)
+
+def clean_hex_data(val, val_type, integers = "float"):
+    return get_hex_converter(val_type, integers)(val)
+
+def clean_hex_column(values, val_type, integers = "float"):
+    """Converts a sequence of hex strings that share `val_type`.
+    
+    Equivalent to calling `clean_hex_data` on each value, but the type is only inspected once.
+    
+    Returns a list.
+    """
+    convert = get_hex_converter(val_type, integers)
+    return [convert(val) for val in values]
+
+def words_to_float(words, signed=False):
+    """Converts an array of big-endian 32-byte words (shape (n, 32), uint8) to float64.
+    
+    Gives the same, correctly rounded, result as `hex_to_float` without converting each value to a Python int.
+    With `signed`, words are read as 256-bit two's complement.
+    """
+    limbs = np.ascontiguousarray(words).view('>u8').astype(np.uint64)
+    negative = None
+    if signed:
+        negative = np.flatnonzero(limbs[:, 0] >> np.uint64(63))
+        if len(negative) > 0:
+            # Negate in place: invert every limb and add one, carrying from the lowest limb
+            magnitude = ~limbs[negative]
+            carry = np.ones(len(negative), dtype=np.uint64)
+            for j in (3, 2, 1, 0):
+                magnitude[:, j] += carry
+                carry &= (magnitude[:, j] == 0).astype(np.uint64)
+            limbs[negative] = magnitude
+    result = limbs[:, 3].astype(np.float64)
+
+    # Values above 2**64: round the top 64 bits, with the lowest bit set if any bits below them are set
+    nonzero = limbs != 0
+    big = np.flatnonzero(nonzero[:, :3].any(axis=1))
+    if len(big) > 0:
+        first = nonzero[big].argmax(axis=1)
+        hi = limbs[big, first]
+        lo = limbs[big, first + 1]
+        below = np.zeros(len(big), dtype=bool)
+        for j in (2, 3):
+            below |= (first + 2 <= j) & nonzero[big, j]
+
+        # Number of leading zero bits in `hi` (float64 exponents can be one too high after rounding)
+        bit_length = np.minimum(np.frexp(hi.astype(np.float64))[1], 64).astype(np.int64)
+        bit_length -= (hi >> (bit_length - 1).astype(np.uint64)) == 0
+        shift = (64 - bit_length).astype(np.uint64)
+
+        top = (hi << shift) | np.where(shift == 0, np.uint64(0), lo >> (np.uint64(64) - shift))
+        sticky = ((lo << shift) != 0) | below
+        top |= sticky.astype(np.uint64)
+        result[big] = np.ldexp(top.astype(np.float64), 64 * (3 - first) - shift.astype(np.int64))
+    if negative is not None and len(negative) > 0:
+        result[negative] = -result[negative]
+    return result
+
+def words_to_bytes(words):
+    """Converts an array of 32-byte words (shape (n, 32), uint8) to a list of 32-byte `bytes`."""
+    data = np.ascontiguousarray(words).tobytes()
+    return [data[i: i + 32] for i in range(0, len(data), 32)]
+
+# Number of bytes of the values stored as fixed-width binary with CleanDf(binary=True)
+binary_columns = {"transaction_hash": 32, "address": 20, "from_address": 20, "to_address": 20}
+binary_types = {"address": 20, "bytes32": 32, "topic": 32}
+
+def hex_to_fixed_binary(values, num_bytes):
+    """Converts hex strings (with or without "0x") of `num_bytes` bytes to a pyarrow FixedSizeBinaryArray.
+    
+    None values are null. Returns None if any other value is not a hex string of that length.
+    """
+    import pyarrow
+
+    values = to_object_array(values)
+    valid = np.fromiter((isinstance(val, str) for val in values), dtype=bool, count=len(values))
+    if not all(val is None for val in values[~valid]):
+        return None
+    num_chars = 2 * num_bytes
+    lengths = np.fromiter(map(len, values[valid]), dtype=np.int64, count=int(valid.sum()))
+    if not ((lengths == num_chars) | (lengths == num_chars + 2)).all():
+        return None
+
+    data = np.zeros((len(values), num_bytes), dtype=np.uint8)
+    if len(lengths) > 0:
+        chars = np.frombuffer("".join(val[-num_chars:] for val in values[valid]).encode('ascii'), dtype=np.uint8)
+        try:
+            nibbles = hex_to_nibbles(chars)
+        except ValueError:
+            return None
+        data[valid] = ((nibbles[0::2] << 4) | nibbles[1::2]).reshape(-1, num_bytes)
+
+    validity = pyarrow.array(valid).buffers()[1] # bit-packed, as Arrow validity bitmaps
+    return pyarrow.FixedSizeBinaryArray.from_buffers(
+        pyarrow.binary(num_bytes), len(values), [validity, pyarrow.py_buffer(data.tobytes())])
+
+def hex_to_binary(val):
+    """Converts a hex string (e.g. a transaction hash or address) to bytes, to compare with binary columns."""
+    return bytes.fromhex(val[2:] if val.startswith("0x") else val)
+
+def binary_to_hex(values):
+    """Converts binary values (e.g. a column stored with CleanDf(binary=True)) to "0x" hex strings. Nulls are None."""
+    return ["0x" + val.hex() if isinstance(val, bytes) else None for val in values]
+
+def to_object_array(values):
+    """Copies `values` into a 1D object array without letting numpy unpack nested lists."""
+    result = np.empty(len(values), dtype=object)
+    for i, val in enumerate(values):
+        result[i] = val
+    return result
+
+def group_row_positions(values):
+    """Groups row positions by value.
+    
+    Returns a list of (value, positions) tuples in order of first appearance. Missing values are grouped under None.
+    """
+    codes, uniques = pd.factorize(values)
+    order = np.argsort(codes, kind='mergesort')
+    boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+    groups = []
+    for positions in np.split(order, boundaries):
+        if len(positions) == 0:
+            continue
+        code = codes[positions[0]]
+        groups.append((uniques[code] if code >= 0 else None, positions))
+    groups.sort(key=lambda group: group[1][0])
+    return groups
+
+### ABI DECODER PLANS ###
+
+def hex_to_nibbles(chars):
+    """Converts an array of ASCII hex characters (uint8) to their values (0 to 15)."""
+    lower = chars | np.uint8(0x20)
+    nibbles = lower - np.uint8(48)
+    nibbles -= (nibbles > 9) * np.uint8(39)
+    if (nibbles > 15).any() or (lower == 96).any():
+        raise ValueError("Data contains non-hexadecimal characters")
+    return nibbles
+
+
+class WordView:
+    """
+    32-byte words of many hex payloads. Every payload is converted from hex once into one contiguous
+    buffer, padded to a whole number of words, and `words` views that buffer with one row per word.
+    Row `i` owns words `starts[i]` to `starts[i] + counts[i] - 1`.
+    
+    Attributes:
+        hex_data(array): Hexadecimal data of each row
+        offset(int): Number of characters before the first word (2 for "0x" prefixed data)
+        buffer(bytearray): Bytes of every row
+        words(np.ndarray): uint8 view of `buffer` with shape (number of words, 32)
+        starts(np.ndarray): Position of each row's first word in `words`
+        counts(np.ndarray): Number of words in each row
+        integers(string): How uint and int words are converted, one of `integer_modes`
+    """
+
+    def __init__(self, hex_data, offset=0, integers="float"):
+        if integers not in integer_modes:
+            raise ValueError("integers must be one of {}".format(integer_modes))
+        self.hex_data = hex_data
+        self.offset = offset
+        self.integers = integers
+
+        num_rows = len(hex_data)
+        lengths = np.fromiter(map(len, hex_data), dtype=np.int64, count=num_rows)
+        self.counts = (lengths - offset + 63) // 64
+        self.starts = np.zeros(num_rows, dtype=np.int64)
+        if num_rows > 1:
+            np.cumsum(self.counts[:-1], out=self.starts[1:])
+
+        if (lengths - offset == 64 * self.counts).all():
+            # Every payload is a whole number of words: decode all of them in one pass
+            chars = np.frombuffer("".join(hex_data).encode('ascii'), dtype=np.uint8)
+            if offset > 0 and num_rows > 0:
+                row_starts = np.cumsum(lengths) - lengths
+                keep = np.ones(len(chars), dtype=bool)
+                for i in range(offset):
+                    keep[row_starts + i] = False
+                chars = chars[keep]
+            nibbles = hex_to_nibbles(chars)
+            self.buffer = bytearray(((nibbles[0::2] << 4) | nibbles[1::2]).tobytes())
+        else:
+            self.buffer = bytearray(32 * int(self.counts.sum()))
+            for val, start in zip(hex_data, self.starts.tolist()):
+                payload = bytes.fromhex(val[offset:])
+                self.buffer[32 * start: 32 * start + len(payload)] = payload
+
+        if len(self.buffer) > 0:
+            self.words = np.frombuffer(self.buffer, dtype=np.uint8).reshape(-1, 32)
+        else:
+            self.words = np.zeros((0, 32), dtype=np.uint8)
+
+    def check_column(self, k):
+        if (self.counts <= k).any():
+            raise IndexError("Word {} is missing from some rows".format(k))
+
+    def column(self, k):
+        """Returns word `k` of every row as a (number of rows, 32) uint8 array."""
+        self.check_column(k)
+        return self.words[self.starts + k]
+
+    def hex_column(self, k):
+        """Returns word `k` of every row as 64-character hex strings, sliced from `hex_data`."""
+        self.check_column(k)
+        start = self.offset + 64 * k
+        return [val[start: start + 64] for val in self.hex_data]
+
+    def number_column(self, k, signed=False):
+        """Converts word `k` of every row to a number, as set by `integers`. Returns a list."""
+        self.check_column(k)
+        return self.number_words(self.starts + k, signed).tolist()
+
+    def number_words(self, positions, signed=False):
+        """Converts the words at `positions` of `words` to numbers, as set by `integers`. Returns an array."""
+        if self.integers == "bytes":
+            return to_object_array(words_to_bytes(self.words[positions]))
+        return words_to_float(self.words[positions], signed)
+
+    def small_ints(self, positions):
+        """
+        Reads the words at `positions` of `words` as offsets or lengths.
+        
+        Returns an int64 array, or None if any of the words is 2**56 or larger.
+        """
+        words = self.words[positions]
+        if words[:, :25].any():
+            return None
+        return np.ascontiguousarray(words[:, 24:]).view('>u8').ravel().astype(np.int64)
+
+    def hex_words(self, rows, indices):
+        """Returns word `indices[j]` of row `rows[j]` as 64-character hex strings, sliced from `hex_data`."""
+        hex_data = self.hex_data
+        starts = (self.offset + 64 * indices).tolist()
+        return [hex_data[i][start: start + 64] for i, start in zip(rows.tolist(), starts)]
+
+    def row(self, i):
+        """Returns the `RowWords` of row `i`."""
+        return RowWords(self, i)
+
+
+class RowWords:
+    """
+    Words of one row of a `WordView`. Integers are read from the buffer, hex values are sliced from the original data.
+    
+    Attributes:
+        used(set): Positions of words that have already been read
+    """
+
+    def __init__(self, view, i):
+        self.buffer = view.buffer
+        self.hex_string = view.hex_data[i]
+        self.offset = view.offset
+        self.integers = view.integers
+        self.start = int(view.starts[i])
+        self.count = int(view.counts[i])
+        self.used = set()
+
+    def int_at(self, i):
+        """Returns word `i` as an unsigned int."""
+        if not 0 <= i < self.count:
+            raise IndexError("Word {} is out of range".format(i))
+        position = 32 * (self.start + i)
+        return int.from_bytes(self.buffer[position: position + 32], 'big')
+
+    def number_at(self, i, signed=False):
+        """Converts word `i` to a number, as set by `integers`."""
+        if self.integers == "bytes":
+            if not 0 <= i < self.count:
+                raise IndexError("Word {} is out of range".format(i))
+            position = 32 * (self.start + i)
+            return bytes(self.buffer[position: position + 32])
+        val = self.int_at(i)
+        if signed and val >= 2 ** 255:
+            val -= 2 ** 256
+        return float(val)
+
+    def hex_at(self, i, num_chars=64):
+        """Returns `num_chars` hex characters starting at word `i`."""
+        if num_chars == 0:
+            return ""
+        if not 0 <= i < self.count:
+            raise IndexError("Word {} is out of range".format(i))
+        position = self.offset + 64 * i
+        return self.hex_string[position: position + num_chars]
+
+
+class AbiType:
+    """
+    Parsed ABI type. Arrays are parsed from the outermost dimension inwards, so "address[][2]"
+    is a static array of 2 dynamic arrays of addresses.
+    
+    Attributes:
+        type_string(string): Type as written in the ABI
+        kind(string): One of "scalar", "bytes" (string and bytes), "dynamic_array" or "static_array"
+        element(AbiType): Element type of an array
+        length(int): Number of elements in a static array
+        is_dynamic(bool): Whether the value is encoded behind an offset
+        head_words(int): Number of words the value takes up inside an array
+        is_number(bool): Whether the value is a uint or int
+        is_signed(bool): Whether the value is an int (two's complement)
+        convert(function): Converts a word (scalar) or the joined words (string and bytes)
+    """
+
+    def __init__(self, type_string):
+        self.type_string = type_string
+        self.element = None
+        self.length = None
+        self.convert = None
+        self.is_number = type_string.startswith("uint") or type_string.startswith("int")
+        self.is_signed = type_string.startswith("int")
+
+        if type_string.endswith("]"):
+            bracket = type_string.rindex("[")
+            self.element = AbiType(type_string[:bracket])
+            self.is_number = False
+            self.is_signed = False
+            if bracket + 2 == len(type_string):
+                self.kind = "dynamic_array"
+                self.is_dynamic = True
+                self.head_words = 1
+            else:
+                self.kind = "static_array"
+                self.length = int(type_string[bracket + 1:-1])
+                self.is_dynamic = self.element.is_dynamic
+                self.head_words = 1 if self.is_dynamic else self.length * self.element.head_words
+        elif type_string == "string" or type_string == "bytes":
+            self.kind = "bytes"
+            self.is_dynamic = True
+            self.head_words = 1
+            self.convert = get_hex_converter(type_string)
+        else:
+            self.kind = "scalar"
+            self.is_dynamic = False
+            self.head_words = 1
+            self.convert = get_hex_converter(type_string)
+
+    def read(self, row, i):
+        """Converts word `i` of `row` (scalars only)."""
+
+        if self.is_number:
+            return row.number_at(i, self.is_signed)
+        elif self.type_string == "bool":
+            return row.int_at(i) != 0
+        else:
+            return self.convert(row.hex_at(i))
+
+    def read_column(self, view, k):
+        """Converts word `k` of every row of a `WordView` (scalars only). Returns a list."""
+
+        if self.is_number:
+            return view.number_column(k, self.is_signed)
+        elif self.type_string == "bool":
+            return view.column(k).any(axis=1).tolist()
+        else:
+            convert = self.convert
+            return [convert(val) for val in view.hex_column(k)]
+
+    def read_elements(self, view, rows, indices):
+        """Converts word `indices[j]` of row `rows[j]` of a `WordView` (scalars only). Returns an array."""
+
+        if self.is_number:
+            return view.number_words(view.starts[rows] + indices, self.is_signed)
+        elif self.type_string == "bool":
+            return view.words[view.starts[rows] + indices].any(axis=1)
+        else:
+            convert = self.convert
+            return to_object_array([convert(val) for val in view.hex_words(rows, indices)])
+
+    def decode_head(self, row, ind):
+        """
+        Decodes the value of a top-level parameter whose head is word `ind`. Dynamic values (including
+        static arrays of dynamic elements, e.g. "string[2]") are read at the offset in their head, static
+        arrays of static elements are read in place.
+        
+        Words that have been read are added to `row.used`.
+        """
+
+        if self.is_dynamic:
+            offset = row.int_at(ind) // 32  # offset of the first element in the array
+            result = self.decode_at(row, offset)
+            row.used.add(offset)
+            return result
+        elif self.kind == "static_array":
+            return self.decode_at(row, ind)
+        else:
+            return self.read(row, ind)
+
+    def decode_at(self, row, ind):
+        """Decodes a string, bytes or array whose encoding starts at word `ind`."""
+
+        if self.kind == "bytes":
+            length = row.int_at(ind)
+            result = self.convert(row.hex_at(ind + 1, 2 * length))
+            used = int(ceil(length / 32)) + 1
+        elif self.kind == "dynamic_array":
+            length = row.int_at(ind)
+            result = self.element.decode_elements(row, ind + 1, length)
+            used = length + 1
+        else:
+            result = self.element.decode_elements(row, ind, self.length)
+            used = self.length
+
+        # Marking used words
+        row.used.update(range(ind, ind + used))
+        return result
+
+    def decode_elements(self, row, start, count):
+        """Decodes `count` consecutive array elements of this type, starting at word `start`."""
+
+        if self.is_dynamic:
+            return [self.decode_at(row, row.int_at(start + i) // 32 + start) for i in range(count)]
+        elif self.kind == "static_array":
+            return [self.decode_at(row, start + i * self.head_words) for i in range(count)]
+        else:
+            return [self.read(row, start + i) for i in range(count)]
+
+
+class ListColumn:
+    """
+    Array values of many rows, stored as one flat array of elements and the offsets between rows.
+    Row `i` holds `values[offsets[i]:offsets[i + 1]]`, or None where `valid[i]` is False.
+    
+    Arrays of arrays (e.g. "address[][2]" or "uint256[2][]") have a second level of offsets: row `i` holds the
+    inner arrays `offsets[i]` to `offsets[i + 1]`, and inner array `j` is `values[inner_offsets[j]:inner_offsets[j + 1]]`.
+    Deeper arrays keep lists as the elements of the inner arrays.
+    
+    Attributes:
+        values(np.ndarray): Elements of every row
+        offsets(np.ndarray): int64 positions in `values` (or in the inner arrays) where each row starts, plus the
+            end of the last row
+        valid(np.ndarray): False for rows without a value
+        inner_offsets(np.ndarray): int64 positions in `values` where each inner array starts, plus the end of
+            the last one, or None
+    """
+
+    def __init__(self, values, offsets, valid=None, inner_offsets=None):
+        self.values = values
+        self.offsets = offsets
+        self.valid = np.ones(len(offsets) - 1, dtype=bool) if valid is None else valid
+        self.inner_offsets = inner_offsets
+
+    @classmethod
+    def from_lists(cls, lists, nested=None):
+        """
+        Builds a `ListColumn` from a sequence of lists or None. Lists of lists get a second level of offsets.
+        `nested` forces (or prevents) the second level instead of checking the elements.
+        """
+        valid = np.fromiter((val is not None for val in lists), dtype=bool, count=len(lists))
+        lengths = np.fromiter((len(val) if val is not None else 0 for val in lists), dtype=np.int64, count=len(lists))
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        items = [item for val in lists if val is not None for item in val]
+        if nested is None:
+            nested = len(items) > 0 and all(isinstance(item, list) for item in items)
+        if nested:
+            inner = cls.from_lists(items, nested=False)
+            return cls(inner.values, offsets, valid, inner.offsets)
+        return cls(to_object_array(items), offsets, valid)
+
+    @classmethod
+    def scatter(cls, chunks, num_rows):
+        """
+        Combines `ListColumn` chunks into one column of `num_rows` rows.
+        
+        Args:
+            chunks(list): (positions, ListColumn) pairs, where row `j` of the chunk becomes row `positions[j]`
+            num_rows(int): Number of rows of the result. Rows without a chunk are None.
+        Returns:
+            ListColumn
+        """
+        nested = set(column.inner_offsets is not None for positions, column in chunks)
+        if len(nested) > 1:
+            # Arrays of arrays in some chunks only, the inner arrays are kept as lists
+            return cls.from_lists(cls.scatter(
+                [(positions, cls.from_lists(column.to_lists(), nested=False)) for positions, column in chunks],
+                num_rows).to_lists(), nested=False)
+        
+        lengths = np.zeros(num_rows, dtype=np.int64)
+        valid = np.zeros(num_rows, dtype=bool)
+        for positions, column in chunks:
+            lengths[positions] = column.lengths()
+            valid[positions] = column.valid
+        offsets = np.zeros(num_rows + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        # Position of each element (or inner array) of a chunk in the combined column
+        destinations = [np.repeat(offsets[positions] - column.offsets[:-1], column.lengths()) + np.arange(column.offsets[-1])
+                        for positions, column in chunks]
+        if nested == {True}:
+            # Inner arrays move like the elements of a flat column, and their elements move with them
+            inner = cls.scatter([(destination, cls(column.values, column.inner_offsets))
+                                 for destination, (positions, column) in zip(destinations, chunks)], offsets[-1])
+            return cls(inner.values, offsets, valid, inner.offsets)
+        
+        dtypes = set(column.values.dtype for positions, column in chunks)
+        values = np.empty(offsets[-1], dtype=dtypes.pop() if len(dtypes) == 1 else object)
+        for destination, (positions, column) in zip(destinations, chunks):
+            values[destination] = column.values
+        return cls(values, offsets, valid)
+
+    def __len__(self):
+        return len(self.valid)
+
+    def __getitem__(self, i):
+        if not self.valid[i]:
+            return None
+        if self.inner_offsets is not None:
+            inner_offsets = self.inner_offsets
+            return [self.values[inner_offsets[j]: inner_offsets[j + 1]].tolist()
+                    for j in range(self.offsets[i], self.offsets[i + 1])]
+        return self.values[self.offsets[i]: self.offsets[i + 1]].tolist()
+
+    def lengths(self):
+        """Returns the number of elements (or inner arrays) in each row."""
+        return np.diff(self.offsets)
+
+    def elements(self):
+        """Returns the elements of every row, with a list for each inner array of arrays of arrays."""
+        if self.inner_offsets is None:
+            return self.values
+        values = self.values.tolist()
+        bounds = self.inner_offsets.tolist()
+        return to_object_array([values[bounds[j]: bounds[j + 1]] for j in range(len(bounds) - 1)])
+    
+    def to_lists(self):
+        """Returns an object array with a list (or None) for each row."""
+        result = np.full(len(self), None, dtype=object)
+        values = self.elements().tolist()
+        bounds = self.offsets.tolist()
+        for i in np.flatnonzero(self.valid).tolist():
+            result[i] = values[bounds[i]: bounds[i + 1]]
+        return result
+
+    def explode(self, index=None):
+        """
+        Returns a Series with one element (or inner array, as a list) per entry, indexed by the position of its row
+        (or by `index`, e.g. the index of the DataFrame the column belongs to).
+        """
+        if index is None:
+            index = np.arange(len(self))
+        return pd.Series(self.elements(), index=np.repeat(np.asarray(index), self.lengths()))
+
+    def to_arrow(self):
+        """Returns a pyarrow LargeListArray (int64 offsets), of LargeListArrays for arrays of arrays."""
+        import pyarrow
+
+        values = pyarrow.array(self.values)
+        if self.inner_offsets is not None:
+            values = pyarrow.LargeListArray.from_arrays(pyarrow.array(self.inner_offsets), values)
+        return pyarrow.LargeListArray.from_arrays(
+            pyarrow.array(self.offsets), values, mask=pyarrow.array(~self.valid))
+
+
+def get_column_types(entries, prefix):
+    """
+    Returns the ABI types (a set of type strings) of each output column of `contract.functions` or `contract.events`
+    entries. Parameters are under `prefix`, topics under "topic_". Topics that are not supported are kept as raw
+    data under `prefix`, with the type "topic".
+    """
+    column_types = OrderedDict()
+    for entry in entries:
+        if 'topic_decoder' in entry:
+            topic_decoder = entry['topic_decoder']
+            for name, abi_type in zip(topic_decoder.names, topic_decoder.types):
+                if abi_type.kind == "scalar":
+                    column_types.setdefault('topic_' + name, set()).add(abi_type.type_string)
+                else:
+                    column_types.setdefault(prefix + name, set()).add("topic")
+        decoder = entry['decoder']
+        for name, abi_type in zip(decoder.names, decoder.types):
+            column_types.setdefault(prefix + name, set()).add(abi_type.type_string)
+    return column_types
+
+def is_columnar_array(abi_type):
+    """
+    Returns whether `abi_type` is an array that `DecoderPlan.read_array_column` reads a column at a time:
+    a dynamic array of single words ("address[]"), a dynamic array of arrays of single words ("uint256[][]",
+    "uint256[2][]") or a static array of dynamic arrays of single words ("address[][2]").
+    """
+    element = abi_type.element
+    if element is None:
+        return False
+    if abi_type.kind == "dynamic_array":
+        return element.kind == "scalar" or (element.element is not None and element.element.kind == "scalar")
+    return element.kind == "dynamic_array" and element.element.kind == "scalar"
+
+def get_element_words(rows, begins, lengths):
+    """
+    Returns the row and word index of every element of arrays whose `lengths[j]` elements are the words from
+    `begins[j]` of row `rows[j]`, and the int64 offsets between the arrays.
+    """
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    arrays = np.repeat(np.arange(len(lengths)), lengths)
+    return rows[arrays], np.arange(offsets[-1]) - offsets[arrays] + begins[arrays], offsets
+
+def get_list_columns(entries, prefix):
+    """
+    Returns the output columns (`prefix` followed by a parameter name) of `contract.functions` or `contract.events`
+    entries that only ever hold arrays.
+    """
+    column_types = get_column_types(entries, prefix)
+    return [column for column in column_types if all(val_type.endswith("]") for val_type in column_types[column])]
+
+
+class DecoderPlan:
+    """
+    Decodes the parameters of one function or event. Plans are compiled once per ABI entry and
+    reused for every row with that signature.
+    
+    Attributes:
+        names(list): Parameter names, in ABI order
+        types(list): Parsed `AbiType` of each parameter
+        is_flat(bool): True if every parameter is a single word, so values can be read a column at a time
+        is_columnar(bool): True if every parameter is a single word, string, bytes or an array of single words
+            (see `is_columnar_array`), so values can be read a column at a time
+    """
+
+    def __init__(self, data):
+        self.names = list(data)
+        self.types = [AbiType(data[name]) for name in data]
+        self.is_flat = all(abi_type.kind == "scalar" for abi_type in self.types)
+        self.is_columnar = all(abi_type.kind in ("scalar", "bytes") or is_columnar_array(abi_type) for abi_type in self.types)
+
+    def decode(self, row):
+        """
+        Decodes the `RowWords` of one row.
+        
+        Returns a list with a value for each parameter. Parameters whose head has already been read are None.
+        """
+        
+        values = []
+        head = 0
+        for abi_type in self.types:
+            # Checking if row is empty
+            if head in row.used:
+                values.append(None)
+            else:
+                values.append(abi_type.decode_head(row, head))
+            # Static arrays of static values take up more than one head word
+            head += abi_type.head_words
+        return values
+
+    def decode_hex(self, val, offset=0, integers="float"):
+        """Decodes the hex data of a single row."""
+        return self.decode(WordView([val], offset, integers).row(0))
+
+    def decode_columns(self, raw_data, offset=0, integers="float", arrays="list"):
+        """
+        Decodes the hex data of many rows.
+        
+        Args:
+            raw_data(array): Hexadecimal data of each row
+            offset(int): Number of characters before the first word (2 for "0x" prefixed data)
+            integers(string): How uint and int values are converted, one of `integer_modes`
+            arrays(string): "list" returns arrays as lists, "offsets" returns each array parameter as a `ListColumn`
+        Returns:
+            results(OrderedDict): Object array (or `ListColumn`) with the converted values of each parameter
+        """
+
+        results = OrderedDict((name, np.full(len(raw_data), None, dtype=object)) for name in self.names)
+        view = WordView(raw_data, offset, integers)
+        columns = None
+
+        if self.is_flat:
+            # Each value sits in its own word
+            for k, name in enumerate(self.names):
+                results[name][:] = to_object_array(self.types[k].read_column(view, k))
+        elif self.is_columnar:
+            columns = self.read_dynamic_columns(view)
+
+        if columns is not None:
+            for name, column in zip(self.names, columns):
+                results[name] = column
+        elif not self.is_flat:
+            # Nested arrays, static arrays and unusual layouts are decoded per row but still returned per column
+            row_columns = [results[name] for name in self.names]
+            for i in range(len(raw_data)):
+                for column, value in zip(row_columns, self.decode(view.row(i))):
+                    column[i] = value
+
+        for name, abi_type in zip(self.names, self.types):
+            if abi_type.element is None:
+                continue
+            if arrays == "offsets" and not isinstance(results[name], ListColumn):
+                results[name] = ListColumn.from_lists(results[name], nested=abi_type.element.element is not None)
+            elif arrays == "list" and isinstance(results[name], ListColumn):
+                results[name] = results[name].to_lists()
+
+        return results
+
+    def read_dynamic_columns(self, view):
+        """
+        Reads every parameter a column at a time, with the elements of dynamic arrays gathered into a `ListColumn`.
+        Only used if `is_columnar`.
+        
+        Returns a list with the values of each parameter, or None if a row's data is not laid out after the
+        head words (the per row decoder then handles it, including any errors).
+        """
+
+        num_rows = len(view.counts)
+        num_heads = len(self.types)
+        if num_rows == 0 or (view.counts < num_heads).any():
+            return None
+
+        columns = []
+        for k, abi_type in enumerate(self.types):
+            if abi_type.kind == "scalar":
+                columns.append(to_object_array(abi_type.read_column(view, k)))
+                continue
+
+            # Offset of each row's value
+            heads = view.small_ints(view.starts + k)
+            if heads is None:
+                return None
+            first = heads // 32
+            if (first < num_heads).any() or (first >= view.counts).any():
+                return None
+
+            if abi_type.kind == "bytes":
+                lengths = view.small_ints(view.starts + first)
+                if lengths is None or ((lengths > 0) & (first + 1 >= view.counts)).any():
+                    return None
+                convert = abi_type.convert
+                begins = (view.offset + 64 * (first + 1)).tolist()
+                columns.append(to_object_array([
+                    convert(val[begin: begin + 2 * length])
+                    for val, begin, length in zip(view.hex_data, begins, lengths.tolist())]))
+            else:
+                column = self.read_array_column(view, abi_type, first)
+                if column is None:
+                    return None
+                columns.append(column)
+        return columns
+
+    def read_array_column(self, view, abi_type, first):
+        """
+        Reads the array parameter (see `is_columnar_array`) whose encoding starts at word `first` of each row into a
+        `ListColumn`. Arrays of arrays get a second level of offsets.
+        
+        Returns None if any row's data is not laid out after the head words.
+        """
+        
+        num_heads = len(self.types)
+        rows = np.arange(len(view.counts))
+        if abi_type.kind == "dynamic_array":
+            lengths = view.small_ints(view.starts + first)
+            if lengths is None:
+                return None
+            begins = first + 1
+        else:
+            lengths = np.full(len(rows), abi_type.length, dtype=np.int64)
+            begins = first
+        
+        element = abi_type.element
+        if element.kind == "static_array":
+            # Inner arrays of `element.length` words, one after the other
+            if (begins + lengths * element.length > view.counts).any():
+                return None
+            element_rows, indices, offsets = get_element_words(rows, begins, lengths * element.length)
+            values = element.element.read_elements(view, element_rows, indices)
+            inner_offsets = np.arange(0, len(indices) + 1, element.length, dtype=np.int64)
+            return ListColumn(values, offsets // element.length, inner_offsets=inner_offsets)
+        
+        if (begins + lengths > view.counts).any():
+            return None
+        element_rows, indices, offsets = get_element_words(rows, begins, lengths)
+        if element.kind == "scalar":
+            return ListColumn(element.read_elements(view, element_rows, indices), offsets)
+        
+        # Inner dynamic arrays, behind offsets from the start of the outer array's elements
+        inner_heads = view.small_ints(view.starts[element_rows] + indices)
+        if inner_heads is None:
+            return None
+        inner_first = np.repeat(begins, lengths) + inner_heads // 32
+        if (inner_first < num_heads).any() or (inner_first >= view.counts[element_rows]).any():
+            return None
+        inner_lengths = view.small_ints(view.starts[element_rows] + inner_first)
+        if inner_lengths is None or (inner_first + 1 + inner_lengths > view.counts[element_rows]).any():
+            return None
+        inner_rows, inner_indices, inner_offsets = get_element_words(element_rows, inner_first + 1, inner_lengths)
+        values = element.element.read_elements(view, inner_rows, inner_indices)
+        return ListColumn(values, offsets, inner_offsets=inner_offsets)
 
 
 class CleanDf:
@@ -689,16 +3314,36 @@ class CleanDf:
     
     Attributes:
         df(Pandas object - DataFrame): Holds all hexadecimal data to be converted
-        count(int): Helps methods with determining the index of a row that is being processed
-        raw_rows(list): Holds hexadecimal data for a specific transaction or event
-        data_type(string): Type determines how is a row processed
+        vectorized(bool): Decodes rows grouped by signature and assigns each output column once
+        integers(string): How uint and int values are converted. "float" (default) gives floats, which are
+            rounded above 2**53. "bytes" gives the exact 32-byte big-endian word of each value (two's complement
+            for int types), which `word_bytes_to_int` converts back to an int.
+        arrays(string): How array parameters are returned. "list" (default) keeps a list in each cell. "offsets"
+            moves every array column out of `df` into `list_columns`.
+        list_columns(OrderedDict): `ListColumn` of each array column, aligned with the rows of the cleaned `df`
+            (only with arrays="offsets")
+        binary(bool): Stores transaction hashes, addresses, bytes32 values and raw topics as fixed-width binary
+            (Arrow) columns instead of hex strings. Requires pandas 1.5 or later.
+        workers(int): Number of processes that decode `df` in row chunks. 1 (default) decodes in this process.
+        parallel_min_rows(int): Frames with fewer rows are decoded in this process, whatever the `workers`
     """
 
-    def __init__(self):
+    def __init__(self, vectorized=False, integers="float", arrays="list", binary=False, workers=1,
+                 parallel_min_rows=100000):
+        if integers not in integer_modes:
+            raise ValueError("integers must be one of {}".format(integer_modes))
+        if arrays not in ("list", "offsets"):
+            raise ValueError("arrays must be \"list\" or \"offsets\"")
+        if binary and not hasattr(pd, "ArrowDtype"):
+            raise ValueError("Binary columns require pandas 1.5 or later")
         self.df = None
-        self.count = 0
-        self.raw_rows = []
-        self.data_type = None
+        self.vectorized = vectorized
+        self.integers = integers
+        self.arrays = arrays
+        self.list_columns = OrderedDict()
+        self.binary = binary
+        self.workers = workers
+        self.parallel_min_rows = parallel_min_rows
 
     def clean_transaction_receipts_df(self, df, contract):
         """
@@ -711,54 +3356,182 @@ class CleanDf:
         """
 
         self.df = df
+        self.list_columns = OrderedDict()
         self.naive_timestamp()
 
         # Clean empty inputs
-        for row in self.df.itertuples():
-            if row.function_signature == '0x':
-                self.df.at[row.Index, 'function_signature'] = None
-            if row.function_data == '':
-                self.df.at[row.Index, 'function_data'] = None
+        if self.vectorized:
+            for column, empty_value in (('function_signature', '0x'), ('function_data', '')):
+                values = np.array(self.df[column].values, dtype=object)
+                values[values == empty_value] = None
+                self.df[column] = values
+        else:
+            for row in self.df.itertuples():
+                if row.function_signature == '0x':
+                    self.df.at[row.Index, 'function_signature'] = None
+                if row.function_data == '':
+                    self.df.at[row.Index, 'function_data'] = None
         
         if (contract.__class__.__name__ == "Contract" or contract.__class__.__name__ == "Token") and len(contract.functions) > 0:
-            # Create new column for function_name
-            self.df['function_name'] = None
-            for row in self.df.itertuples():
-                if row.function_signature is not None and len(row.function_signature) == 10:
-                    self.df.at[row.Index, 'function_name'] = contract.functions[row.function_signature]['function_name']
-            
-            # Fill columns for function_data
-            for function_signature in contract.functions:
-                for data_name in contract.functions[function_signature]['data']:
-                    self.df['param_' + data_name] = None
-            
-            # Iterate through all of the rows(transactions)
-            for row in self.df.itertuples():
-                try:
-                    data = contract.functions[row.function_signature]['data']
-                except KeyError:
-                    continue
-
-                self.count = 0
-                raw_rows_string = self.df.at[row.Index, "function_data"]
-                self.raw_rows = [raw_rows_string[i: i + 64] for i in range(0, len(raw_rows_string), 64)]
-                # Iterates through all of the data for a specific row(transaction)
-                for data_name in data:
-                    self.data_type = contract.functions[row.function_signature]['data'][data_name]
-                    # Checking if row is empty
-                    if self.raw_rows[self.count] is None:
-                        self.count += 1
-                        continue
-                    result = self.iterate_data()
-                    self.df.at[row.Index, 'param_' + data_name] = result
+            if self.is_parallel():
+                self.decode_in_workers(contract, "transaction_receipts")
+            else:
+                self.decode(contract, "transaction_receipts")
 
             # Delete raw data & empty columns
             self.df.drop(columns=["function_signature", "function_data"], inplace=True)
             self.df.dropna(axis='columns', how='all', inplace=True)
+            self.drop_empty_list_columns()
+
+        if self.binary:
+            functions = contract.functions.values() if hasattr(contract, "functions") else []
+            self.store_binary_columns(self.df, get_column_types(functions, 'param_'))
 
         return self.df
 
 
+    def decode_transaction_receipts_rowwise(self, contract):
+        """
+        Decodes transaction receipts one row at a time, writing each value with `df.at`.
+        Args:
+            contract(Contract object): Holds information to convert DataFrame
+        """
+
+        # Create new column for function_name
+        self.df['function_name'] = None
+        for row in self.df.itertuples():
+            if row.function_signature is not None and len(row.function_signature) == 10:
+                self.df.at[row.Index, 'function_name'] = contract.functions[row.function_signature]['function_name']
+        
+        # Fill columns for function_data
+        for function_signature in contract.functions:
+            for data_name in contract.functions[function_signature]['data']:
+                self.df['param_' + data_name] = None
+        
+        # Iterate through all of the rows(transactions)
+        decoded_rows = []
+        raw_data = []
+        for row in self.df.itertuples():
+            try:
+                decoder = contract.functions[row.function_signature]['decoder']
+            except KeyError:
+                continue
+            if row.function_data:
+                decoded_rows.append((row.Index, decoder))
+                raw_data.append(row.function_data)
+        
+        # The calldata of every row is converted from hex once
+        view = WordView(raw_data, 0, self.integers)
+        for i, (index, decoder) in enumerate(decoded_rows):
+            values = decoder.decode(view.row(i))
+            for data_name, result in zip(decoder.names, values):
+                self.df.at[index, 'param_' + data_name] = result
+
+        if self.arrays == "offsets":
+            self.move_list_columns(get_list_columns(contract.functions.values(), 'param_'))
+
+    def decode_transaction_receipts_grouped(self, contract):
+        """
+        Decodes transaction receipts one `function_signature` group at a time. Each group's calldata is
+        decoded together and every output column is assigned to the DataFrame once.
+        Rows with a signature that is not in the ABI are left empty.
+        Args:
+            contract(Contract object): Holds information to convert DataFrame
+        """
+
+        functions = contract.functions
+        num_rows = self.df.shape[0]
+        list_columns = get_list_columns(functions.values(), 'param_') if self.arrays == "offsets" else []
+        chunks = OrderedDict((column, []) for column in list_columns)
+
+        # Output columns in the same order as the row-wise decoder creates them
+        columns = OrderedDict()
+        columns['function_name'] = np.full(num_rows, None, dtype=object)
+        columns.update(self.function_columns(functions.values(), num_rows))
+
+        for function_signature, positions in group_row_positions(self.df['function_signature'].values):
+            if function_signature not in functions:
+                continue
+            columns['function_name'][positions] = functions[function_signature]['function_name']
+            self.decode_function_group(functions[function_signature], positions, positions, columns, chunks)
+
+        for column in columns:
+            if column not in chunks:
+                self.df[column] = columns[column]
+        for column in chunks:
+            self.list_columns[column] = ListColumn.scatter(chunks[column], num_rows)
+
+    def function_columns(self, functions, num_rows):
+        """Returns empty output columns for the parameters of `functions`, in ABI order."""
+
+        columns = OrderedDict()
+        for function in functions:
+            for data_name in function['data']:
+                if 'param_' + data_name not in columns:
+                    columns['param_' + data_name] = np.full(num_rows, None, dtype=object)
+        return columns
+
+    def decode_function_group(self, function, rows, positions, columns, chunks):
+        """
+        Decodes the calldata of `df` rows `rows`, which all call `function`, into `positions` of the output `columns`.
+        Rows without calldata are left empty.
+        """
+
+        raw_data = self.df['function_data'].values[rows]
+        has_data = np.array([bool(val) for val in raw_data], dtype=bool)
+        results = function['decoder'].decode_columns(raw_data[has_data], 0, self.integers, self.arrays)
+        self.store_results(results, 'param_', positions[has_data], columns, chunks)
+
+    def clean_transaction_receipts_by_function(self, df, contract):
+        """
+        Cleans transaction receipts dataframe into a separate table for each function name. Each table only has
+        the columns of its own function, so the wide DataFrame of every parameter is never built.
+        Array values are kept as lists.
+        Args:
+            df(Pandas object - DataFrame): Holds all hexadecimal data to be converted
+            contract(Contract object): Holds information to convert DataFrame
+        Returns:
+            tables(OrderedDict): Converted DataFrame of each function name, in order of first appearance.
+                Rows that do not call a function in the ABI are under None.
+        """
+
+        self.df = df
+        self.list_columns = OrderedDict()
+        self.naive_timestamp()
+
+        # Clean empty inputs
+        for column, empty_value in (('function_signature', '0x'), ('function_data', '')):
+            values = np.array(self.df[column].values, dtype=object)
+            values[values == empty_value] = None
+            self.df[column] = values
+
+        functions = contract.functions
+        groups = OrderedDict()
+        for function_signature, positions in group_row_positions(self.df['function_signature'].values):
+            if function_signature in functions:
+                function = functions[function_signature]
+                groups.setdefault(function['function_name'], []).append((function, positions))
+            else:
+                groups.setdefault(None, []).append((None, positions))
+
+        tables = OrderedDict()
+        base_columns = [column for column in self.df.columns if column not in ("function_signature", "function_data")]
+        for function_name, entries in groups.items():
+            rows = np.sort(np.concatenate([positions for function, positions in entries]))
+            if function_name is None:
+                tables[function_name] = self.make_table(base_columns, rows, OrderedDict())
+                continue
+            columns = self.function_columns([function for function, positions in entries], len(rows))
+            for function, positions in entries:
+                self.decode_function_group(function, positions, np.searchsorted(rows, positions), columns, OrderedDict())
+            tables[function_name] = self.make_table(base_columns, rows, columns)
+
+        if self.binary:
+            column_types = get_column_types(functions.values(), 'param_')
+            for function_name in tables:
+                self.store_binary_columns(tables[function_name], column_types)
+        return tables
+
     def clean_event_logs_df(self, df, contract):
         """
         Cleans event logs dataframe and tries to add columns with formatted data.
@@ -770,190 +3543,365 @@ class CleanDf:
         """
 
         self.df = df
+        self.list_columns = OrderedDict()
         self.naive_timestamp()
 
         if len(contract.events) > 0:
-            # Count number of anonymous events
-            anon_events = []
-            for item in contract.events:
-                if item == 'Anonymous':
-                    anon_events.append(contract.events[item])
-            
-            # Fill new column for event_name
-            self.df['event_name'] = None
-            for row in self.df.itertuples():
-                try:
-                    self.df.at[row.Index, 'event_name'] = contract.events[row.topics_0]['event_name']
-                except KeyError:
-                    if len(anon_events) == 1:
-                        self.df.at[row.Index, 'event_name'] = contract.events['Anonymous']['event_name']
-                    else:
-                        warnings.warn("Could not find event_name for {}.".format(row.topics_0))
-                        self.df.at[row.Index, 'event_name'] = None
-            
-            # Fill columns for other data  
-            for event_hash in contract.events:
-                for topic_name in contract.events[event_hash]['topics']:
-                    self.df['topic_' + topic_name] = None
-                for data_name in contract.events[event_hash]['data']:
-                    self.df['data_' + data_name] = None
-            
-            # Iterates through all of the data for a specific row(event)
-            for row in self.df.itertuples():
-                try:
-                    topics = contract.events[row.topics_0]['topics']
-                    data = contract.events[row.topics_0]['data']
-                    t = 1 # Start iteration at topic_1
-                except KeyError:
-                    topics = contract.events['Anonymous']['topics']
-                    data = contract.events['Anonymous']['data']
-                    t = 0 # Start iteration at topic_0
-                
-                # Iterate through topics
-                for topic_name in topics:
-                    topic_type = topics[topic_name]
-                    source = self.df.at[row.Index, "topics_{}".format(t)]
-
-                    # Checking for unsupported type
-                    stat1 = "[" in  topic_type
-                    stat2 = topic_type == "bytes" or "string" in topic_type
-                    if stat1 or stat2:
-                        warnings.warn("{} is not yet supported passed as topic".format(topic_type))
-                        self.df.at[row.Index, 'data_' + topic_name] = source
-                        t += 1
-                        continue
-                    
-                    self.df.at[row.Index, 'topic_' + topic_name] = clean_hex_data(source, topic_type)
-                    t += 1
-                
-                self.count = 0
-                raw_rows_string = self.df.at[row.Index, "transaction_data"]
-                if raw_rows_string:
-                    self.raw_rows = [raw_rows_string[2 + i: i + 66] for i in range(0, len(raw_rows_string), 64)]
-
-                # Iterate through data(events)
-                for data_name in data:
-                    self.data_type = data[data_name]
-                    # Checking if row is empty
-                    if self.raw_rows[self.count] is None:
-                        self.count += 1
-                        continue
-                    self.df.at[row.Index, 'data_' + data_name] = self.iterate_data()
+            if self.is_parallel():
+                self.decode_in_workers(contract, "event_logs")
+            else:
+                self.decode(contract, "event_logs")
 
             # Delete raw data & empty columns
             self.df.drop(columns=["topics_0", "topics_1", "topics_2", "topics_3", "transaction_data"], inplace=True)
             self.df.dropna(axis='columns', how='all', inplace=True)
+            self.drop_empty_list_columns()
+
+        if self.binary:
+            self.store_binary_columns(self.df, get_column_types(contract.events.values(), 'data_'))
         
         return self.df
 
-    def iterate_data(self):
+    def decode_event_logs_rowwise(self, contract):
         """
-        Iterates through rows and process them according to ABI
+        Decodes event logs one row at a time, writing each value with `df.at`.
+        Args:
+            contract(Contract object): Holds information to convert DataFrame
+        """
+
+        # Count number of anonymous events
+        anon_events = []
+        for item in contract.events:
+            if item == 'Anonymous':
+                anon_events.append(contract.events[item])
         
-        Returns:
-            result(str/list/int): Converted row
-        """
-
-        raw_row = self.raw_rows[self.count]
-        # Checking if it is a static array
-        stat1 = self.data_type[-2].isdigit()
-        # Checking if it is an array
-        stat2 = "[" in self.data_type
-        # String and bytes are dynamic arrays
-        stat3 = "string" == self.data_type or "bytes" ==  self.data_type
-        
-        # Static array
-        if stat1 and stat2:
-            result = self.static_array(self.count)
-        # Dynamic array
-        elif stat2 or stat3:
-            array_offset = int(hex_to_float(raw_row)/32)  # offset of the first element in the array 
-            result = self.dynamic_array(array_offset)
-            self.raw_rows[array_offset] = None
-        # Not an array  
-        else:
-            result = clean_hex_data(raw_row, self.data_type)
+        # Fill new column for event_name
+        self.df['event_name'] = None
+        for row in self.df.itertuples():
+            try:
+                self.df.at[row.Index, 'event_name'] = contract.events[row.topics_0]['event_name']
+            except KeyError:
+                if len(anon_events) == 1:
+                    self.df.at[row.Index, 'event_name'] = contract.events['Anonymous']['event_name']
+                else:
+                    warnings.warn("Could not find event_name for {}.".format(row.topics_0))
+                    self.df.at[row.Index, 'event_name'] = None
+        
+        # Fill columns for other data  
+        for event_hash in contract.events:
+            for topic_name in contract.events[event_hash]['topics']:
+                self.df['topic_' + topic_name] = None
+            for data_name in contract.events[event_hash]['data']:
+                self.df['data_' + data_name] = None
+        
+        # Iterates through all of the data for a specific row(event)
+        decoded_rows = []
+        raw_data = []
+        for row in self.df.itertuples():
+            try:
+                event = contract.events[row.topics_0]
+                t = 1 # Start iteration at topic_1
+            except KeyError:
+                event = contract.events['Anonymous']
+                t = 0 # Start iteration at topic_0
+            
+            # Iterate through topics
+            topic_decoder = event['topic_decoder']
+            for topic_name, topic_type in zip(topic_decoder.names, topic_decoder.types):
+                source = getattr(row, "topics_{}".format(t))
+
+                # Checking for unsupported type
+                if topic_type.kind != "scalar":
+                    warnings.warn("{} is not yet supported passed as topic".format(topic_type.type_string))
+                    self.df.at[row.Index, 'data_' + topic_name] = source
+                    t += 1
+                    continue
+                
+                convert = get_hex_converter(topic_type.type_string, self.integers)
+                self.df.at[row.Index, 'topic_' + topic_name] = convert(source)
+                t += 1
+            
+            # Data is decoded after the topics of every row
+            raw_rows_string = row.transaction_data
+            if raw_rows_string:
+                decoded_rows.append((row.Index, event['decoder']))
+                raw_data.append(raw_rows_string)
+        
+        # The data of every row is converted from hex once
+        view = WordView(raw_data, 2, self.integers)
+        for i, (index, decoder) in enumerate(decoded_rows):
+            values = decoder.decode(view.row(i))
+            for data_name, result in zip(decoder.names, values):
+                self.df.at[index, 'data_' + data_name] = result
 
-        self.count += 1
-        return result
+        if self.arrays == "offsets":
+            self.move_list_columns(get_list_columns(contract.events.values(), 'data_'))
 
-    def dynamic_array(self, ind):
+    def decode_event_logs_grouped(self, contract):
         """
-        Handles dynamic arrays
-        
+        Decodes event logs one `topics_0` group at a time. Topics and static data words are converted a
+        column at a time and every output column is assigned to the DataFrame once.
+        Gives the same result as `decode_event_logs_rowwise`.
         Args:
-            ind(int): Position of the row that is being processed
-        Returns:
-            result(list): Processed data
+            contract(Contract object): Holds information to convert DataFrame
         """
 
-        array_length = int(clean_hex_data(self.raw_rows[ind], "int"))
-        data_type = self.data_type
-        
-        # String or Bytes
-        if data_type == "string" or data_type == "bytes":
-            num_rows = int(ceil(array_length/32))
-            cut_null = None if (array_length % 32) == 0 else (32 - array_length % 32)*2*-1
-            # Iterating through rows of elements and creating a string with them
-            result = clean_hex_data("".join([self.raw_rows[i + ind + 1] for i in range(num_rows)])[:cut_null], data_type) 
-            for row_index in range(ind, num_rows + 1 + ind):
-                self.raw_rows[row_index] = None
-            return result
-        # Dynamic-Dynamic array
-        elif "[][]" in data_type or data_type == "string[]":
-            self.data_type = data_type[:-2]
-            result = [self.dynamic_array(int(hex_to_float(self.raw_rows[ind + 1 +i])/32) + ind + 1) for i in range(array_length)]
-        # Dynamic-Static array
-        elif "][]" in data_type:
-            self.data_type = data_type.replace("[]", "")
-            inner_array_size = int(data_type[data_type.index("[") + 1: data_type.index("][")])
-            result = [self.static_array(i*inner_array_size + ind + 1) for i in range(array_length)]
-        # 1D dynamic array
-        else:
-            # Iterating through rows of elements and creating a list with them
-            result = [clean_hex_data(self.raw_rows[i + 1 + ind],
-                      data_type.rstrip("[]")) for i in range(array_length)]
+        events = contract.events
+        num_rows = self.df.shape[0]
+        list_columns = get_list_columns(events.values(), 'data_') if self.arrays == "offsets" else []
+        chunks = OrderedDict((column, []) for column in list_columns)
+
+        # Output columns in the same order as the row-wise decoder creates them
+        columns = OrderedDict()
+        columns['event_name'] = np.full(num_rows, None, dtype=object)
+        columns.update(self.event_columns(events.values(), num_rows))
+
+        for event, t, positions in self.group_events(events):
+            if event is None:
+                continue
+            columns['event_name'][positions] = event['event_name']
+            self.decode_event_group(event, t, positions, positions, num_rows, columns, chunks)
+
+        for column in columns:
+            if column not in chunks:
+                self.df[column] = columns[column]
+        for column in chunks:
+            self.list_columns[column] = ListColumn.scatter(chunks[column], num_rows)
+
+    def event_columns(self, events, num_rows):
+        """Returns empty output columns for the topics and data of `events`, in ABI order."""
+
+        columns = OrderedDict()
+        for event in events:
+            for topic_name in event['topics']:
+                if 'topic_' + topic_name not in columns:
+                    columns['topic_' + topic_name] = np.full(num_rows, None, dtype=object)
+            for data_name in event['data']:
+                if 'data_' + data_name not in columns:
+                    columns['data_' + data_name] = np.full(num_rows, None, dtype=object)
+        return columns
+
+    def group_events(self, events):
+        """
+        Groups the rows of `df` by `topics_0`.
         
-        # Making used rows empty
-        for row_index in range(ind, ind + array_length + 1):
-            self.raw_rows[row_index] = None
-        return result
+        Returns a list of (event, index of the first topic, positions) for each group. Rows of unknown events
+        are matched to the 'Anonymous' event if the ABI has one, otherwise their event is None.
+        """
+
+        groups = []
+        for topics_0, positions in group_row_positions(self.df['topics_0'].values):
+            if topics_0 in events:
+                groups.append((events[topics_0], 1, positions)) # Start iteration at topic_1
+            elif 'Anonymous' in events:
+                groups.append((events['Anonymous'], 0, positions)) # Start iteration at topic_0
+            else:
+                warnings.warn("Could not find event_name for {}.".format(topics_0))
+                groups.append((None, 0, positions))
+        return groups
 
-    def static_array(self, ind):
+    def decode_event_group(self, event, t, rows, positions, num_rows, columns, chunks):
         """
-        Handles dynamic arrays
-        
+        Decodes the topics (starting at topic `t`) and data of `df` rows `rows`, which all log `event`,
+        into `positions` of the output `columns` of length `num_rows`. Rows without data are left empty.
+        """
+
+        # Convert topics a column at a time
+        topic_decoder = event['topic_decoder']
+        for topic_name, topic_type in zip(topic_decoder.names, topic_decoder.types):
+            source = self.df["topics_{}".format(t)].values[rows]
+
+            # Checking for unsupported type
+            if topic_type.kind != "scalar":
+                warnings.warn("{} is not yet supported passed as topic".format(topic_type.type_string))
+                if 'data_' + topic_name not in columns:
+                    columns['data_' + topic_name] = np.full(num_rows, None, dtype=object)
+                columns['data_' + topic_name][positions] = to_object_array(source)
+                t += 1
+                continue
+
+            convert = get_hex_converter(topic_type.type_string, self.integers)
+            columns['topic_' + topic_name][positions] = to_object_array([convert(val) for val in source])
+            t += 1
+
+        if len(event['data']) == 0:
+            return
+
+        raw_data = self.df['transaction_data'].values[rows]
+        has_data = np.array([bool(val) for val in raw_data], dtype=bool)
+        results = event['decoder'].decode_columns(raw_data[has_data], 2, self.integers, self.arrays)
+        self.store_results(results, 'data_', positions[has_data], columns, chunks)
+
+    def clean_event_logs_by_event(self, df, contract):
+        """
+        Cleans event logs dataframe into a separate table for each event name. Each table only has the columns
+        of its own event, so the wide DataFrame of every topic and parameter is never built.
+        Array values are kept as lists.
         Args:
-            ind(int): Position of the row that is being processed
+            df(Pandas object - DataFrame): Holds all hexadecimal data to be converted
+            contract(Contract object): Holds information to convert DataFrame
         Returns:
-            result(list): Processed data
+            tables(OrderedDict): Converted DataFrame of each event name, in order of first appearance.
+                Rows of events that are not in the ABI are under None.
         """
 
-        data_type = self.data_type
-        
-        if data_type.count("[") == 1:
-            array_size = int(data_type[data_type.index("[") + 1: -1])
+        self.df = df
+        self.list_columns = OrderedDict()
+        self.naive_timestamp()
+
+        groups = OrderedDict()
+        for event, t, positions in self.group_events(contract.events):
+            event_name = event['event_name'] if event is not None else None
+            groups.setdefault(event_name, []).append((event, t, positions))
+
+        tables = OrderedDict()
+        raw_columns = ("topics_0", "topics_1", "topics_2", "topics_3", "transaction_data")
+        base_columns = [column for column in self.df.columns if column not in raw_columns]
+        for event_name, entries in groups.items():
+            rows = np.sort(np.concatenate([positions for event, t, positions in entries]))
+            if event_name is None:
+                tables[event_name] = self.make_table(base_columns, rows, OrderedDict())
+                continue
+            columns = self.event_columns([event for event, t, positions in entries], len(rows))
+            for event, t, positions in entries:
+                self.decode_event_group(
+                    event, t, positions, np.searchsorted(rows, positions), len(rows), columns, OrderedDict())
+            tables[event_name] = self.make_table(base_columns, rows, columns)
+
+        if self.binary:
+            column_types = get_column_types(contract.events.values(), 'data_')
+            for event_name in tables:
+                self.store_binary_columns(tables[event_name], column_types)
+        return tables
+
+    def make_table(self, base_columns, rows, columns):
+        """Returns a DataFrame with `base_columns` of `df` rows `rows`, followed by the decoded `columns`."""
+
+        table = OrderedDict((column, self.df[column].values[rows]) for column in base_columns)
+        table.update(columns)
+        return pd.DataFrame(table, columns=list(table))
+
+    def decode(self, contract, data_type):
+        """Decodes `df` in this process. `data_type` is "event_logs" or "transaction_receipts"."""
+
+        if data_type == "event_logs":
+            if self.vectorized:
+                self.decode_event_logs_grouped(contract)
+            else:
+                self.decode_event_logs_rowwise(contract)
         else:
-            array_size = int(data_type[data_type.index("][") + 2: -1])
-
-        # Static-Dynamic array
-        if "[]" in data_type or "string" in data_type or "bytes[" in data_type:
-            self.data_type = data_type.replace("[{}]".format(array_size), "")
-            result = [self.dynamic_array(int(hex_to_float(self.raw_rows[ind + i])/32) + ind) for i in range(array_size)]
-        # Static-Static array
-        elif data_type.count("[") == 2:
-            self.data_type = data_type = data_type.replace("[{}]".format(array_size), "")
-            inner_array_size = int(data_type[data_type.index("[") + 1: -1])
-            result = [self.static_array(i*(inner_array_size) + ind) for i in range(array_size)]
-        # 1D static array
+            if self.vectorized:
+                self.decode_transaction_receipts_grouped(contract)
+            else:
+                self.decode_transaction_receipts_rowwise(contract)
+
+    def is_parallel(self):
+        """Whether `df` is large enough to be decoded by `workers` processes."""
+        return self.workers > 1 and self.df.shape[0] >= max(self.parallel_min_rows, 2)
+
+    def decode_in_workers(self, contract, data_type):
+        """
+        Decodes `df` in a pool of `workers` processes. The parsed functions and events are sent to each process
+        once, each process decodes contiguous row chunks of the (timestamp ordered) `df`, and the decoded columns
+        are joined back in row order. Gives the same result as decoding in this process.
+        Args:
+            contract(Contract object): Holds information to convert DataFrame
+            data_type(string): "event_logs" or "transaction_receipts"
+        """
+
+        num_rows = self.df.shape[0]
+        bounds = np.linspace(0, num_rows, min(4 * self.workers, num_rows) + 1).astype(np.int64)
+        options = {"vectorized": self.vectorized, "integers": self.integers, "arrays": self.arrays}
+
+        # Only the raw columns are sent to the workers
+        if data_type == "event_logs":
+            raw_df = self.df[["topics_0", "topics_1", "topics_2", "topics_3", "transaction_data"]]
         else:
-            result = [clean_hex_data(self.raw_rows[ind + i], data_type.rstrip(
-                      "[{}]".format(array_size))) for i in range(int(array_size))]
-        
-        # Making used rows empty
-        for row_index in range(ind, ind + array_size):
-            self.raw_rows[row_index] = None
-        return result
+            raw_df = self.df[["function_signature", "function_data"]]
+        chunks = [(data_type, raw_df.iloc[start:end].reset_index(drop=True)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+        pool = multiprocessing.Pool(self.workers, initializer=init_decode_worker,
+                                    initargs=(contract.address, contract.functions, contract.events, options))
+        try:
+            results = pool.map(decode_chunk, chunks, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+        # Columns in order of first appearance, as when decoding in one process
+        columns = OrderedDict()
+        list_columns = OrderedDict()
+        for start, (chunk_columns, chunk_list_columns, caught) in zip(bounds[:-1], results):
+            for message, category in caught:
+                warnings.warn(message, category)
+            for column in chunk_columns:
+                columns.setdefault(column, []).append((start, chunk_columns[column]))
+            for column in chunk_list_columns:
+                positions = np.arange(start, start + len(chunk_list_columns[column]))
+                list_columns.setdefault(column, []).append((positions, chunk_list_columns[column]))
+
+        for column in columns:
+            values = np.full(num_rows, None, dtype=object)
+            for start, chunk_values in columns[column]:
+                values[start: start + len(chunk_values)] = chunk_values
+            self.df[column] = values
+        for column in list_columns:
+            self.list_columns[column] = ListColumn.scatter(list_columns[column], num_rows)
+
+    def store_binary_columns(self, df, column_types):
+        """
+        Replaces the hex strings of hashes, addresses, bytes32 values and raw topics in `df` with fixed-width
+        binary columns. Columns with values of another length are kept as strings.
+        Args:
+            df(Pandas object - DataFrame): Cleaned DataFrame, changed in place
+            column_types(dict): ABI types of the decoded columns, see `get_column_types`
+        """
+
+        for column in df.columns:
+            if column in binary_columns:
+                num_bytes = binary_columns[column]
+            elif column in column_types and len(column_types[column]) == 1:
+                num_bytes = binary_types.get(next(iter(column_types[column])))
+            else:
+                num_bytes = None
+            if num_bytes is None:
+                continue
+
+            values = hex_to_fixed_binary(df[column].values, num_bytes)
+            if values is None:
+                warnings.warn("Could not store {} as binary".format(column))
+                continue
+            df[column] = pd.arrays.ArrowExtensionArray(values)
+
+    def store_results(self, results, prefix, positions, columns, chunks):
+        """
+        Writes the `decode_columns` results of one group to rows `positions` of the output `columns`.
+        Array columns listed in `chunks` are collected there to be combined once every group is decoded.
+        """
+
+        for data_name in results:
+            column = prefix + data_name
+            values = results[data_name]
+            if column in chunks:
+                chunks[column].append((positions, values))
+                continue
+            if isinstance(values, ListColumn):
+                values = values.to_lists()
+            columns[column][positions] = values
+
+    def move_list_columns(self, list_columns):
+        """Moves array columns decoded as lists from `df` into `list_columns`."""
+
+        for column in list_columns:
+            self.list_columns[column] = ListColumn.from_lists(self.df[column].values)
+        self.df.drop(columns=list_columns, inplace=True)
+
+    def drop_empty_list_columns(self):
+        """Deletes `list_columns` without any values, as empty columns are deleted from `df`."""
+
+        for column in list(self.list_columns):
+            if not self.list_columns[column].valid.any():
+                del self.list_columns[column]
 
     def naive_timestamp(self):
         '''Make timestamp tz naive & re-order by timestamp'''
@@ -961,4 +3909,33 @@ class CleanDf:
         self.df.sort_values(by=['block_timestamp'], ascending=True, inplace=True)
         self.df.reset_index(drop=True, inplace=True)
 
+
+# Contract and options of a decoding worker process, set once by `init_decode_worker`
+decode_worker = {}
+
+def init_decode_worker(address, functions, events, options):
+    """Sets up a worker process of `CleanDf.decode_in_workers` with the parsed ABI of the contract."""
+    contract = Contract(address)
+    contract.abi = []
+    contract.functions = functions
+    contract.events = events
+    decode_worker['contract'] = contract
+    decode_worker['options'] = options
+
+def decode_chunk(chunk):
+    """
+    Decodes a (data_type, DataFrame) chunk in a worker process.
+    
+    Returns the decoded columns, the `ListColumn`s and the (message, category) of each warning raised.
+    """
+    data_type, df = chunk
+    cleaner = CleanDf(**decode_worker['options'])
+    cleaner.df = df
+    raw_columns = list(df.columns)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        cleaner.decode(decode_worker['contract'], data_type)
+    columns = OrderedDict((column, cleaner.df[column].values) for column in cleaner.df.columns if column not in raw_columns)
+    return columns, cleaner.list_columns, [(str(warning.message), warning.category) for warning in caught]
+
     
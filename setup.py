@@ -14,6 +14,8 @@ setuptools.setup(
     url="https://github.com/blocklytics/eth-data-tools",
     packages=setuptools.find_packages(),
     license="MIT",
+    # google-cloud-bigquery 3.x supports Python 3.7 and later
+    python_requires=">=3.7",
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -26,9 +28,13 @@ setuptools.setup(
     install_requires=[
     	'requests',
     	'pycryptodome',
-    	'google-cloud-bigquery[pyarrow]==1.22.0',
+    	'google-cloud-bigquery[pandas,pyarrow]>=3.0.0,<4',
     	'pandas'
     ],
+    extras_require={
+        # Downloads results with the BigQuery Storage Read API, see `configure_bigquery(storage_api=True)`
+        'storage': ['google-cloud-bigquery[bqstorage]>=3.0.0,<4']
+    },
     tests_require=[
         'pytest',
         'pytest-cov',
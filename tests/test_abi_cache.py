@@ -0,0 +1,176 @@
+import pytest
+from ethdata import ethdata
+import multiprocessing
+import time
+
+address = "0x1111111111111111111111111111111111111111"
+abi = ethdata.standard_abis["erc20"]
+
+def put_abis(args):
+    path, start = args
+    cache = ethdata.AbiCache(path)
+    for i in range(start, start + 20):
+        cache.put("0x{0:040x}".format(i), abi)
+    return len(cache)
+
+class AbiResponse(object):
+    def __init__(self, status, result):
+        self.data = {"status": status, "message": "OK" if status == "1" else "NOTOK", "result": result}
+
+    def json(self):
+        return self.data
+
+class AbiSession(object):
+    """Stand-in Etherscan session. Address 0x...2 is not verified, 0x...3 fails."""
+    def __init__(self):
+        self.requests = 0
+
+    def post(self, url):
+        self.requests += 1
+        if "0x2222222222222222222222222222222222222222" in url:
+            return AbiResponse("0", ethdata.etherscan_not_verified)
+        if "0x3333333333333333333333333333333333333333" in url:
+            return AbiResponse("0", "Invalid API Key")
+        return AbiResponse("1", ethdata.json.dumps(abi))
+
+@pytest.fixture
+def abi_cache(tmp_path):
+    cache = ethdata.configure_abi_cache(str(tmp_path / "abis.sqlite"))
+    yield cache
+    ethdata.configure_abi_cache(None)
+
+class TestAbiCache(object):
+    def test_get_put(self, tmp_path):
+        cache = ethdata.AbiCache(str(tmp_path / "cache" / "abis.sqlite"))
+        assert cache.get(address) is None
+        cache.put(address.upper().replace("0X", "0x"), abi)
+        assert cache.get(address) == abi
+        cache.put(address, [])
+        assert cache.get(address) == []
+        assert len(cache) == 1
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_ttl(self, tmp_path):
+        cache = ethdata.AbiCache(str(tmp_path / "abis.sqlite"), ttl=None, negative_ttl=0.01)
+        cache.put(address, abi)
+        cache.put("0x2222222222222222222222222222222222222222", [])
+        time.sleep(0.05)
+        assert cache.get(address) == abi
+        assert cache.get("0x2222222222222222222222222222222222222222") is None
+
+    def test_lru_eviction(self, tmp_path):
+        path = str(tmp_path / "abis.sqlite")
+        size = len(ethdata.zlib.compress(ethdata.json.dumps(abi).encode('utf-8')))
+        cache = ethdata.AbiCache(path, max_bytes=3 * size)
+        addresses = ["0x{0:040x}".format(i) for i in range(4)]
+        for item in addresses[:3]:
+            cache.put(item, abi)
+            time.sleep(0.01)
+        assert cache.get(addresses[0]) == abi
+        cache.put(addresses[3], abi)
+        assert len(cache) == 3
+        assert cache.get(addresses[1]) is None
+        assert cache.get(addresses[0]) == abi
+
+    def test_multiple_processes(self, tmp_path):
+        path = str(tmp_path / "abis.sqlite")
+        ethdata.AbiCache(path)
+        pool = multiprocessing.Pool(4)
+        try:
+            pool.map(put_abis, [(path, start) for start in range(0, 80, 20)])
+        finally:
+            pool.close()
+            pool.join()
+        assert len(ethdata.AbiCache(path)) == 80
+
+    def test_etherscan_get_abi(self, abi_cache):
+        session = AbiSession()
+        my_etherscan = ethdata.Etherscan(session=session)
+        assert my_etherscan.get_abi(address) == abi
+        assert my_etherscan.get_abi(address) == abi
+        with pytest.warns(UserWarning):
+            assert my_etherscan.get_abi("0x2222222222222222222222222222222222222222") == []
+        with pytest.warns(UserWarning):
+            assert my_etherscan.get_abi("0x2222222222222222222222222222222222222222") == []
+        assert session.requests == 2
+        # Failed requests are not cached
+        with pytest.warns(UserWarning):
+            my_etherscan.get_abi("0x3333333333333333333333333333333333333333")
+        assert abi_cache.get("0x3333333333333333333333333333333333333333") is None
+
+class ThrottledSession(AbiSession):
+    """Stand-in Etherscan session that throttles every other request."""
+    def __init__(self):
+        AbiSession.__init__(self)
+        self.attempts = 0
+        self.lock = ethdata.threading.Lock()
+
+    def post(self, url):
+        with self.lock:
+            self.attempts += 1
+            throttled = self.attempts % 2 == 1
+        if throttled:
+            return AbiResponse("0", "Max rate limit reached")
+        return AbiSession.post(self, url)
+
+class TestAbiPrefetch(object):
+    def test_rate_limiter(self):
+        limiter = ethdata.RateLimiter(50)
+        start = time.time()
+        for i in range(6):
+            limiter.acquire()
+        assert time.time() - start >= 0.09
+        with pytest.raises(ValueError):
+            ethdata.RateLimiter(0)
+
+    def test_get_abis_retries_throttled(self):
+        my_etherscan = ethdata.Etherscan(session=ThrottledSession())
+        addresses = ["0x{0:040x}".format(i) for i in range(1, 9)] + ["0x2222222222222222222222222222222222222222"]
+        with pytest.warns(UserWarning, match="No ABI found on Etherscan for 1 addresses"):
+            abis = my_etherscan.get_abis(addresses + addresses[:2], requests_per_second=100, workers=4, retry_delay=0.01)
+        assert list(abis) == addresses
+        assert all(abis[address] == abi for address in addresses[:-1])
+        assert abis[addresses[-1]] == []
+
+    def test_get_abis_gives_up(self):
+        class AlwaysThrottled(object):
+            def post(self, url):
+                return AbiResponse("0", "Max rate limit reached")
+        my_etherscan = ethdata.Etherscan(session=AlwaysThrottled())
+        with pytest.warns(UserWarning, match="failed for 1 addresses after 2 retries"):
+            abis = my_etherscan.get_abis([address], requests_per_second=100, max_retries=2, retry_delay=0.01)
+        assert abis[address] is None
+
+    def test_prefetch_abis_gives_up(self, abi_cache):
+        class AlwaysThrottled(object):
+            def post(self, url):
+                return AbiResponse("0", "Max rate limit reached")
+        my_contract = ethdata.Contract(address)
+        with pytest.warns(UserWarning, match="failed for 1 addresses"):
+            ethdata.prefetch_abis([my_contract], etherscan=ethdata.Etherscan(session=AlwaysThrottled()),
+                                  requests_per_second=100, max_retries=1, retry_delay=0.01)
+        # Left unloaded, so a later prefetch requests it again
+        assert not my_contract.abi_loaded
+        assert len(abi_cache) == 0
+        session = AbiSession()
+        ethdata.prefetch_abis([my_contract], etherscan=ethdata.Etherscan(session=session), requests_per_second=100)
+        assert session.requests == 1
+        assert my_contract.abi == abi
+
+    def test_prefetch_abis(self, abi_cache):
+        session = AbiSession()
+        contracts = [ethdata.Contract("0x{0:040x}".format(i)) for i in range(1, 4)]
+        contracts[0].abi = []
+        token = ethdata.Token("0x{0:040x}".format(4), abi_mode="standard")
+        merged = ethdata.Token("0x{0:040x}".format(5), abi_mode="merge", standard="erc721")
+        ethdata.prefetch_abis(contracts + [token, merged], etherscan=ethdata.Etherscan(session=session), requests_per_second=100)
+        assert session.requests == 3
+        assert contracts[0].abi == []
+        assert contracts[1].abi == abi and contracts[2].abi == abi
+        assert token.abi == ethdata.standard_abis["erc20"]
+        assert merged.abi == ethdata.merge_abis(abi, ethdata.standard_abis["erc721"])
+        assert abi_cache.get(contracts[1].address) == abi
+        # Cached ABIs are not requested again
+        ethdata.prefetch_abis([ethdata.Contract(contracts[1].address)], etherscan=ethdata.Etherscan(session=session))
+        assert session.requests == 3
@@ -761,7 +761,8 @@ class TestTwoDimensionalArrays:
                         "type":"function"}]
 
         # test data to inject into DataFrame for testing
-        test_data = ['0000000000000000000000000000000000000000000000000000000000000040',
+        test_data = ['0000000000000000000000000000000000000000000000000000000000000020',  # offset of the array
+                    '0000000000000000000000000000000000000000000000000000000000000040',
                     '00000000000000000000000000000000000000000000000000000000000000a0',
                     "000000000000000000000000000000000000000000000000000000000000003c",
                     "486f77206d616e79206c697374696e67732077696c6c20446546692050756c73",
@@ -899,6 +900,7 @@ class TestTwoDimensionalArrays:
 
         # test data to inject into DataFrame for testing
         test_data = [
+                    '0000000000000000000000000000000000000000000000000000000000000020',  # offset of the array
                     '0000000000000000000000000000000000000000000000000000000000000040',
                     '00000000000000000000000000000000000000000000000000000000000000c0',
                     '0000000000000000000000000000000000000000000000000000000000000003',
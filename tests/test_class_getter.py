@@ -107,6 +107,24 @@ class TestEventLogsExceptions(object):
     
     # def test_getter_10_anon_events(self):
 
+class TestStreamingGetters(object):
+    """Test cases:
+        13. Event logs in chunks
+        14. Transaction receipts in chunks
+    """
+    
+    def test_getter_13_iter_event_logs(self):
+        my_contract = ethdata.Contract("0x448a5065aebb8e423f0896e6c5d525c040f59af3")
+        my_contract.query_range = {"start":"2018-11-06", "end":"2018-11-06"}
+        chunks = list(my_contract.iter_event_logs(chunk_rows=300))
+        assert [len(chunk) for chunk in chunks] == [300, 300, 200]
+    
+    def test_getter_14_iter_transaction_receipts(self):
+        my_account = ethdata.Account("0xa2381223639181689cd6c46d38a1a4884bb6d83c")
+        my_account.query_range = {"start":"2019-01-29", "end":"2019-01-29"}
+        chunks = list(my_account.iter_transaction_receipts(chunk_rows=5))
+        assert [len(chunk) for chunk in chunks] == [5, 5, 4]
+
 class TestTransactionReceiptsExceptions(object):
     """Test cases:
         11. function without [inputs]
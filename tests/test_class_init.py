@@ -25,3 +25,37 @@ class TestAccountInit(object):
         my_account = ethdata.Account("0x1cB424cB77B19143825004d0bd0a4BEE2c5e91A8")
         assert my_account.address == "0x1cb424cb77b19143825004d0bd0a4bee2c5e91a8"
         assert my_account.query_range == {}
+
+class TestTokenStandardAbi(object):
+    """Test cases:
+        1. Standard mode uses the bundled ABI and precomputed tables
+        2. Merge mode adds the standard entries missing from the verified ABI
+        3. Invalid mode or standard
+    """
+
+    address = "0x1111111111111111111111111111111111111111"
+
+    def test_init_1_standard_mode(self):
+        my_token = ethdata.Token(self.address, abi_mode="standard")
+        assert my_token.abi == ethdata.standard_abis["erc20"]
+        assert my_token.functions["0xa9059cbb"]["function_name"] == "transfer"
+        assert my_token.events["0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"]["event_name"] == "Transfer"
+        assert my_token.functions is not ethdata.get_standard_tables("erc20")["functions"]
+        my_nft = ethdata.Token(self.address, abi_mode="standard", standard="erc721")
+        transfer = my_nft.events["0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"]
+        assert list(transfer["topics"]) == ["_from", "_to", "_tokenId"]
+        assert "0xb88d4fde" in my_nft.functions and "0x42842e0e" in my_nft.functions
+
+    def test_init_2_merge_mode(self):
+        verified = [ethdata.standard_function("transfer", [("to", "address"), ("amount", "uint256")], [("", "bool")], "nonpayable"),
+                    ethdata.standard_function("mint", [("to", "address"), ("amount", "uint256")], [], "nonpayable")]
+        abi = ethdata.merge_abis(verified, ethdata.standard_abis["erc20"])
+        assert abi[:2] == verified
+        assert len(abi) == 2 + len(ethdata.standard_abis["erc20"]) - 1
+        assert [item["inputs"][0]["name"] for item in abi if item.get("name") == "transfer"] == ["to"]
+
+    def test_init_3_invalid_mode(self):
+        with pytest.raises(ValueError):
+            ethdata.Token(self.address, abi_mode="bundled")
+        with pytest.raises(ValueError):
+            ethdata.Token(self.address, standard="erc1155")
@@ -0,0 +1,455 @@
+import pytest
+from ethdata import ethdata
+import pandas as pd
+import numpy as np
+from collections import OrderedDict
+
+
+def word(val):
+    """Left-pads an int or hex string to a 32-byte hex word."""
+    if isinstance(val, int):
+        return "{:064x}".format(val)
+    return val.rjust(64, "0")
+
+
+def is_dynamic_type(abi_type):
+    if abi_type in ("string", "bytes") or abi_type.endswith("[]"):
+        return True
+    if abi_type.endswith("]"):
+        return is_dynamic_type(abi_type[:abi_type.rindex("[")])
+    return False
+
+
+def head_size(abi_type):
+    """Number of head words of a value, following the ABI specification."""
+    if abi_type.endswith("]") and not is_dynamic_type(abi_type):
+        bracket = abi_type.rindex("[")
+        return int(abi_type[bracket + 1:-1]) * head_size(abi_type[:bracket])
+    return 1
+
+
+def encode(abi_types, values):
+    """Encodes `values` of `abi_types` (uint, bool, address, string and arrays of them) as hex."""
+    heads = []
+    tails = []
+    tail_offset = 32 * sum(head_size(abi_type) for abi_type in abi_types)
+    for abi_type, value in zip(abi_types, values):
+        if is_dynamic_type(abi_type):
+            heads.append(word(tail_offset))
+            tails.append(encode_value(abi_type, value))
+            tail_offset += len(tails[-1]) // 2
+        else:
+            heads.append(encode_value(abi_type, value))
+    return "".join(heads + tails)
+
+
+def encode_value(abi_type, value):
+    if abi_type.endswith("[]"):
+        return word(len(value)) + encode([abi_type[:-2]] * len(value), value)
+    if abi_type.endswith("]"):
+        return encode([abi_type[:abi_type.rindex("[")]] * len(value), value)
+    if abi_type == "string":
+        data = value.encode().hex()
+        return word(len(value)) + data.ljust(64 * ((len(data) + 63) // 64), "0")
+    if abi_type == "address":
+        return word(value[2:])
+    return word(int(value))
+
+
+event_abi = [
+    {'anonymous': False,
+     'inputs': [{'indexed': True, 'name': 'from', 'type': 'address'},
+                {'indexed': True, 'name': 'to', 'type': 'address'},
+                {'indexed': False, 'name': 'value', 'type': 'uint256'}],
+     'name': 'Transfer', 'type': 'event'},
+    {'anonymous': False,
+     'inputs': [{'indexed': True, 'name': 'sender', 'type': 'address'},
+                {'indexed': False, 'name': 'path', 'type': 'address[]'},
+                {'indexed': False, 'name': 'note', 'type': 'string'},
+                {'indexed': False, 'name': 'ok', 'type': 'bool'}],
+     'name': 'Route', 'type': 'event'}]
+
+transfer_data = "0x" + word(10 ** 18)
+route_data = "0x" + "".join([
+    word(0x60), word(0xc0), word(1),
+    word(2), word("d5524179cb7ae012f5b642c1d6d700bbaa76b96b"), word("d953e24b1433fbcce94b5f5b282aa67b7e6d59fb"),
+    word(5), "68656c6c6f".ljust(64, "0")])
+
+address_1 = word("59550cdee3fe8685fdb76281f5bbd9a65dc50c51")
+address_2 = word("6690819cb98c1211a8e38790d6cd48316ed518db")
+
+
+def make_event_logs(contract, num_rows=6):
+    transfer, route = list(contract.events.keys())
+    rows = []
+    for i in range(num_rows):
+        if i % 3 == 2:
+            rows.append([route, "0x" + address_1, None, None, route_data])
+        else:
+            rows.append([transfer, "0x" + address_1, "0x" + address_2, None, transfer_data])
+    df = pd.DataFrame(rows, columns=["topics_0", "topics_1", "topics_2", "topics_3", "transaction_data"])
+    df.insert(0, "address", contract.address)
+    df.insert(0, "block_timestamp", pd.date_range("2019-01-01", periods=num_rows, freq="H", tz="UTC"))
+    df.insert(0, "transaction_hash", ["0x{:064x}".format(i) for i in range(num_rows)])
+    return df
+
+
+class TestVectorizedEventLogs:
+    """Test cases:
+        1. Grouped decoding gives the same DataFrame as row-wise decoding
+        2. Static and dynamic values are decoded within their own groups
+    """
+
+    def test_grouped_matches_rowwise(self):
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = event_abi
+        expected = ethdata.CleanDf().clean_event_logs_df(make_event_logs(my_contract), my_contract)
+        returned = ethdata.CleanDf(vectorized=True).clean_event_logs_df(make_event_logs(my_contract), my_contract)
+        pd.testing.assert_frame_equal(returned, expected)
+
+    def test_grouped_values(self):
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = event_abi
+        df = ethdata.CleanDf(vectorized=True).clean_event_logs_df(make_event_logs(my_contract), my_contract)
+        assert list(df.event_name) == ["Transfer", "Transfer", "Route"] * 2
+        assert df.iloc[0].data_value == 1e18
+        assert df.iloc[1].topic_to == "0x6690819cb98c1211a8e38790d6cd48316ed518db"
+        assert df.iloc[2].data_path == ["0xd5524179cb7ae012f5b642c1d6d700bbaa76b96b",
+                                        "0xd953e24b1433fbcce94b5f5b282aa67b7e6d59fb"]
+        assert df.iloc[2].data_note == "hello"
+        assert df.iloc[2].data_ok == True
+
+
+function_abi = [
+    {'constant': False,
+     'inputs': [{'name': '_to', 'type': 'address'}, {'name': '_value', 'type': 'uint256'}],
+     'name': 'transfer', 'outputs': [], 'payable': False, 'type': 'function'},
+    {'constant': False,
+     'inputs': [{'name': '_path', 'type': 'address[]'}, {'name': '_amount', 'type': 'uint256'}],
+     'name': 'convert', 'outputs': [], 'payable': False, 'type': 'function'},
+    {'constant': False, 'inputs': [], 'name': 'withdraw', 'outputs': [], 'payable': False, 'type': 'function'}]
+
+transfer_calldata = address_1 + word(10 ** 18)
+convert_calldata = "".join([
+    word(0x40), word(7), word(2),
+    word("d5524179cb7ae012f5b642c1d6d700bbaa76b96b"), word("d953e24b1433fbcce94b5f5b282aa67b7e6d59fb")])
+
+
+def make_transaction_receipts(contract, num_rows=8, with_empty_calldata=True):
+    transfer, convert, withdraw = list(contract.functions.keys())
+    inputs = [(transfer, transfer_calldata), (convert, convert_calldata), (withdraw, ""), ("0x", "")]
+    if not with_empty_calldata:
+        inputs = inputs[:2] + inputs[3:]
+    rows = [inputs[i % len(inputs)] for i in range(num_rows)]
+    df = pd.DataFrame(rows, columns=["function_signature", "function_data"])
+    df.insert(0, "value", 0.0)
+    df.insert(0, "to_address", contract.address)
+    df.insert(0, "from_address", "0x" + address_1[-40:])
+    df.insert(0, "block_timestamp", pd.date_range("2019-01-01", periods=num_rows, freq="H", tz="UTC"))
+    df.insert(0, "transaction_hash", ["0x{:064x}".format(i) for i in range(num_rows)])
+    return df
+
+
+class TestVectorizedTransactionReceipts:
+    """Test cases:
+        1. Grouped decoding gives the same DataFrame as row-wise decoding
+        2. Empty inputs and unknown signatures are left empty
+    """
+
+    def test_grouped_matches_rowwise(self):
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = function_abi
+        expected = ethdata.CleanDf().clean_transaction_receipts_df(make_transaction_receipts(my_contract), my_contract)
+        returned = ethdata.CleanDf(vectorized=True).clean_transaction_receipts_df(
+            make_transaction_receipts(my_contract), my_contract)
+        pd.testing.assert_frame_equal(returned, expected)
+
+    def test_grouped_values(self):
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = function_abi
+        df = make_transaction_receipts(my_contract)
+        df.loc[3, "function_signature"] = "0xdeadbeef"
+        df = ethdata.CleanDf(vectorized=True).clean_transaction_receipts_df(df, my_contract)
+        assert list(df.function_name[:4]) == ["transfer", "convert", "withdraw", None]
+        assert df.iloc[0].param__value == 1e18
+        assert df.iloc[1].param__path == ["0xd5524179cb7ae012f5b642c1d6d700bbaa76b96b",
+                                          "0xd953e24b1433fbcce94b5f5b282aa67b7e6d59fb"]
+        assert df.iloc[1].param__amount == 7.0
+        assert df.iloc[2].param__to is None
+
+
+class TestNarrowTables:
+    """Test cases:
+        1. Event logs are split into one table per event, with only that event's columns
+        2. Transaction receipts are split into one table per function, unknown calls under None
+    """
+
+    def test_event_logs_by_event(self):
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = event_abi
+        tables = ethdata.CleanDf().clean_event_logs_by_event(make_event_logs(my_contract), my_contract)
+        assert list(tables) == ["Transfer", "Route"]
+        assert list(tables["Transfer"].columns) == [
+            "transaction_hash", "block_timestamp", "address", "topic_from", "topic_to", "data_value"]
+        assert list(tables["Route"].columns) == [
+            "transaction_hash", "block_timestamp", "address", "topic_sender", "data_path", "data_note", "data_ok"]
+        assert list(tables["Transfer"].data_value) == [1e18] * 4
+        assert list(tables["Route"].transaction_hash) == ["0x{:064x}".format(i) for i in (2, 5)]
+        assert tables["Route"].iloc[1].data_note == "hello"
+
+    def test_transaction_receipts_by_function(self):
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = function_abi
+        tables = ethdata.CleanDf().clean_transaction_receipts_by_function(make_transaction_receipts(my_contract), my_contract)
+        assert list(tables) == ["transfer", "convert", "withdraw", None]
+        assert list(tables["convert"].columns) == [
+            "transaction_hash", "block_timestamp", "from_address", "to_address", "value", "param__path", "param__amount"]
+        assert list(tables["convert"].param__amount) == [7.0, 7.0]
+        assert len(tables[None]) == 2
+        assert "param__to" not in tables[None].columns
+
+
+class TestParallelDecoding:
+    """Test cases:
+        1. Decoding in worker processes gives the same DataFrame as decoding in one process
+        2. Small frames are decoded in one process
+    """
+
+    def test_workers_match_sequential(self):
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = event_abi
+        expected = ethdata.CleanDf(vectorized=True).clean_event_logs_df(make_event_logs(my_contract, 30), my_contract)
+        cleaner = ethdata.CleanDf(vectorized=True, workers=2, parallel_min_rows=0)
+        returned = cleaner.clean_event_logs_df(make_event_logs(my_contract, 30), my_contract)
+        pd.testing.assert_frame_equal(returned, expected)
+
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = function_abi
+        expected = ethdata.CleanDf().clean_transaction_receipts_df(
+            make_transaction_receipts(my_contract, 30, with_empty_calldata=False), my_contract)
+        returned = ethdata.CleanDf(workers=2, parallel_min_rows=0).clean_transaction_receipts_df(
+            make_transaction_receipts(my_contract, 30, with_empty_calldata=False), my_contract)
+        pd.testing.assert_frame_equal(returned, expected)
+
+    def test_small_frames_are_sequential(self):
+        cleaner = ethdata.CleanDf(workers=4)
+        cleaner.df = pd.DataFrame({"block_timestamp": range(10)})
+        assert not cleaner.is_parallel()
+        cleaner.parallel_min_rows = 10
+        assert cleaner.is_parallel()
+
+
+class TestBinaryColumns:
+    """Test cases:
+        1. Hashes, addresses and address topics are stored as fixed-width binary
+        2. Binary values convert back to the same hex strings
+    """
+
+    def test_binary_columns(self):
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = event_abi
+        expected = ethdata.CleanDf(vectorized=True).clean_event_logs_df(make_event_logs(my_contract), my_contract)
+        df = ethdata.CleanDf(vectorized=True, binary=True).clean_event_logs_df(make_event_logs(my_contract), my_contract)
+        assert str(df.transaction_hash.dtype) == "fixed_size_binary[32][pyarrow]"
+        assert str(df.topic_to.dtype) == "fixed_size_binary[20][pyarrow]"
+        assert df.data_note.dtype == object
+        for column in ("transaction_hash", "address", "topic_from", "topic_to", "topic_sender"):
+            assert ethdata.binary_to_hex(df[column]) == list(expected[column])
+        selected = df.transaction_hash == ethdata.hex_to_binary("0x{:064x}".format(2))
+        assert list(selected) == [False, False, True, False, False, False]
+
+    def test_hex_to_fixed_binary(self):
+        values = ethdata.hex_to_fixed_binary(["0x" + "ab" * 20, None, "cd" * 20], 20)
+        assert values.to_pylist() == [b"\xab" * 20, None, b"\xcd" * 20]
+        assert ethdata.hex_to_fixed_binary(["0xabcd"], 20) is None
+        assert ethdata.hex_to_fixed_binary(["zz" * 20], 20) is None
+
+
+class TestIntegerModes:
+    """Test cases:
+        1. "bytes" keeps every uint256 and int256 value exact, in both decoders
+        2. int values are read as two's complement
+    """
+
+    integer_abi = [
+        {'anonymous': False,
+         'inputs': [{'indexed': True, 'name': 'delta', 'type': 'int256'},
+                    {'indexed': False, 'name': 'amount', 'type': 'uint256'},
+                    {'indexed': False, 'name': 'change', 'type': 'int128'}],
+         'name': 'Update', 'type': 'event'}]
+    values = [(2 ** 256 - 1, 2 ** 53 + 1, -5), (10 ** 27 + 1, 0, -(2 ** 127))]
+
+    def make_df(self, contract):
+        rows = []
+        for delta, amount, change in self.values:
+            rows.append([list(contract.events.keys())[0], "0x" + word(delta % 2 ** 256), None, None,
+                         "0x" + word(amount) + word(change % 2 ** 256)])
+        df = pd.DataFrame(rows, columns=["topics_0", "topics_1", "topics_2", "topics_3", "transaction_data"])
+        df.insert(0, "block_timestamp", pd.date_range("2019-01-01", periods=len(rows), freq="H", tz="UTC"))
+        return df
+
+    @pytest.mark.parametrize("vectorized", [False, True])
+    def test_exact_bytes(self, vectorized):
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = self.integer_abi
+        df = ethdata.CleanDf(vectorized=vectorized, integers="bytes").clean_event_logs_df(self.make_df(my_contract), my_contract)
+        for i, (delta, amount, change) in enumerate(self.values):
+            assert ethdata.word_bytes_to_int(df.iloc[i].topic_delta, signed=True) == delta - 2 ** 256 * (delta >= 2 ** 255)
+            assert ethdata.word_bytes_to_int(df.iloc[i].data_amount) == amount
+            assert ethdata.word_bytes_to_int(df.iloc[i].data_change, signed=True) == change
+
+    @pytest.mark.parametrize("vectorized", [False, True])
+    def test_signed_float(self, vectorized):
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = self.integer_abi
+        df = ethdata.CleanDf(vectorized=vectorized).clean_event_logs_df(self.make_df(my_contract), my_contract)
+        assert list(df.topic_delta) == [-1.0, 1e27]
+        assert list(df.data_change) == [-5.0, float(-(2 ** 127))]
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            ethdata.CleanDf(integers="decimal")
+
+
+class TestStaticArrays:
+    """Test cases:
+        1. Static arrays of dynamic values are read at the offset in their head
+        2. Parameters after a static array of static values are read after all of its head words
+    """
+
+    types = ["uint256[2]", "uint256", "string[2]", "address[][2]", "bool"]
+    values = [[1, 2], 3, ["hello", "a string of more than thirty-two bytes"],
+              [["0x" + address_1[-40:]], ["0x" + address_2[-40:], "0x" + address_1[-40:]]], True]
+
+    def test_decode(self):
+        plan = ethdata.DecoderPlan(OrderedDict(("p{}".format(i), abi_type) for i, abi_type in enumerate(self.types)))
+        assert plan.decode_hex(encode(self.types, self.values)) == [[1.0, 2.0], 3.0] + self.values[2:]
+
+    def test_transaction_receipts(self):
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = [{'constant': False, 'name': 'f', 'outputs': [], 'payable': False, 'type': 'function',
+                            'inputs': [{'name': "p{}".format(i), 'type': abi_type} for i, abi_type in enumerate(self.types)]}]
+        df = pd.DataFrame({
+            "transaction_hash": ["0x{:064x}".format(i) for i in range(2)],
+            "block_timestamp": pd.date_range("2019-01-01", periods=2, freq="H", tz="UTC"),
+            "from_address": "0x" + address_1[-40:], "to_address": my_contract.address, "value": 0.0,
+            "function_signature": list(my_contract.functions.keys())[0],
+            "function_data": encode(self.types, self.values)})
+        expected = ethdata.CleanDf().clean_transaction_receipts_df(df.copy(), my_contract)
+        returned = ethdata.CleanDf(vectorized=True).clean_transaction_receipts_df(df, my_contract)
+        pd.testing.assert_frame_equal(returned, expected)
+        assert expected.iloc[1].param_p2 == self.values[2]
+        assert expected.iloc[1].param_p3 == self.values[3]
+        assert expected.iloc[1].param_p1 == 3.0 and expected.iloc[1].param_p4 == True
+
+
+class TestListColumns:
+    """Test cases:
+        1. "offsets" moves array columns into flat values and offsets, in both decoders
+        2. Arrays of arrays get flat values and two levels of offsets, whether read by column or by row
+        3. List columns convert to lists, Arrow and exploded Series
+    """
+
+    @pytest.mark.parametrize("vectorized", [False, True])
+    def test_offsets_mode(self, vectorized):
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = event_abi
+        cleaner = ethdata.CleanDf(vectorized=vectorized, arrays="offsets")
+        df = cleaner.clean_event_logs_df(make_event_logs(my_contract), my_contract)
+        assert "data_path" not in df.columns
+        assert list(cleaner.list_columns) == ["data_path"]
+        path = cleaner.list_columns["data_path"]
+        assert list(path.offsets) == [0, 0, 0, 2, 2, 2, 4]
+        assert list(path.valid) == [False, False, True] * 2
+        assert path[2] == ["0xd5524179cb7ae012f5b642c1d6d700bbaa76b96b", "0xd953e24b1433fbcce94b5f5b282aa67b7e6d59fb"]
+        assert path[0] is None
+        assert df.iloc[2].data_note == "hello"
+
+    @pytest.mark.parametrize("vectorized", [False, True])
+    @pytest.mark.parametrize("types", [["address[][2]", "uint256[2][]"], ["address[][2]", "uint256[2][]", "string[2]"]])
+    def test_nested_offsets(self, vectorized, types):
+        addresses = TestStaticArrays.values[3]
+        values = [addresses, [[1.0, 2.0], [3.0, 4.0]], ["a", "b"]][:len(types)]
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = [{'constant': False, 'name': 'f', 'outputs': [], 'payable': False, 'type': 'function',
+                            'inputs': [{'name': "p{}".format(i), 'type': abi_type} for i, abi_type in enumerate(types)]}]
+        df = pd.DataFrame({
+            "transaction_hash": ["0x{:064x}".format(i) for i in range(2)],
+            "block_timestamp": pd.date_range("2019-01-01", periods=2, freq="H", tz="UTC"),
+            "from_address": "0x" + address_1[-40:], "to_address": my_contract.address, "value": 0.0,
+            "function_signature": list(my_contract.functions.keys())[0],
+            "function_data": encode(types, values)})
+        cleaner = ethdata.CleanDf(vectorized=vectorized, arrays="offsets")
+        cleaner.clean_transaction_receipts_df(df, my_contract)
+
+        p0 = cleaner.list_columns["param_p0"]
+        assert p0.values.tolist() == [address for inner in addresses for address in inner] * 2
+        assert p0.inner_offsets.tolist() == [0, 1, 3, 4, 6]
+        assert p0.offsets.tolist() == [0, 2, 4]
+        assert p0[1] == addresses
+        p1 = cleaner.list_columns["param_p1"]
+        assert p1.values.tolist() == [1.0, 2.0, 3.0, 4.0] * 2
+        assert p1.inner_offsets.tolist() == [0, 2, 4, 6, 8]
+        assert p1.to_arrow().to_pylist() == [values[1]] * 2
+        assert list(p1.explode()) == values[1] * 2
+
+    def test_conversions(self):
+        column = ethdata.ListColumn.scatter([
+            (np.array([3, 0]), ethdata.ListColumn.from_lists([[1.0, 2.0], []])),
+            (np.array([2]), ethdata.ListColumn(np.array([3.0]), np.array([0, 1])))], 4)
+        assert list(column.to_lists()) == [[], None, [3.0], [1.0, 2.0]]
+        assert column.to_arrow().to_pylist() == [[], None, [3.0], [1.0, 2.0]]
+        exploded = column.explode()
+        assert list(exploded.index) == [2, 3, 3]
+        assert list(exploded) == [3.0, 1.0, 2.0]
+
+        nested = ethdata.ListColumn.scatter([
+            (np.array([2, 0]), ethdata.ListColumn.from_lists([[[1.0], [2.0, 3.0]], []])),
+            (np.array([1]), ethdata.ListColumn.from_lists([[[], [4.0]]]))], 3)
+        assert nested.values.tolist() == [4.0, 1.0, 2.0, 3.0]
+        assert list(nested.to_lists()) == [[], [[], [4.0]], [[1.0], [2.0, 3.0]]]
+        assert nested.to_arrow().to_pylist() == [[], [[], [4.0]], [[1.0], [2.0, 3.0]]]
+
+
+class TestWordView:
+    """Test cases:
+        1. Payloads share one buffer and keep their own word positions
+        2. Hex values keep the case of the original data
+        3. Row-wise decoding converts the hex data of a frame once
+    """
+
+    def test_word_positions(self):
+        view = ethdata.WordView(["0x" + word(1) + word(2), "0x", "0x" + word(3)], 2)
+        assert list(view.counts) == [2, 0, 1]
+        assert list(view.starts) == [0, 2, 2]
+        assert view.words.shape == (3, 32)
+        assert view.row(0).int_at(1) == 2
+        assert view.row(2).int_at(0) == 3
+        with pytest.raises(IndexError):
+            view.column(1)
+
+    def test_hex_case(self):
+        view = ethdata.WordView([word("4E484D658700BA6642d075b1Ad1303A049fa23E8")])
+        assert ethdata.AbiType("address").read_column(view, 0) == ["0x4E484D658700BA6642d075b1Ad1303A049fa23E8"]
+
+    def test_rowwise_converts_once(self, monkeypatch):
+        views = []
+
+        class CountingWordView(ethdata.WordView):
+            def __init__(self, hex_data, offset=0, integers="float"):
+                views.append(list(hex_data))
+                super().__init__(hex_data, offset, integers)
+
+        monkeypatch.setattr(ethdata, "WordView", CountingWordView)
+        my_contract = ethdata.Contract("0x6690819cb98c1211a8e38790d6cd48316ed518db")
+        my_contract.abi = event_abi
+        ethdata.CleanDf().clean_event_logs_df(make_event_logs(my_contract), my_contract)
+        assert len(views) == 1 and len(views[0]) == 6
+
+        views.clear()
+        my_contract.abi = function_abi
+        df = ethdata.CleanDf().clean_transaction_receipts_df(make_transaction_receipts(my_contract), my_contract)
+        # Calls without calldata are not converted
+        assert len(views) == 1 and views[0] == [transfer_calldata, convert_calldata] * 2
+        assert list(df.function_name[:4]) == ["transfer", "convert", "withdraw", None]
+        assert df.iloc[1].param__amount == 7.0
@@ -23,6 +23,17 @@ class TestHelpers(object):
 	    assert ethdata.hex_to_string("5343484150000000000000000000000000000000000000000000000000000000") == "SCHAP"
 	    assert ethdata.hex_to_string(None) == ""
 
+    def test_hex_to_token_string_method(self):
+        encoded = "0x" + "{:064x}".format(32) + "{:064x}".format(3) + "444149".ljust(64, "0")
+        assert ethdata.hex_to_token_string(encoded) == "DAI"
+        long_name = "A" * 40
+        encoded = "0x" + "{:064x}".format(32) + "{:064x}".format(40) + long_name.encode().hex().ljust(128, "0")
+        assert ethdata.hex_to_token_string(encoded) == long_name
+        assert ethdata.hex_to_token_string("0x4d4b520000000000000000000000000000000000000000000000000000000000") == "MKR"
+        assert ethdata.hex_to_token_string("0x") is None
+        assert ethdata.hex_to_token_string(None) is None
+        assert ethdata.hex_to_token_string("0x" + "ff" * 32) is None
+
     def test_hex_to_float_method(self):
         assert ethdata.hex_to_float(1000000000000000000, decimals=18) == 1
         assert ethdata.hex_to_float(0.123) == 0.123
@@ -31,6 +42,19 @@ class TestHelpers(object):
         assert ethdata.hex_to_float(10) != ethdata.hex_to_float("10")
         assert ethdata.hex_to_float("0x0000000000000000000000000000000000000000033b2e3c9fd0803ce8000000") == 1e+27
         
+    def test_words_to_float_method(self):
+        values = [0, 3735928559, 2 ** 64 - 1, 2 ** 64 + 2 ** 11 + 1, 10 ** 27, 2 ** 256 - 1]
+        hex_values = ["{:064x}".format(val) for val in values]
+        words = ethdata.WordView(hex_values).column(0)
+        assert list(ethdata.words_to_float(words)) == [ethdata.hex_to_float(val) for val in hex_values]
+        assert list(ethdata.words_to_float(words, signed=True)) == [ethdata.hex_to_float(val, signed=True) for val in hex_values]
+        assert ethdata.words_to_float(words, signed=True)[-1] == -1
+
+    def test_word_bytes_method(self):
+        assert ethdata.hex_to_word_bytes("0xdeadbeef") == bytes(28) + bytes.fromhex("deadbeef")
+        assert ethdata.word_bytes_to_int(ethdata.hex_to_word_bytes("f" * 64)) == 2 ** 256 - 1
+        assert ethdata.word_bytes_to_int(ethdata.hex_to_word_bytes("f" * 64), signed=True) == -1
+
     def test_clean_hex_data(self):
         assert ethdata.clean_hex_data("2e6236591bfa37c683ce60d6cfde40396a114ff1", "address") == "0x2e6236591bfa37c683ce60d6cfde40396a114ff1"
         assert ethdata.clean_hex_data("0xdeadbeef", "uint256") == 3735928559
@@ -38,6 +62,9 @@ class TestHelpers(object):
         assert ethdata.clean_hex_data("0xdeadbeef", "int256") == 3735928559
         assert ethdata.clean_hex_data("0xdeadbeef", "int64") == 3735928559
         assert ethdata.clean_hex_data("0xdeadbeef", "int8") == 3735928559
+        assert ethdata.clean_hex_data("0x" + "f" * 64, "int256") == -1
+        assert ethdata.clean_hex_data("0x" + "f" * 64, "uint256") == float(2 ** 256 - 1)
+        assert ethdata.clean_hex_data("0x" + "f" * 64, "uint256", integers="bytes") == b"\xff" * 32
         assert ethdata.clean_hex_data("5343484150000000000000000000000000000000000000000000000000000000", "string") == "SCHAP"
         assert ethdata.clean_hex_data(0, "bool") == False
         with pytest.warns(UserWarning):
@@ -1,6 +1,44 @@
 import pytest
 from ethdata import ethdata
 import os
+import json
+import time
+import asyncio
+import threading
+import weakref
+import gc
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+class BatchResponse(object):
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+class BatchSession(object):
+    """Stand-in session answering eth_calls with the call's address, batches in reverse order."""
+    def __init__(self):
+        self.batches = []
+
+    def post(self, url, json=None):
+        self.batches.append(json)
+        if isinstance(json, dict):
+            return BatchResponse(self.answer([json])[0])
+        return BatchResponse(self.answer(json))
+
+    def answer(self, requests):
+        responses = []
+        for request in reversed(requests):
+            to = request['params'][0]['to']
+            if to == "error":
+                responses.append({"jsonrpc": "2.0", "id": request['id'], "error": {"code": -32000, "message": "execution reverted"}})
+            elif to == "empty":
+                responses.append({"jsonrpc": "2.0", "id": request['id'], "result": "0x"})
+            elif to != "missing":
+                responses.append({"jsonrpc": "2.0", "id": request['id'], "result": to})
+        return responses
 
 class TestEnvironmentVariables(object):
     def test_google_auth(self):
@@ -31,6 +69,743 @@ class TestExternalServiceInit(object):
 
     # TODO: def test_bigquery_init(self):
 
+class TestHttpSessions(object):
+    def test_shared_sessions(self):
+        assert ethdata.Infura().session is ethdata.Infura().session
+        assert ethdata.Etherscan().session is ethdata.Etherscan().session
+        assert ethdata.Infura().session is not ethdata.Etherscan().session
+        assert ethdata.Infura().session is ethdata.get_http_session("infura")
+
+    def test_injected_session(self):
+        session = ethdata.requests.Session()
+        my_infura = ethdata.Infura(session=session)
+        assert my_infura.session is session
+        my_infura.session = None
+        assert my_infura.session is ethdata.get_http_session("infura")
+
+    def test_configure_http_sessions(self):
+        old_session = ethdata.get_http_session("infura")
+        ethdata.configure_http_sessions(pool_size=3, keep_alive=False)
+        try:
+            session = ethdata.get_http_session("infura")
+            assert session is not old_session
+            assert session.get_adapter("https://mainnet.infura.io")._pool_maxsize == 3
+            assert session.headers['Connection'] == 'close'
+        finally:
+            ethdata.configure_http_sessions()
+        assert ethdata.get_http_session("infura").headers['Connection'] == 'keep-alive'
+
+class TestBatchCalls(object):
+    def setup_method(self, method):
+        ethdata.eth_call_cache.clear()
+
+    def test_eth_call_many(self):
+        session = BatchSession()
+        my_infura = ethdata.Infura(session=session)
+        calls = [("0x{0:02x}".format(i), "name()") for i in range(7)]
+        assert my_infura.eth_call_many(calls, batch_size=3) == [to for to, function in calls]
+        assert [len(batch) for batch in session.batches] == [3, 3, 1]
+        assert [request['id'] for batch in session.batches for request in batch] == list(range(7))
+        assert session.batches[0][0]['params'][0]['data'] == ethdata.get_function_signature("name()")
+
+    def test_eth_call_many_errors(self):
+        my_infura = ethdata.Infura(session=BatchSession())
+        calls = [("0x01", "name()"), ("error", "name()"), ("empty", "name()"), ("missing", "name()"), ("0x05", "name()")]
+        with pytest.warns(UserWarning, match="2 of 5"):
+            assert my_infura.eth_call_many(calls, batch_size=2) == ["0x01", None, None, None, "0x05"]
+        assert my_infura.eth_call_many([]) == []
+
+    def test_rejected_batch(self):
+        my_infura = ethdata.Infura(session=ErrorSession())
+        with pytest.warns(UserWarning, match="Request to Infura failed"):
+            assert my_infura.eth_call_many([("0x01", "name()"), ("0x02", "name()")]) == [None, None]
+
+class RpcHandler(BaseHTTPRequestHandler):
+    """Stand-in JSON-RPC node. eth_call returns the called address, eth_blockNumber returns 0x10."""
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode())
+        requests = body if isinstance(body, list) else [body]
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            server.starts.append(time.time())
+        time.sleep(0.05)
+        responses = []
+        for request in requests:
+            if request['method'] == "eth_call":
+                result = request['params'][0]['to']
+            else:
+                result = "0x10"
+            responses.append({"jsonrpc": "2.0", "id": request['id'], "result": result})
+        with server.lock:
+            server.active -= 1
+        data = json.dumps(responses if isinstance(body, list) else responses[0]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+class RpcServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+@pytest.fixture
+def rpc_server():
+    server = RpcServer(("127.0.0.1", 0), RpcHandler)
+    server.lock = threading.Lock()
+    server.active = 0
+    server.max_active = 0
+    server.starts = []
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+class TestAsyncInfura(object):
+    def setup_method(self, method):
+        ethdata.eth_call_cache.clear()
+
+    def run(self, coroutine):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    def test_async_calls(self, rpc_server):
+        url = "http://127.0.0.1:{0}".format(rpc_server.server_address[1])
+        my_infura = ethdata.AsyncInfura(concurrency=4, url=url)
+        assert self.run(my_infura.eth_call("0x01", "name()")) == "0x01"
+        assert self.run(my_infura.eth_blockNumber()).json()['result'] == "0x10"
+        calls = [("0x{0:02x}".format(i), "name()") for i in range(25)]
+        assert self.run(my_infura.eth_call_many(calls, batch_size=2)) == [to for to, function in calls]
+
+    def test_concurrency_limit(self, rpc_server):
+        url = "http://127.0.0.1:{0}".format(rpc_server.server_address[1])
+        my_infura = ethdata.AsyncInfura(concurrency=3, url=url)
+        async def many_calls():
+            return await asyncio.gather(*[my_infura.eth_call("0x01", "name()") for i in range(12)])
+        assert self.run(many_calls()) == ["0x01"] * 12
+        assert 1 < rpc_server.max_active <= 3
+
+    def test_request_budget(self, rpc_server):
+        url = "http://127.0.0.1:{0}".format(rpc_server.server_address[1])
+        my_infura = ethdata.AsyncInfura(concurrency=10, requests_per_second=20, url=url)
+        async def many_calls():
+            return await asyncio.gather(*[my_infura.eth_call("0x01", "name()") for i in range(6)])
+        self.run(many_calls())
+        starts = sorted(rpc_server.starts)
+        assert starts[-1] - starts[0] >= 0.2
+
+    def test_close(self):
+        my_infura = ethdata.AsyncInfura(concurrency=2, session=BatchSession(), call_cache=ethdata.CallCache())
+        self.run(my_infura.eth_call("0x01", "name()"))
+        executor = my_infura.get_executor()
+        my_infura.concurrency = 3
+        # The old pool is shut down and a new one serves the next requests
+        with pytest.raises(RuntimeError):
+            executor.submit(int)
+        assert self.run(my_infura.eth_call("0x02", "name()")) == "0x02"
+        async def calls():
+            async with my_infura as infura:
+                return await infura.eth_call("0x03", "name()"), infura.get_executor()
+        result, executor = self.run(calls())
+        assert result == "0x03"
+        with pytest.raises(RuntimeError):
+            executor.submit(int)
+
+    def test_closed_loops_released(self):
+        my_infura = ethdata.AsyncInfura(session=BatchSession(), requests_per_second=100, call_cache=ethdata.CallCache())
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(my_infura.eth_call("0x01", "name()"))
+        loop.close()
+        closed_loop = weakref.ref(loop)
+        del loop
+        self.run(my_infura.eth_call("0x02", "name()"))
+        gc.collect()
+        assert closed_loop() is None
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            ethdata.AsyncInfura(concurrency=0)
+        with pytest.raises(ValueError):
+            ethdata.AsyncInfura(requests_per_second=0)
+
+class ErrorSession(object):
+    def post(self, url, json=None):
+        return BatchResponse({"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "invalid request"}})
+
+class TestCallCache(object):
+    def test_block_pinned_calls(self):
+        session = BatchSession()
+        my_infura = ethdata.Infura(session=session, call_cache=ethdata.CallCache())
+        assert my_infura.eth_call("0x01", "name()", block=100) == "0x01"
+        assert my_infura.eth_call("0x01", "name()", block="0x64") == "0x01"
+        # Block numbers from Pandas/NumPy are the same block
+        assert my_infura.eth_call("0x01", "name()", block=ethdata.np.int64(100)) == "0x01"
+        assert len(session.batches) == 1
+        assert session.batches[0]['params'][1] == "0x64"
+        assert my_infura.eth_call("0x01", "name()", block=101) == "0x01"
+        assert my_infura.eth_call("0x01", "name()", block="pending") == "0x01"
+        assert my_infura.eth_call("0x01", "name()", block="pending") == "0x01"
+        assert len(session.batches) == 4
+
+    def test_latest_ttl(self):
+        session = BatchSession()
+        my_infura = ethdata.Infura(session=session, call_cache=ethdata.CallCache(latest_ttl=0.05))
+        my_infura.eth_call("0x01", "name()")
+        my_infura.eth_call("0x01", "name()")
+        assert len(session.batches) == 1
+        time.sleep(0.1)
+        my_infura.eth_call("0x01", "name()")
+        assert len(session.batches) == 2
+
+    def test_eth_call_many_cache(self):
+        session = BatchSession()
+        my_infura = ethdata.Infura(session=session, call_cache=ethdata.CallCache())
+        calls = [("0x{0:02x}".format(i), "name()") for i in range(5)]
+        my_infura.eth_call_many(calls[:3], block=100)
+        assert my_infura.eth_call_many(calls, block=100) == [to for to, function in calls]
+        assert [request['id'] for request in session.batches[-1]] == [3, 4]
+        with pytest.warns(UserWarning):
+            my_infura.eth_call_many([("error", "name()"), ("empty", "name()")], block=100)
+        # Errors are not cached, empty results are
+        my_infura.eth_call_many([("error", "name()"), ("empty", "name()")], block=100)
+        assert [request['params'][0]['to'] for request in session.batches[-1]] == ["error"]
+
+    def test_lru_eviction(self):
+        cache = ethdata.CallCache(max_entries=2)
+        for block in range(3):
+            cache.put(("url", "0x01", "0x06fdde03", hex(block)), block)
+        assert len(cache) == 2
+        assert cache.get(("url", "0x01", "0x06fdde03", "0x0")) == (False, None)
+        assert cache.get(("url", "0x01", "0x06fdde03", "0x2")) == (True, 2)
+
+class SupplySession(object):
+    """Stand-in session answering totalSupply() batches with the block number times 10 ** 18."""
+    def __init__(self):
+        self.batches = []
+
+    def post(self, url, json=None):
+        self.batches.append(json)
+        return BatchResponse([{"jsonrpc": "2.0", "id": request['id'], "result": "0x{0:064x}".format(int(request['params'][1], 16) * 10 ** 18)}
+                              for request in json])
+
+class TestCallSeries(object):
+    address = "0x1111111111111111111111111111111111111111"
+
+    def setup_method(self, method):
+        ethdata.eth_call_cache.clear()
+
+    def test_per_call_blocks(self):
+        session = SupplySession()
+        my_infura = ethdata.Infura(session=session, call_cache=ethdata.CallCache())
+        calls = [(self.address, "totalSupply()", 10), (self.address, "totalSupply()")]
+        assert my_infura.eth_call_many(calls, block=20) == ["0x{0:064x}".format(block * 10 ** 18) for block in (10, 20)]
+        assert [request['params'][1] for request in session.batches[0]] == ["0xa", "0x14"]
+
+    def test_call_series_blocks(self, monkeypatch):
+        def run_query(self, sql, location='US'):
+            assert "WHERE number IN (100, 200)" in sql
+            return ethdata.pd.DataFrame({"block_number": [100, 200],
+                                         "timestamp": ethdata.pd.to_datetime(["2020-01-01T00:00:00Z", "2020-01-02T00:00:00Z"])})
+        monkeypatch.setattr(ethdata.BigQuery, "run_query", run_query)
+        monkeypatch.setitem(ethdata.http_sessions, "infura", SupplySession())
+        my_token = ethdata.Token(self.address)
+        my_token.decimals = 18
+        df = my_token.call_series("totalSupply()", blocks=[100, 200])
+        assert list(df.columns) == ["block_number", "totalSupply"]
+        assert df.index.tolist() == [ethdata.pd.Timestamp("2020-01-01"), ethdata.pd.Timestamp("2020-01-02")]
+        assert df["totalSupply"].tolist() == [100, 200]
+        assert ethdata.Contract(self.address).call_series("totalSupply()", blocks=[100, 200])["totalSupply"].tolist() == [1e20, 2e20]
+
+    def test_call_series_dates(self, monkeypatch):
+        def run_query(self, sql, location='US'):
+            assert 'TIMESTAMP "2020-01-01 00:00:00", TIMESTAMP "2020-01-02 00:00:00"' in sql
+            return ethdata.pd.DataFrame({"date": ethdata.pd.to_datetime(["2020-01-01T00:00:00Z", "2020-01-02T00:00:00Z"]),
+                                         "block_number": [100, 200]})
+        monkeypatch.setattr(ethdata.BigQuery, "run_query", run_query)
+        monkeypatch.setitem(ethdata.http_sessions, "infura", SupplySession())
+        df = ethdata.Token(self.address).call_series("totalSupply()", dates=["2020-01-01", "2020-01-02"], decimals=20)
+        assert df.index.name == "date"
+        assert df["block_number"].tolist() == [100, 200]
+        assert df["totalSupply"].tolist() == [1, 2]
+
+    def test_blocks_at_dates_sql(self):
+        sql = ethdata.BigQuery(client=object()).get_blocks_at_dates_sql(["2020-01-01", "2020-06-01"])
+        # Each date is joined to the blocks of its own day and the day before, not to every block
+        assert "CROSS JOIN" not in sql
+        assert "JOIN days ON DATE(blocks.timestamp) = days.day" in sql
+        assert 'TIMESTAMP_SUB(TIMESTAMP "2020-01-01 00:00:00", INTERVAL 1 DAY)' in sql
+        assert 'blocks.timestamp <= TIMESTAMP "2020-06-01 00:00:00"' in sql
+
+    def test_call_series_arguments(self):
+        with pytest.raises(ValueError):
+            ethdata.Contract(self.address).call_series("totalSupply()")
+        with pytest.raises(ValueError):
+            ethdata.Contract(self.address).call_series("totalSupply()", blocks=[1], dates=["2020-01-01"])
+
+class TokenSession(object):
+    """Stand-in session answering token metadata batches."""
+    def __init__(self):
+        self.calls = []
+
+    def post(self, url, json=None):
+        results = {
+            ethdata.get_function_signature("name()"): "0x" + "{:064x}".format(32) + "{:064x}".format(4) + "54455354".ljust(64, "0"),
+            ethdata.get_function_signature("symbol()"): "0x" + "545354".ljust(64, "0"),
+            ethdata.get_function_signature("decimals()"): "0x" + "{:064x}".format(6),
+            ethdata.get_function_signature("totalSupply()"): "0x" + "{:064x}".format(5 * 10 ** 6)
+        }
+        responses = []
+        for request in json:
+            self.calls.append((request['params'][0]['to'], request['params'][0]['data']))
+            responses.append({"jsonrpc": "2.0", "id": request['id'], "result": results[request['params'][0]['data']]})
+        return BatchResponse(responses)
+
+class TestResolveTokens(object):
+    def setup_method(self, method):
+        ethdata.eth_call_cache.clear()
+
+    address = "0x1111111111111111111111111111111111111111"
+    listed = "0xe0b7927c4af23765cb51314a0e0521a9645f0e2a"
+
+    def test_resolve_tokens(self):
+        session = TokenSession()
+        tokens = ethdata.resolve_tokens([self.address, self.address.upper().replace("0X", "0x"), self.listed],
+                                        infura=ethdata.Infura(session=session))
+        assert [token.address for token in tokens] == [self.address, self.listed]
+        assert (tokens[0].name, tokens[0].symbol, tokens[0].decimals, tokens[0].total_supply) == ("TEST", "TST", 6, 5)
+        assert (tokens[1].name, tokens[1].symbol, tokens[1].decimals, tokens[1].total_supply) == ("DGD", "DGD", 9, 5e-3)
+        # Listed tokens only look up total supply
+        assert len(session.calls) == 5
+
+    def test_resolve_tokens_frame(self):
+        df = ethdata.resolve_tokens([self.address], as_frame=True, infura=ethdata.Infura(session=TokenSession()))
+        assert list(df.columns) == ["address", "name", "symbol", "decimals", "total_supply"]
+        assert df.iloc[0].tolist() == [self.address, "TEST", "TST", 6, 5]
+
+    def test_resolve_tokens_fallbacks(self):
+        with pytest.warns(UserWarning):
+            tokens = ethdata.resolve_tokens([self.address], infura=ethdata.Infura(session=ErrorSession()))
+        assert (tokens[0].name, tokens[0].symbol, tokens[0].decimals, tokens[0].total_supply) == ("", "", 18, 0)
+
+class TokensTable(ethdata.BigQuery):
+    """Stand-in BigQuery client answering token metadata queries from a fixed tokens table."""
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+        self.query_parameters = []
+
+    def run_query(self, sql, location='US', query_parameters=None):
+        self.queries.append(sql)
+        self.query_parameters.append(query_parameters)
+        return ethdata.pd.DataFrame(self.rows, columns=["address", "name", "symbol", "decimals", "total_supply"])
+
+class TestTokenMetadataTable(object):
+    def setup_method(self, method):
+        ethdata.eth_call_cache.clear()
+
+    address = "0x1111111111111111111111111111111111111111"
+    partial = "0x2222222222222222222222222222222222222222"
+    unknown = "0x3333333333333333333333333333333333333333"
+
+    def test_token_metadata_sql(self):
+        sql = ethdata.BigQuery().get_token_metadata_sql([self.address, self.partial])
+        assert ethdata.public_dataset['tokens'] in sql
+        assert "WHERE address IN UNNEST(@addresses)" in sql
+        assert "WHERE address IN" not in ethdata.BigQuery().get_token_metadata_sql()
+        table = TokensTable([])
+        table.get_token_metadata([self.partial, self.address, self.partial])
+        assert table.query_parameters[0][0].values == [self.address, self.partial]
+
+    def test_no_addresses(self, monkeypatch):
+        table = TokensTable([])
+        df = table.get_token_metadata([])
+        assert len(df) == 0 and df.columns.tolist() == ["address", "name", "symbol", "decimals", "total_supply"]
+        # Tokens with every value in exception_list are not looked up
+        monkeypatch.setitem(ethdata.exception_list, self.unknown, {"name": "Known", "symbol": "KNW", "decimals": 0.0, "total_supply": 1.0})
+        tokens = ethdata.resolve_tokens([self.unknown], source="bigquery", bigquery=table)
+        assert tokens[0].symbol == "KNW"
+        assert table.queries == []
+
+    def test_clean_token_metadata(self):
+        table = TokensTable([[self.address, "Test", "TST", "6", "5000000"], [self.partial, None, "PRT", "bad", "7"]])
+        df = table.get_token_metadata([self.address, self.partial])
+        assert df.iloc[0].tolist() == [self.address, "Test", "TST", 6, 5]
+        assert df.iloc[1]['name'] is None
+        assert ethdata.pd.isnull(df.iloc[1]['decimals']) and ethdata.pd.isnull(df.iloc[1]['total_supply'])
+
+    def test_resolve_tokens_from_table(self):
+        table = TokensTable([[self.address, "Table", "TBL", "6", "5000000"], [self.partial, None, "PRT", "6", None]])
+        session = TokenSession()
+        df = ethdata.resolve_tokens([self.address, self.partial, self.unknown], as_frame=True, source="bigquery",
+                                    bigquery=table, infura=ethdata.Infura(session=session))
+        assert len(table.queries) == 1
+        assert df.iloc[0].tolist() == [self.address, "Table", "TBL", 6, 5]
+        assert df.iloc[1].tolist() == [self.partial, "TEST", "PRT", 6, 5]
+        assert df.iloc[2].tolist() == [self.unknown, "TEST", "TST", 6, 5]
+        # Only the values missing from the table are called
+        assert sorted(to for to, data in session.calls) == [self.partial] * 2 + [self.unknown] * 4
+
+    def test_invalid_source(self):
+        with pytest.raises(ValueError):
+            ethdata.resolve_tokens([self.address], source="etherscan")
+
+def make_row_iterator(num_rows, page_size=None, max_page_rows=3):
+    """Returns a `RowIterator` of the google-cloud-bigquery library over `num_rows` rows, served by a stand-in
+    of the REST API with pages of up to `max_page_rows` rows."""
+    from google.cloud.bigquery.table import RowIterator
+
+    schema = [ethdata.bigquery.SchemaField("value", "INTEGER"), ethdata.bigquery.SchemaField("data", "STRING"),
+              ethdata.bigquery.SchemaField("block_timestamp", "TIMESTAMP")]
+
+    def api_request(method, path, query_params=None, **kwargs):
+        start = int(query_params.get("pageToken", 0))
+        end = min(num_rows, start + min(query_params.get("maxResults", max_page_rows), max_page_rows))
+        # Timestamps are sent as microseconds since the epoch
+        response = {"rows": [{"f": [{"v": str(i)}, {"v": "0x{0:02x}".format(i)}, {"v": str((1577836800 + i) * 10 ** 6)}]}
+                             for i in range(start, end)],
+                    "totalRows": str(num_rows)}
+        if end < num_rows:
+            response["pageToken"] = str(end)
+        return response
+
+    return RowIterator(None, api_request, "/projects/my-project/queries/my-job", schema, page_size=page_size)
+
+class QueryJob(object):
+    def to_dataframe(self):
+        return ethdata.pd.DataFrame({"value": [1]})
+
+    def result(self, page_size=None):
+        return make_row_iterator(10, page_size)
+
+class QueryClient(object):
+    """Stand-in BigQuery client recording its queries."""
+    def __init__(self, project=None):
+        self.project = project
+        self.queries = []
+        self.modified = "2020-01-01 00:00:00+00:00"
+        self.tables = []
+
+    def query(self, sql, location=None, job_config=None):
+        self.queries.append((sql, location, job_config))
+        return QueryJob()
+
+    def get_table(self, table):
+        self.tables.append(table)
+        return type("Table", (object,), {"modified": self.modified})()
+
+class TestBigQueryClient(object):
+    def teardown_method(self, method):
+        ethdata.reset_bigquery()
+
+    def test_injected_client(self):
+        client = QueryClient()
+        my_bigquery = ethdata.BigQuery(client=client, location="EU")
+        assert my_bigquery.run_query("SELECT 1")["value"].tolist() == [1]
+        sql, location, job_config = client.queries[0]
+        assert location == "EU" and job_config.use_query_cache
+        my_bigquery.run_query("SELECT 1", location="US")
+        assert client.queries[1][1] == "US"
+
+    def test_shared_client(self, monkeypatch):
+        monkeypatch.setattr(ethdata.bigquery, "Client", QueryClient)
+        ethdata.configure_bigquery(project="my-project", location="EU")
+        client = ethdata.BigQuery().client
+        assert client is ethdata.BigQuery().client
+        assert client.project == "my-project"
+        assert ethdata.BigQuery().location == "EU"
+        threads = [threading.Thread(target=ethdata.BigQuery().run_query, args=("SELECT 1",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(client.queries) == 8
+        client = QueryClient()
+        ethdata.configure_bigquery(client=client)
+        assert ethdata.BigQuery().client is client
+
+    @pytest.mark.filterwarnings("ignore:google-cloud-bigquery-storage")
+    def test_arrow_download(self):
+        client = QueryClient()
+        my_bigquery = ethdata.BigQuery(client=client, storage_api=True)
+        df = my_bigquery.run_query("SELECT 1")
+        assert df["value"].tolist() == list(range(10))
+        assert df["value"].dtype == ethdata.np.int64
+        assert my_bigquery.run_query_arrow("SELECT 1").num_rows == 10
+
+    @pytest.mark.filterwarnings("ignore:google-cloud-bigquery-storage")
+    def test_arrow_chunks(self):
+        my_bigquery = ethdata.BigQuery(client=QueryClient(), storage_api=True)
+        chunks = list(my_bigquery.iter_query("SELECT 1", chunk_rows=4))
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+        assert ethdata.pd.concat(chunks)["data"].tolist() == ["0x{0:02x}".format(i) for i in range(10)]
+
+    @pytest.mark.filterwarnings("ignore:google-cloud-bigquery-storage")
+    def test_rest_chunks(self):
+        my_bigquery = ethdata.BigQuery(client=QueryClient())
+        chunks = list(my_bigquery.iter_query("SELECT 1", chunk_rows=4))
+        # Pages of 3 rows are split across chunks of 4 rows
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+        df = ethdata.pd.concat(chunks, ignore_index=True)
+        assert df["value"].tolist() == list(range(10))
+        assert [str(dtype) for dtype in df.dtypes] == ["int64", "object", "datetime64[ns, UTC]"]
+        ethdata.pd.testing.assert_frame_equal(df, my_bigquery.download_arrow(QueryJob()).to_pandas())
+
+    def test_configure_twice(self, tmp_path):
+        client = QueryClient()
+        query_cache = ethdata.QueryCache(str(tmp_path))
+        ethdata.configure_bigquery(project="my-project", client=client, query_cache=query_cache)
+        ethdata.configure_bigquery(storage_api=True)
+        my_bigquery = ethdata.BigQuery()
+        assert my_bigquery.client is client and my_bigquery.query_cache is query_cache and my_bigquery.storage_api
+        assert ethdata.bigquery_settings['project'] == "my-project"
+        ethdata.configure_bigquery(query_cache=None)
+        assert ethdata.BigQuery().query_cache is None and ethdata.BigQuery().client is client
+        ethdata.reset_bigquery()
+        assert ethdata.bigquery_settings == ethdata.bigquery_defaults
+
+    def test_default_job_config(self):
+        job_config = ethdata.bigquery.QueryJobConfig()
+        job_config.maximum_bytes_billed = 10 ** 9
+        client = QueryClient()
+        ethdata.configure_bigquery(job_config=job_config, client=client)
+        ethdata.BigQuery().run_query("SELECT 1")
+        ethdata.BigQuery().run_query("SELECT 1")
+        first, second = client.queries[0][2], client.queries[1][2]
+        assert first.maximum_bytes_billed == 10 ** 9
+        assert first is not job_config and first is not second
+
+class TestQueryCache(object):
+    sql = "SELECT * FROM `bigquery-public-data.crypto_ethereum.logs` WHERE address = '0x0'"
+
+    def teardown_method(self, method):
+        ethdata.reset_bigquery()
+
+    def test_repeated_query(self, tmp_path, monkeypatch):
+        client = QueryClient()
+        cache = ethdata.QueryCache(str(tmp_path))
+        my_bigquery = ethdata.BigQuery(client=client, query_cache=cache)
+        assert my_bigquery.run_query(self.sql)["value"].tolist() == [1]
+        # Whitespace does not change the key
+        df = my_bigquery.run_query(self.sql.replace(" WHERE", "\n  WHERE"))
+        assert df["value"].tolist() == [1]
+        # Results are kept for the day, however often the tables are modified
+        client.modified = "2020-01-02 00:00:00+00:00"
+        my_bigquery.run_query(self.sql)
+        assert len(client.queries) == 1 and client.tables == []
+        monkeypatch.setattr(cache, "period", lambda: "2020-01-02T00:00:00+00:00")
+        my_bigquery.run_query(self.sql)
+        assert len(client.queries) == 2
+
+    def test_table_versions(self, tmp_path):
+        client = QueryClient()
+        my_bigquery = ethdata.BigQuery(client=client, query_cache=ethdata.QueryCache(str(tmp_path), version="tables"))
+        my_bigquery.run_query(self.sql)
+        my_bigquery.run_query(self.sql)
+        assert len(client.queries) == 1
+        # Tables are looked up once per process
+        client.modified = "2020-01-02 00:00:00+00:00"
+        my_bigquery.run_query(self.sql)
+        assert len(client.queries) == 1 and len(client.tables) == 1
+        ethdata.reset_bigquery()
+        my_bigquery.run_query(self.sql)
+        assert len(client.queries) == 2 and len(client.tables) == 2
+
+    def test_fixed_version(self, tmp_path):
+        client = QueryClient()
+        my_bigquery = ethdata.BigQuery(client=client, query_cache=ethdata.QueryCache(str(tmp_path), version="v1"))
+        my_bigquery.run_query(self.sql)
+        client.modified = "2020-01-02 00:00:00+00:00"
+        my_bigquery.run_query(self.sql)
+        assert len(client.queries) == 1
+        my_bigquery.query_cache = ethdata.QueryCache(str(tmp_path), version="v2")
+        my_bigquery.run_query(self.sql)
+        assert len(client.queries) == 2
+
+    def test_lru_eviction(self, tmp_path):
+        df = ethdata.pd.DataFrame({"value": list(range(1000))})
+        cache = ethdata.QueryCache(str(tmp_path))
+        cache.put("a", df)
+        size = os.path.getsize(cache.path("a"))
+        cache.max_bytes = 2 * size
+        cache.put("b", df)
+        os.utime(cache.path("a"), (time.time() - 20, time.time() - 20))
+        os.utime(cache.path("b"), (time.time() - 10, time.time() - 10))
+        assert cache.get("a") is not None
+        cache.put("c", df)
+        assert cache.get("b") is None
+        assert cache.get("a")["value"].tolist() == list(range(1000))
+        cache.clear()
+        assert cache.get("c") is None
+
+class LogsJob(object):
+    def __init__(self, df):
+        self.df = df
+
+    def to_dataframe(self):
+        return self.df
+
+class LogsClient(QueryClient):
+    """Stand-in BigQuery client with one event log at noon of every day of 2020."""
+    def query(self, sql, location=None, job_config=None):
+        import re
+        self.queries.append((sql, location, job_config))
+        start = ethdata.pd.Timestamp(re.search('block_timestamp >= "(.*)"', sql).group(1), tz="UTC")
+        end = ethdata.pd.Timestamp(re.search('block_timestamp < "(.*)"', sql).group(1), tz="UTC")
+        timestamps = ethdata.pd.date_range("2020-01-01 12:00", "2020-12-31 12:00", freq="D", tz="UTC")
+        timestamps = timestamps[(timestamps >= start) & (timestamps < end)]
+        return LogsJob(ethdata.pd.DataFrame({
+            "transaction_hash": ["0x{0:064x}".format(i) for i in range(len(timestamps))],
+            "block_timestamp": timestamps,
+        }))
+
+class TestRangeCache(object):
+    def test_intervals(self):
+        assert ethdata.merge_intervals([(5, 7), (1, 3), (3, 4), (6, 9)]) == [(1, 4), (5, 9)]
+        assert ethdata.subtract_intervals(0, 10, [(1, 4), (5, 9)]) == [(0, 1), (4, 5), (9, 10)]
+        assert ethdata.subtract_intervals(2, 4, [(1, 4), (5, 9)]) == []
+
+    def test_widened_range(self, tmp_path):
+        client = LogsClient()
+        my_bigquery = ethdata.BigQuery(client=client, range_cache=ethdata.RangeCache(str(tmp_path)))
+        contract = ethdata.Contract("0x06012c8cf97bead5deae237070f9587f8e7a266d")
+        contract.query_range = {"start": "2020-01-01", "end": "2020-04-01"}
+        assert len(my_bigquery.get_raw_event_logs(contract)) == 91
+        contract.query_range = {"start": "2020-01-01", "end": "2020-07-01"}
+        df = my_bigquery.get_raw_event_logs(contract)
+        assert len(df) == 182
+        assert df["block_timestamp"].is_monotonic_increasing
+        assert len(client.queries) == 2
+        assert 'block_timestamp >= "2020-04-01 00:00:00' in client.queries[1][0]
+        # Covered ranges are read locally
+        contract.query_range = {"start": "2020-02-01", "end": "2020-03-01"}
+        assert len(my_bigquery.get_raw_event_logs(contract)) == 29
+        assert len(client.queries) == 2
+
+    def test_extended_range(self, tmp_path):
+        client = LogsClient()
+        account = ethdata.Account("0x06012c8cf97bead5deae237070f9587f8e7a266d")
+        for day in range(2, 6):
+            account.query_range = {"start": "2020-01-01", "end": "2020-01-{0:02d}".format(day)}
+            my_bigquery = ethdata.BigQuery(client=client, range_cache=ethdata.RangeCache(str(tmp_path)))
+            df = my_bigquery.get_raw_transaction_receipts(account)
+            assert len(df) == day - 1
+            assert df["block_timestamp"].is_unique
+        assert len(client.queries) == 4
+        assert 'block_timestamp >= "2020-01-04 00:00:00' in client.queries[-1][0]
+
+    def test_unsettled_range(self, tmp_path):
+        client = LogsClient()
+        my_bigquery = ethdata.BigQuery(client=client, range_cache=ethdata.RangeCache(str(tmp_path)))
+        contract = ethdata.Contract("0x06012c8cf97bead5deae237070f9587f8e7a266d")
+        contract.query_range = {"start": "2020-12-01"}
+        assert len(my_bigquery.get_raw_event_logs(contract)) == 31
+        assert len(my_bigquery.get_raw_event_logs(contract)) == 31
+        # Only the last hour is queried again
+        assert len(client.queries) == 2
+
+    def test_empty_range(self, tmp_path):
+        client = LogsClient()
+        contract = ethdata.Contract("0x06012c8cf97bead5deae237070f9587f8e7a266d")
+        contract.query_range = {"start": "2020-01-29", "end": "2020-01-29"}
+        uncached = ethdata.BigQuery(client=client).get_raw_event_logs(contract)
+        my_bigquery = ethdata.BigQuery(client=client, range_cache=ethdata.RangeCache(str(tmp_path)))
+        df = my_bigquery.get_raw_event_logs(contract)
+        assert len(df) == 0
+        assert df.columns.tolist() == uncached.columns.tolist()
+        # With cached rows, no query is needed
+        contract.query_range = {"start": "2020-01-01", "end": "2020-02-01"}
+        my_bigquery.get_raw_event_logs(contract)
+        contract.query_range = {"start": "2020-01-29", "end": "2020-01-29"}
+        queries = len(client.queries)
+        df = my_bigquery.get_raw_event_logs(contract)
+        assert len(df) == 0
+        assert df.columns.tolist() == uncached.columns.tolist()
+        assert len(client.queries) == queries
+
+class ManyLogsClient(QueryClient):
+    """Stand-in BigQuery client with a Transfer log of every token (or Sync log of every pair) on
+    2020-01-01 and 2020-02-01."""
+    pairs = ["0x{0:040x}".format(3)]
+    transfer = ethdata.get_event_hash("Transfer(address,address,uint256)")
+    sync = ethdata.get_event_hash("Sync(uint112,uint112)")
+
+    def query(self, sql, location=None, job_config=None):
+        self.queries.append((sql, location, job_config))
+        rows = []
+        for parameter in job_config.query_parameters:
+            for address in parameter.values:
+                for date in ["2020-01-01", "2020-02-01"]:
+                    if address in self.pairs:
+                        rows.append(["0x02", date, address, self.sync, None, None, None,
+                                     "0x{0:064x}{1:064x}".format(7, 9)])
+                    else:
+                        rows.append(["0x01", date, address, self.transfer, "0x" + "0" * 24 + "2" * 40,
+                                     "0x" + "0" * 24 + "3" * 40, None, "0x{0:064x}".format(5)])
+        df = ethdata.pd.DataFrame(rows, columns=["transaction_hash", "block_timestamp", "address", "topics_0",
+                                                 "topics_1", "topics_2", "topics_3", "transaction_data"])
+        df["block_timestamp"] = ethdata.pd.to_datetime(df["block_timestamp"], utc=True)
+        return LogsJob(df)
+
+class TestEventLogsMany(object):
+    def test_one_query(self):
+        client = ManyLogsClient()
+        tokens = [ethdata.Token("0x{0:040x}".format(i), abi_mode="standard") for i in range(1, 3)]
+        tokens[0].query_range = {"start": "2020-01-01", "end": "2020-01-15"}
+        tokens[1].query_range = {"start": "2020-01-15", "end": "2020-03-01"}
+        pair = ethdata.Contract("0x{0:040x}".format(3))
+        pair.abi = [{"anonymous": False, "inputs": [{"indexed": False, "name": "reserve0", "type": "uint112"},
+                                                    {"indexed": False, "name": "reserve1", "type": "uint112"}],
+                     "name": "Sync", "type": "event"}]
+        pair.query_range = {"start": "2020-01-01", "end": "2020-03-01"}
+        event_logs = ethdata.BigQuery(client=client).get_event_logs_many(tokens + [pair])
+        assert len(client.queries) == 1
+        sql, location, job_config = client.queries[0]
+        assert "IN UNNEST(@addresses)" in sql
+        assert 'block_timestamp >= "2020-01-01 00:00:00' in sql and 'block_timestamp < "2020-03-01 00:00:00' in sql
+        assert " OR " not in sql
+        assert list(event_logs) == [tokens[0].address, tokens[1].address, pair.address]
+
+        df = event_logs[tokens[0].address]
+        assert df["block_timestamp"].tolist() == [ethdata.pd.Timestamp("2020-01-01")]
+        assert df["event_name"].tolist() == ["Transfer"]
+        assert df["topic__to"].tolist() == ["0x" + "3" * 40]
+        assert df["data__value"].tolist() == [5]
+        assert tokens[0].event_logs is df
+        assert event_logs[tokens[1].address]["block_timestamp"].tolist() == [ethdata.pd.Timestamp("2020-02-01")]
+
+        syncs = event_logs[pair.address]
+        assert syncs["event_name"].tolist() == ["Sync", "Sync"]
+        assert syncs["data_reserve0"].tolist() == [7, 7] and syncs["data_reserve1"].tolist() == [9, 9]
+
+    def test_separate_ranges(self):
+        client = ManyLogsClient()
+        tokens = [ethdata.Token("0x{0:040x}".format(i), abi_mode="standard") for i in range(1, 3)]
+        tokens[0].query_range = {"start": "2020-01-01", "end": "2020-01-15"}
+        tokens[1].query_range = {"start": "2020-12-01", "end": "2021-01-01"}
+        event_logs = ethdata.BigQuery(client=client).get_event_logs_many(tokens)
+        sql = client.queries[0][0]
+        # February to November is not scanned
+        assert ('AND ((block_timestamp >= "2020-01-01 00:00:00.000000" AND block_timestamp < "2020-01-15 00:00:00.000000")\n'
+                '  OR (block_timestamp >= "2020-12-01 00:00:00.000000" AND block_timestamp < "2021-01-01 00:00:00.000000"))') in sql
+        assert event_logs[tokens[0].address]["block_timestamp"].tolist() == [ethdata.pd.Timestamp("2020-01-01")]
+        assert event_logs[tokens[1].address].shape[0] == 0
+
+        tokens[1].query_range = {"start": "2020-12-01"}
+        ethdata.BigQuery(client=client).get_event_logs_many(tokens)
+        assert '  OR (block_timestamp >= "2020-12-01 00:00:00.000000"))' in client.queries[1][0]
+        tokens[0].query_range = {}
+        ethdata.BigQuery(client=client).get_event_logs_many(tokens)
+        assert "block_timestamp >=" not in client.queries[2][0]
+
 class TestExternalServiceCalls(object):
     def test_infura_call(self):
         my_infura = ethdata.Infura()